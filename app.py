@@ -1,22 +1,62 @@
 # app.py — Modern Google Drive Manager (Updated for Single/Double Click)
 import sys
 import os
+import time
 import threading
 from tkinter import filedialog, messagebox
 import customtkinter as ctk
-from PIL import Image, ImageTk
-from google.auth.transport.requests import Request
-from google.oauth2.credentials import Credentials
-from google_auth_oauthlib.flow import InstalledAppFlow
-from googleapiclient.discovery import build
-from googleapiclient.http import MediaIoBaseDownload
-from io import BytesIO
+import listing
+from listing_cache import ListingCache
+from drive_index import DriveIndex
+from scheduler import Scheduler, METADATA, TRANSFER, INTERACTIVE, NORMAL, BACKGROUND
+from file_grid import FileGrid
+from prefetch import Prefetcher
+from ui_bus import UIBus
+from folder_tree import FolderTree
+from file_model import FileModel
+from thumbnails import ThumbnailCache, ThumbnailLoader
+from tracing import Tracer
+from diagnostics import DiagnosticsWindow
+from stall_watchdog import StallWatchdog
+from profiler import SamplingProfiler
 
 # Configure appearance
 ctk.set_appearance_mode("dark")
 ctk.set_default_color_theme("blue")
 
-SCOPES = ['https://www.googleapis.com/auth/drive']
+# Every Drive call runs on one of two bounded scheduler pools; transfer tuning lives in engine.py
+METADATA_WORKERS = 4                       # Listings, renames, moves, trash, crawls
+TRANSFER_WORKERS = 3                       # Downloads and uploads in flight at once
+
+# Folder listings are cached on disk, shown instantly and revalidated in the background
+CACHE_DIR = "drive_cache"
+LISTING_CACHE_MAX_BYTES = 64 * 1024 * 1024
+LISTING_CACHE_MAX_AGE = 7 * 24 * 60 * 60   # Seconds before a cached listing is not shown
+THUMBNAIL_CACHE_MAX_BYTES = 32 * 1024 * 1024
+THUMBNAIL_WORKERS = 3                      # Thumbnails loaded at once, on the metadata pool
+INDEX_MAX_AGE = 24 * 60 * 60               # Seconds between full crawls of the search index
+FOLDER_TREE_MAX_AGE = 10 * 60              # Seconds between background reloads of the Move dialog's folder tree
+MOVE_DIALOG_MAX_ROWS = 200                 # Folder rows drawn at once; filtering narrows the rest
+DRAG_FRAME_MS = 16                         # Drag motion is processed at most once per frame (~60 fps)
+PREFETCH_HOVER_DELAY = 150                 # ms a folder card must be hovered before it is prefetched
+STALL_THRESHOLD = 0.25                     # Seconds the Tk loop may be blocked before the stall is reported
+PROFILE_ENV = "DRIVE_MANAGER_PROFILE"      # Set to a file path to record a sampling profile of the whole session
+
+def import_drive_stack():
+    """Import the auth and Drive API modules, about two thirds of the app's import time.
+
+    Nothing on screen needs them before sign-in, so the login threads
+    import them after the window has painted instead of at startup.
+    """
+    global DriveEngine, load_credentials, authorize, format_size
+    global ChangeTracker, apply_changes, downloads, folder_download, batch_ops
+    from engine import DriveEngine, load_credentials, authorize, format_size
+    from changes import ChangeTracker, apply_changes
+    import downloads
+    import folder_download
+    import batch_ops
+    import discovery
+    discovery.document()  # Parsed here, while the login waits on the network, not by the first listing
 
 def resource_path(relative_path):
     """Get the correct path whether running as .py or .exe"""
@@ -38,15 +78,62 @@ class ModernDriveApp:
         self.drag_file_id = None
         self.drag_file_name = None
         self.drag_ghost = None
+        self.drag_motion_job = None
+        self.drag_pointer = None
+        self.drag_breadcrumb_rects = []
+        self.drop_target_widget = None
         self.drop_target_folder_id = None
+        self.drag_status = ""  # Status line from before the drag, shown again when it ends
 
         self.service = None
-        self.files = []
+        self.engine = None
+        # Set on the Tk thread once the engine (and the lazily imported Drive stack) exists;
+        # until then a warm start shows cached cards, but actions on them stay disabled
+        self.signed_in = False
+        self.files = FileModel()
         self.selected_file_id = None
         self.selected_file_name = None
+        self.selected_ids = set()  # Multi-selection; selected_file_id is the last clicked item
         self.current_folder_id = None
         self.breadcrumb_stack = []
         self.loading = False
+        self.listing_generation = 0  # Bumped on every navigation so stale pages are dropped
+        self.change_tracker = None
+        self.upload_manager = None
+        self.search_active = False
+        self.search_job = None
+        os.makedirs(CACHE_DIR, exist_ok=True)
+        # Workers reach Tk only through this: coalesced per key, drained once per frame
+        self.ui = UIBus(self.root)
+        self.scheduler = Scheduler(
+            os.path.join(CACHE_DIR, "tasks.json"),
+            pool_sizes={METADATA: METADATA_WORKERS, TRANSFER: TRANSFER_WORKERS}
+        )
+        self.listing_task = None
+        self.prefetcher = None
+        self.folder_tree = FolderTree()
+        self.folder_tree_task = None
+        self.breadcrumb_targets = []
+        self.hovered_folder_id = None
+        self.hover_job = None
+        self.drive_index = DriveIndex(os.path.join(CACHE_DIR, "index.db"))
+        self.listing_cache = ListingCache(
+            os.path.join(CACHE_DIR, "listings"),
+            max_bytes=LISTING_CACHE_MAX_BYTES,
+            max_age=LISTING_CACHE_MAX_AGE
+        )
+        self.thumbnail_cache = ThumbnailCache(os.path.join(CACHE_DIR, "thumbs"), max_bytes=THUMBNAIL_CACHE_MAX_BYTES)
+        self.thumbnails = None
+        # Every Drive request, appended to a rotating trace; summarized on exit and in the diagnostics window
+        self.tracer = Tracer(os.path.join(CACHE_DIR, "trace.jsonl"))
+        self.diagnostics = None
+        # Main-loop stalls are logged with the stack that held the loop
+        self.watchdog = StallWatchdog(self.root, os.path.join(CACHE_DIR, "stalls.jsonl"), threshold=STALL_THRESHOLD)
+        self.watchdog.start()
+        self.profiler = None
+        self.profile_path = os.environ.get(PROFILE_ENV)
+        if self.profile_path:
+            self.toggle_profiler()
 
         # Color scheme - Monochrome Black & White
         self.colors = {
@@ -67,7 +154,9 @@ class ModernDriveApp:
         self.ui_font = "Segoe UI"  # Clean UI font for labels
 
         self.create_widgets()
-        self.auto_login()
+        self.root.protocol("WM_DELETE_WINDOW", self.on_close)
+        # After the first paint: login imports the whole auth/API stack on its thread
+        self.root.after_idle(self.auto_login)
 
     def create_widgets(self):
         # === SIDEBAR ===
@@ -131,6 +220,30 @@ class ModernDriveApp:
         )
         self.download_btn_sidebar.pack(fill="x", pady=5)
 
+        self.zip_btn_sidebar = ctk.CTkButton(
+            self.actions_frame,
+            text="🗜️ Download as ZIP",
+            command=self.download_zip,
+            state="disabled",
+            fg_color=self.colors["success"],
+            hover_color="#059669",
+            height=35,
+            corner_radius=8
+        )
+        self.zip_btn_sidebar.pack(fill="x", pady=5)
+
+        self.upload_btn_sidebar = ctk.CTkButton(
+            self.actions_frame,
+            text="⬆️ Upload",
+            command=self.upload_files,
+            state="disabled",
+            fg_color=self.colors["success"],
+            hover_color="#059669",
+            height=35,
+            corner_radius=8
+        )
+        self.upload_btn_sidebar.pack(fill="x", pady=5)
+
         self.rename_btn_sidebar = ctk.CTkButton(
             self.actions_frame,
             text="✏️ Rename",
@@ -155,6 +268,18 @@ class ModernDriveApp:
         )
         self.move_btn_sidebar.pack(fill="x", pady=5)
 
+        self.trash_btn_sidebar = ctk.CTkButton(
+            self.actions_frame,
+            text="🗑️ Trash",
+            command=self.delete_file,
+            state="disabled",
+            fg_color=self.colors["bg_hover"],
+            hover_color=self.colors["secondary"],
+            height=35,
+            corner_radius=8
+        )
+        self.trash_btn_sidebar.pack(fill="x", pady=5)
+
         # Status at bottom
         self.status_frame = ctk.CTkFrame(self.sidebar, fg_color="transparent")
         self.status_frame.pack(side="bottom", pady=20, padx=20, fill="x")
@@ -167,6 +292,18 @@ class ModernDriveApp:
         )
         self.status_label.pack()
 
+        self.diagnostics_btn = ctk.CTkButton(
+            self.status_frame,
+            text="📊 Diagnostics",
+            command=self.show_diagnostics,
+            fg_color="transparent",
+            hover_color=self.colors["bg_hover"],
+            text_color=self.colors["text_secondary"],
+            font=ctk.CTkFont(family=self.ui_font, size=11),
+            height=24
+        )
+        self.diagnostics_btn.pack(pady=(6, 0))
+
         # Download progress (hidden by default)
         self.progress_frame = ctk.CTkFrame(self.sidebar, fg_color=self.colors["bg_card"], corner_radius=10)
         
@@ -195,7 +332,18 @@ class ModernDriveApp:
             font=ctk.CTkFont(family=self.ui_font, size=11),
             text_color=self.colors["text_secondary"]
         )
-        self.progress_text.pack(pady=(0, 10), padx=10)
+        self.progress_text.pack(pady=(0, 5), padx=10)
+
+        self.cancel_transfer_btn = ctk.CTkButton(
+            self.progress_frame,
+            text="✕ Cancel",
+            command=self.cancel_transfers,
+            fg_color=self.colors["bg_hover"],
+            hover_color=self.colors["secondary"],
+            height=26,
+            corner_radius=6
+        )
+        self.cancel_transfer_btn.pack(pady=(0, 10), padx=10)
 
         # === MAIN CONTENT ===
         self.main_frame = ctk.CTkFrame(self.root, corner_radius=0, fg_color="#0a0f1e")
@@ -210,10 +358,25 @@ class ModernDriveApp:
         self.breadcrumb_frame = ctk.CTkFrame(self.header, fg_color="transparent")
         self.breadcrumb_frame.pack(side="left", padx=30, pady=20)
 
-        # Search bar (placeholder)
+        # Search bar (queries the local index, never the network)
         search_frame = ctk.CTkFrame(self.header, fg_color="transparent")
         search_frame.pack(side="right", padx=30, pady=20)
 
+        self.search_entry = ctk.CTkEntry(
+            search_frame,
+            placeholder_text="🔍 Search Drive",
+            width=280,
+            height=36,
+            corner_radius=8,
+            fg_color=self.colors["bg_dark"],
+            border_color=self.colors["bg_hover"],
+            text_color=self.colors["text_primary"],
+            font=ctk.CTkFont(family=self.ui_font, size=13)
+        )
+        self.search_entry.pack()
+        self.search_entry.bind("<KeyRelease>", self.on_search_typed)
+        self.search_entry.bind("<Escape>", lambda e: self.clear_search())
+
         # Content area with scrollable grid
         self.content_container = ctk.CTkFrame(self.main_frame, fg_color="transparent")
         self.content_container.pack(fill="both", expand=True, padx=20, pady=20)
@@ -227,31 +390,33 @@ class ModernDriveApp:
         )
         self.loading_label.pack(expand=True)
 
-        # Scrollable grid
-        self.grid_frame = ctk.CTkScrollableFrame(
+        # Scrollable grid (only the cards in view are built; they are recycled while scrolling)
+        self.grid_frame = FileGrid(
             self.content_container,
-            fg_color="transparent",
-            scrollbar_button_color=self.colors["bg_hover"],
-            scrollbar_button_hover_color=self.colors["secondary"]
+            self.colors,
+            self.ui_font,
+            on_select=self.on_item_select,
+            on_open=self.on_folder_open,
+            on_hover=self.on_card_hover,
+            on_drag=self.start_drag,
+            on_visible=self.on_cards_visible
         )
+        self.root.bind("<Control-a>", self.select_all)
+        self.root.bind("<Control-D>", lambda event: self.show_diagnostics())  # Ctrl+Shift+D
 
     def auto_login(self):
     # ✅ Check for token.json in current working directory (not bundled)
         if os.path.exists("token.json"):
+            # Warm start: paint the last known root while we authenticate
+            self.show_cached_folder(None)
+
             def _auto():
                 try:
-                    # Load from current folder
-                    creds = Credentials.from_authorized_user_file("token.json", SCOPES)
-                    if creds.valid:
-                        self.service = build("drive", "v3", credentials=creds)
-                        self.root.after(0, self.on_login_success)
-                    elif creds.expired and creds.refresh_token:
-                        creds.refresh(Request())
-                        # Save back to current folder (not resource_path)
-                        with open("token.json", "w") as token:
-                            token.write(creds.to_json())
-                        self.service = build("drive", "v3", credentials=creds)
-                        self.root.after(0, self.on_login_success)
+                    import_drive_stack()
+                    # Load from current folder (refreshed and saved back there if expired)
+                    creds = load_credentials("token.json")
+                    if creds:
+                        self.sign_in(creds)
                 except Exception as e:
                     print(f"Auto-login failed: {e}")
             
@@ -260,60 +425,322 @@ class ModernDriveApp:
     def manual_login(self):
         def _login():
             try:
+                import_drive_stack()
                 # Get the correct path to credentials.json
                 creds_path = resource_path("credentials.json")
                 
-                # Run OAuth flow using that file
-                flow = InstalledAppFlow.from_client_secrets_file(creds_path, SCOPES)
-                creds = flow.run_local_server(port=0)  # ← This returns Credentials object
+                # Run OAuth flow using that file; token.json is saved to the normal path, not resource_path
+                creds = authorize(creds_path, "token.json")
                 
-                # Save token.json (use normal path, not resource_path, for output)
-                with open("token.json", "w") as token:
-                    token.write(creds.to_json())  # ← creds is the Credentials object
-
-                self.service = build("drive", "v3", credentials=creds)
-                self.root.after(0, self.on_login_success)
+                # Possibly a different account: forget the previous one's listings
+                self.listing_cache.clear()
+                self.sign_in(creds)
                 
             except Exception as e:
-                self.root.after(0, lambda: messagebox.showerror("Login Failed", str(e)))
+                msg = str(e)
+                self.ui.post(lambda: messagebox.showerror("Login Failed", msg))
 
         threading.Thread(target=_login, daemon=True).start()
 
+    def sign_in(self, creds):
+        """Login thread: every Drive operation from here on goes through the engine"""
+        self.engine = DriveEngine(
+            creds,
+            self.scheduler,
+            CACHE_DIR,
+            token_path="token.json",
+            tracer=self.tracer
+        )
+        self.service = self.engine.service
+        self.upload_manager = self.engine.uploads
+        self.ui.post(self.on_login_success)
+
     def on_login_success(self):
         self.login_button.configure(text="✅ Signed in", state="disabled", fg_color=self.colors["success"])
         self.status_label.configure(text="● Connected", text_color=self.colors["success"])
-        self.go_to_folder(None)
+        self.upload_btn_sidebar.configure(state="normal")
+        self.signed_in = True
+        self.update_action_buttons()
+        self.prefetcher = Prefetcher(self.service, self.scheduler, on_fetched=self.listing_cache.put)
+        self.thumbnails = ThumbnailLoader(
+            self.service,
+            self.scheduler,
+            self.thumbnail_cache,
+            on_ready=self.on_thumbnail_ready,
+            max_active=THUMBNAIL_WORKERS
+        )
+        self.go_to_folder(self.current_folder_id)  # Wherever the warm start was browsed to
+        self.start_change_tracking()
+        self.refresh_index()
+        self.refresh_folder_tree(force=True)
+        self.resume_journaled_transfers()
+
+    def on_close(self):
+        # Running transfers stop here; their journal entries bring them back next launch
+        self.scheduler.shutdown()
+        self.watchdog.stop()
+        if self.profiler is not None:
+            print(self.toggle_profiler())
+        try:
+            self.tracer.save_summary(os.path.join(CACHE_DIR, "trace_summary.json"))
+        except OSError as e:
+            print(f"Saving trace summary failed: {e}")
+        self.tracer.close()
+        self.root.destroy()
+
+    def show_diagnostics(self):
+        if self.diagnostics is not None and self.diagnostics.is_open():
+            self.diagnostics.focus()
+            return
+        self.diagnostics = DiagnosticsWindow(
+            self.root,
+            self.colors,
+            self.font_family,
+            self.tracer,
+            self.ui,
+            self.scheduler,
+            governor=lambda: self.service.governor if self.service else None,
+            watchdog=self.watchdog,
+            toggle_profiler=self.toggle_profiler,
+            profiling=self.profiler is not None
+        )
+
+    def toggle_profiler(self):
+        """Start sampling every thread, or stop and write the folded stacks. Returns a status line"""
+        if self.profiler is None:
+            self.profiler = SamplingProfiler()
+            self.profiler.start()
+            return "Profiling..."
+        path = self.profile_path or os.path.join(CACHE_DIR, time.strftime("profile-%Y%m%d-%H%M%S.folded"))
+        self.profiler.stop()
+        try:
+            samples = self.profiler.write(path)
+        except OSError as e:
+            return f"Saving profile failed: {e}"
+        finally:
+            self.profiler = None
+        return f"{samples} samples written to {path}"
+
+    # === INCREMENTAL SYNC (Drive Changes feed) ===
+    def start_change_tracking(self):
+        if self.change_tracker:
+            return
+        self.change_tracker = ChangeTracker(
+            self.service,
+            os.path.join(CACHE_DIR, "changes_token.json"),
+            on_changes=self.on_remote_changes,
+            on_reset=self.listing_cache.clear
+        )
+        self.change_tracker.start()
+
+    def on_remote_changes(self, changes):
+        """Runs on the tracker thread: patch cached listings, then the visible one on the Tk thread"""
+        root_id = self.change_tracker.root_id
+        self.drive_index.apply_changes(changes)
+        self.folder_tree.apply_changes(changes)
+        # Listings a change can touch: its file's new parents, and wherever the cache lists it now
+        parents = {p for c in changes for p in (c.get("file") or {}).get("parents", [])}
+        if root_id in parents:
+            parents.add(None)  # My Drive's listing is cached under None
+        self.listing_cache.update(lambda folder_id, files: apply_changes(files, folder_id or root_id, changes),
+                                  parents, [c.get("fileId") for c in changes])
+        if self.prefetcher:
+            self.prefetcher.clear()
+        self.ui.post(lambda: self.apply_remote_changes(changes))
+
+    def apply_remote_changes(self, changes):
+        if self.search_active:
+            return
+        # Patched in place through the id index instead of rebuilding the listing
+        if self.files.apply_changes(self.current_folder_id or self.change_tracker.root_id, changes):
+            self.apply_fresh_listing(self.listing_generation, self.files)
+
+    # === SEARCH (local SQLite index) ===
+    def refresh_index(self, force=False):
+        """Re-crawl the whole Drive into the index in the background if it is stale"""
+        if not force and not self.drive_index.needs_crawl(INDEX_MAX_AGE):
+            return
+
+        def _crawl(task):
+            try:
+                self.drive_index.crawl(self.service)
+            except Exception as e:
+                print(f"Index crawl failed: {e}")
+
+        self.scheduler.submit(_crawl, "Index crawl", METADATA, BACKGROUND)
+
+    def refresh_folder_tree(self, force=False):
+        """Reload every folder into the Move dialog's tree in the background"""
+        if not self.service or not (force or self.folder_tree.needs_load(FOLDER_TREE_MAX_AGE)):
+            return
+        if self.folder_tree_task and not self.folder_tree_task.finished.is_set():
+            return
+
+        def _load(task):
+            self.folder_tree.load(self.service)
+
+        self.folder_tree_task = self.scheduler.submit(_load, "Load folder tree", METADATA, BACKGROUND)
+
+    def on_search_typed(self, event):
+        # Debounce so a burst of keystrokes runs one query
+        if self.search_job:
+            self.root.after_cancel(self.search_job)
+        self.search_job = self.root.after(150, self.run_search)
+
+    def run_search(self):
+        self.search_job = None
+        text = self.search_entry.get().strip()
+        if not text:
+            if self.search_active:
+                self.exit_search()
+            return
+
+        results = self.drive_index.search(text, limit=200)
+        for f in results:
+            f["location"] = " › ".join(["My Drive"] + [name for _, name in self.drive_index.path_of(f["id"])])
+            f["parents"] = self.drive_index.parent_ids(f["id"])  # Lets Move skip the parents lookup
+
+        self.search_active = True
+        self.cancel_listing()  # Drop folder pages still streaming in
+        self.files = FileModel(results)
+        self.populate_grid()
+        self.status_label.configure(text=f"● {len(results)} results")
+
+    def clear_search(self):
+        self.search_entry.delete(0, "end")
+        if self.search_active:
+            self.exit_search()
+
+    def exit_search(self):
+        """Go back to the folder that was open before searching"""
+        self.search_active = False
+        self.status_label.configure(text="● Connected")
+        self.files = FileModel()
+        self.show_cached_folder(self.current_folder_id)
+        self.go_to_folder(self.current_folder_id)
+
+    def refresh_after_mutation(self):
+        """Pick up our own edits with one changes().list poll instead of re-listing the folder"""
+        if self.change_tracker:
+            self.change_tracker.poll_soon()
+        else:
+            self.go_to_folder(self.current_folder_id)
 
     def go_to_folder(self, folder_id):
         if self.loading:
             return
         
-        self.loading = True
-        self.show_loading()
-
-        def _load():
+        self.listing_generation += 1
+        generation = self.listing_generation
+
+        # Stale-while-revalidate: show what we know now, swap in the fresh listing when it lands
+        refreshing = folder_id == self.current_folder_id and bool(self.files)
+        prefetched = self.prefetcher.take(folder_id) if self.prefetcher and not refreshing else None
+        if prefetched is not None:
+            # Listed moments ago on hover/selection: nothing to fetch
+            if self.listing_task:
+                self.listing_task.cancel()
+            self.show_first_page(generation, folder_id, prefetched)
+            return
+        cached = None if refreshing else self.listing_cache.get(folder_id)
+        if not self.signed_in:
+            # Warm start: only cached folders can be shown; on_login_success revalidates the open one
+            if cached is not None:
+                self.show_first_page(generation, folder_id, cached)
+            return
+        if cached is not None:
+            self.show_first_page(generation, folder_id, cached)
+        elif not refreshing:
+            self.loading = True
+            self.show_loading()
+        revalidating = refreshing or cached is not None
+        if self.listing_task:
+            self.listing_task.cancel()
+
+        def _load(task):
             try:
-                query = "trashed=false and 'root' in parents" if folder_id is None else f"trashed=false and '{folder_id}' in parents"
-                
-                result = self.service.files().list(
-                    q=query,
-                    pageSize=100,
-                    fields="files(id, name, mimeType, iconLink, modifiedTime)",
-                    orderBy="folder,name"
-                ).execute()
-                
-                self.files = result.get("files", [])
-                self.current_folder_id = folder_id
-                
-                self.root.after(0, self.update_breadcrumb)
-                self.root.after(0, self.populate_grid)
+                # Hovered or selected just before opening: adopt that listing instead of starting over
+                adopted = self.prefetcher.wait(folder_id) if self.prefetcher and not refreshing else None
+                if adopted is not None and generation == self.listing_generation:
+                    if revalidating:
+                        self.ui.post(lambda: self.apply_fresh_listing(generation, adopted))
+                    else:
+                        self.ui.post(lambda: self.show_first_page(generation, folder_id, adopted))
+                        self.loading = False
+                    return
+
+                files = []
+                # Without a cached copy, each page is handed to the grid as soon as it arrives
+                pages = self.engine.iter_folder(folder_id)
+                for page_number, page in enumerate(pages):
+                    if generation != self.listing_generation or task.cancelled:
+                        return  # Navigated elsewhere; stop fetching
+                    files.extend(page)
+                    if revalidating:
+                        continue
+                    if page_number == 0:
+                        self.ui.post(lambda p=page: self.show_first_page(generation, folder_id, p))
+                        self.loading = False
+                    else:
+                        self.ui.post(lambda p=page: self.append_page(generation, p))
+
+                self.listing_cache.put(folder_id, files)
+                if revalidating:
+                    self.ui.post(lambda: self.apply_fresh_listing(generation, files))
                 
             except Exception as e:
-                self.root.after(0, lambda: messagebox.showerror("Error", f"Failed to load folder:\n{e}"))
+                if revalidating:
+                    self.ui.post(lambda: self.status_label.configure(text="● Showing cached listing"))
+                else:
+                    msg = f"Failed to load folder:\n{e}"
+                    self.ui.post(lambda: messagebox.showerror("Error", msg))
             finally:
-                self.loading = False
+                if generation == self.listing_generation:
+                    self.loading = False
+
+        # Interactive: jumps ahead of crawls and other background metadata work
+        self.listing_task = self.scheduler.submit(_load, f"List {folder_id or 'root'}", METADATA, INTERACTIVE)
+
+    def show_cached_folder(self, folder_id):
+        """Paint a folder from the listing cache without touching the network"""
+        cached = self.listing_cache.get(folder_id)
+        if cached is not None:
+            self.show_first_page(self.cancel_listing(), folder_id, cached)
+
+    def cancel_listing(self):
+        """Start a new listing generation and stop the folder load in flight; returns the generation"""
+        self.listing_generation += 1
+        if self.listing_task:
+            self.listing_task.cancel()
+        self.loading = False  # The superseded _load no longer owns the flag
+        return self.listing_generation
+
+    def show_first_page(self, generation, folder_id, files):
+        if generation != self.listing_generation:
+            return
+        self.files = FileModel(files)
+        self.current_folder_id = folder_id
+        self.update_breadcrumb()
+        self.populate_grid()
+
+    def append_page(self, generation, files):
+        """Add a later page of the current listing to the grid"""
+        if generation != self.listing_generation:
+            return
+        self.files.extend(files)
+        self.grid_frame.refresh()
 
-        threading.Thread(target=_load, daemon=True).start()
+    def apply_fresh_listing(self, generation, files):
+        """Replace a cached/previous listing in place, keeping scroll and selection"""
+        if generation != self.listing_generation:
+            return
+        self.files = files if isinstance(files, FileModel) else FileModel(files)
+        if self.selected_ids:
+            remaining = {i for i in self.selected_ids if self.files.get(i)}
+            if remaining != self.selected_ids:
+                self.grid_frame.set_selected(remaining)
+                self.on_item_select(self.selected_file_id, self.selected_file_name, False, None)
+        self.grid_frame.set_items(self.files.items, keep_scroll=True)
 
     def show_loading(self):
         self.loading_label.configure(text="⏳ Loading...")
@@ -327,6 +754,7 @@ class ModernDriveApp:
     def update_breadcrumb(self):
         for widget in self.breadcrumb_frame.winfo_children():
             widget.destroy()
+        self.breadcrumb_targets = []  # (button, folder id) pairs a dragged file can be dropped on
 
         home_btn = ctk.CTkButton(
             self.breadcrumb_frame,
@@ -340,6 +768,7 @@ class ModernDriveApp:
             font=ctk.CTkFont(family=self.font_family, size=13)
         )
         home_btn.pack(side="left", padx=2)
+        self.breadcrumb_targets.append((home_btn, "root"))
 
         for idx, (folder_id, folder_name) in enumerate(self.breadcrumb_stack):
             ctk.CTkLabel(
@@ -361,138 +790,85 @@ class ModernDriveApp:
                 font=ctk.CTkFont(family=self.font_family, size=13)
             )
             btn.pack(side="left", padx=2)
+            self.breadcrumb_targets.append((btn, folder_id))
 
     def on_item_select(self, file_id, file_name, is_folder, card):
-        """Handle single-click selection of any item (file or folder)"""
+        """Handle click selection of any item (Ctrl toggles, Shift selects a range)"""
+        # The grid has already updated and highlighted its selection
+        self.selected_ids = set(self.grid_frame.selected_ids)
+        if file_id not in self.selected_ids:
+            # Ctrl-click removed it: fall back to any remaining item
+            remaining = self.selected_files()
+            file_id = remaining[0]["id"] if remaining else None
+            file_name = remaining[0]["name"] if remaining else None
         self.selected_file_id = file_id
         self.selected_file_name = file_name
-
-        # Enable action buttons
-        if is_folder:
-            self.download_btn_sidebar.configure(state="disabled")  # Can't download folders
-        else:
-            self.download_btn_sidebar.configure(state="normal")
-        
-        self.rename_btn_sidebar.configure(state="normal")
-        self.move_btn_sidebar.configure(state="normal")
-
-        # Highlight selected card
-        for widget in self.grid_frame.winfo_children():
-            if hasattr(widget, 'file_id'):
-                is_selected = (widget.file_id == file_id)
-                widget.selected = is_selected
-                if is_selected:
-                    widget.configure(border_color=self.colors["primary"], fg_color=self.colors["bg_hover"])
-                else:
-                    widget.configure(border_color=self.colors["bg_card"], fg_color=self.colors["bg_card"])
+        self.update_action_buttons()
+        if self.prefetcher and len(self.selected_ids) == 1 and is_folder:
+            self.prefetcher.request(file_id)  # A selected folder is usually opened next
+
+    def on_card_hover(self, f):
+        """Prefetch a folder once the pointer rests on it; cancel when it moves away"""
+        folder_id = f["id"] if f and f["mimeType"] == listing.FOLDER_MIME else None
+        if folder_id == self.hovered_folder_id:
+            return
+        if self.hover_job:
+            self.root.after_cancel(self.hover_job)
+            self.hover_job = None
+        previous, self.hovered_folder_id = self.hovered_folder_id, folder_id
+        if previous and self.prefetcher and previous != self.selected_file_id:
+            self.prefetcher.cancel(previous)
+        if folder_id and self.prefetcher:
+            self.hover_job = self.root.after(PREFETCH_HOVER_DELAY, lambda: self.prefetch_hovered(folder_id))
+
+    def prefetch_hovered(self, folder_id):
+        self.hover_job = None
+        if folder_id == self.hovered_folder_id:
+            self.prefetcher.request(folder_id)
+
+    def selected_files(self):
+        return self.files.in_order(self.selected_ids)
+
+    def select_all(self, event=None):
+        if str(self.root.focus_get()).startswith(str(self.search_entry)):
+            return  # Ctrl+A inside the search box selects text
+        self.grid_frame.select_all()
+        first = self.files[0] if self.files else {}
+        self.on_item_select(first.get("id"), first.get("name"), False, None)
 
     def on_folder_open(self, folder_id, folder_name):
         """Handle double-click to open folder"""
+        if not self.signed_in and self.listing_cache.get(folder_id) is None:
+            return  # Nothing to list it with until sign-in finishes
+        if self.search_active:
+            # Opened from search results: rebuild the path from the index
+            self.breadcrumb_stack = self.drive_index.path_of(folder_id)
+            self.search_active = False
+            self.search_entry.delete(0, "end")
+            self.status_label.configure(text="● Connected")
         self.breadcrumb_stack.append((folder_id, folder_name))
         self.go_to_folder(folder_id)
 
+    def on_cards_visible(self, files):
+        """After each grid render: load thumbnails for the cards in view, and only those"""
+        if self.thumbnails:
+            self.thumbnails.want(files, have=self.grid_frame.thumbnails)
+
+    def on_thumbnail_ready(self, f, image):
+        # Worker thread: the image is already decoded and resized, Tk only wraps it
+        self.ui.post(lambda: self.grid_frame.set_thumbnail(f, image), key=("thumbnail", f["id"]))
+
     def populate_grid(self):
         self.hide_loading()
         
         # Clear selection when loading new folder
         self.selected_file_id = None
         self.selected_file_name = None
-        self.download_btn_sidebar.configure(state="disabled")
-        self.rename_btn_sidebar.configure(state="disabled")
-        self.move_btn_sidebar.configure(state="disabled")
+        self.selected_ids = set()
+        self.update_action_buttons()
         
-        for widget in self.grid_frame.winfo_children():
-            widget.destroy()
-
-        if not self.files:
-            empty_label = ctk.CTkLabel(
-                self.grid_frame,
-                text="📂 This folder is empty",
-                font=ctk.CTkFont(family=self.ui_font, size=18),
-                text_color=self.colors["text_secondary"]
-            )
-            empty_label.pack(expand=True, pady=50)
-            return
-
-        # Create responsive grid
-        columns = 4
-        for i, f in enumerate(self.files):
-            row = i // columns
-            col = i % columns
-
-            is_folder = f["mimeType"] == "application/vnd.google-apps.folder"
-            
-            # Card
-            card = ctk.CTkFrame(
-                self.grid_frame,
-                width=220,
-                height=180,
-                corner_radius=12,
-                fg_color=self.colors["bg_card"],
-                border_width=2,
-                border_color=self.colors["bg_card"]
-            )
-            card.grid(row=row, column=col, padx=12, pady=12, sticky="nsew")
-            card.grid_propagate(False)
-
-            # Icon
-            icon_text = "📁" if is_folder else "📄"
-            icon_label = ctk.CTkLabel(
-                card,
-                text=icon_text,
-                font=ctk.CTkFont(size=56)
-            )
-            icon_label.pack(pady=(20, 10))
-
-            # Name
-            name_display = f["name"][:30] + "..." if len(f["name"]) > 30 else f["name"]
-            name_label = ctk.CTkLabel(
-                card,
-                text=name_display,
-                font=ctk.CTkFont(family=self.ui_font, size=13, weight="bold"),
-                text_color=self.colors["text_primary"],
-                wraplength=200
-            )
-            name_label.pack(pady=(0, 5))
-
-            # Type
-            type_label = ctk.CTkLabel(
-                card,
-                text="Folder" if is_folder else "File",
-                font=ctk.CTkFont(family=self.ui_font, size=11),
-                text_color=self.colors["text_secondary"]
-            )
-            type_label.pack()
-
-            # Store metadata
-            card.file_id = f["id"]
-            card.file_name = f["name"]
-            card.is_folder = is_folder
-
-            # === Bindings ===
-            # Single-click: select
-            def make_select(fid, fname, is_dir, c):
-                return lambda e: self.on_item_select(fid, fname, is_dir, c)
-
-            # Double-click: open (folders only)
-            def make_open(fid, fname):
-                return lambda e: self.on_folder_open(fid, fname)
-
-            card.bind("<Button-1>", make_select(f["id"], f["name"], is_folder, card))
-            for child in card.winfo_children():
-                child.bind("<Button-1>", make_select(f["id"], f["name"], is_folder, card))
-
-            if is_folder:
-                card.bind("<Double-Button-1>", make_open(f["id"], f["name"]))
-                for child in card.winfo_children():
-                    child.bind("<Double-Button-1>", make_open(f["id"], f["name"]))
-
-            # Hover effects
-            card.bind("<Enter>", lambda e, w=card: w.configure(border_color=self.colors["primary"]))
-            card.bind("<Leave>", lambda e, w=card: w.configure(border_color=self.colors["bg_card"]) if not getattr(w, 'selected', False) else None)
-
-        for i in range(columns):
-            self.grid_frame.grid_columnconfigure(i, weight=1)
+        self.grid_frame.set_selected(None)
+        self.grid_frame.set_items(self.files.items)
 
     def navigate_to_breadcrumb(self, folder_id, index=None):
         """Navigate to a folder from breadcrumb, resetting the path"""
@@ -506,47 +882,229 @@ class ModernDriveApp:
         if not self.selected_file_id:
             return
 
+        selected = self.selected_files()
+        if selected and selected[0]["mimeType"] == listing.FOLDER_MIME:
+            parent_dir = filedialog.askdirectory(title="Download folder into")
+            if not parent_dir:
+                return
+            dest_dir = os.path.join(parent_dir, folder_download.safe_name(self.selected_file_name))
+            self.start_folder_download(self.selected_file_id, self.selected_file_name, dest_dir)
+            return
+
         save_path = filedialog.asksaveasfilename(initialfile=self.selected_file_name)
         if not save_path:
             return
 
+        # Size and modifiedTime came with the listing, so the download starts without a metadata call
+        f = self.files.get(self.selected_file_id)
+        self.start_download(self.selected_file_id, self.selected_file_name, save_path,
+                            size=f.get("size") if f else None, modified_time=f.get("modifiedTime") if f else None)
+
+    def start_download(self, file_id, file_name, save_path, priority=NORMAL, failures=0, size=None, modified_time=None):
+        """Queue a download on the transfer pool; it is journaled until it completes"""
         self.progress_frame.pack(side="bottom", pady=(0, 20), padx=20, fill="x", before=self.status_frame)
         self.progress_bar.set(0)
         self.progress_text.configure(text="0%")
-        self.progress_label.configure(text=f"Downloading {self.selected_file_name[:20]}...")
-        
-        def _download():
+        self.progress_label.configure(text=f"Downloading {file_name[:20]}...")
+
+        def _download(task):
+            try:
+                # Ranges go straight to "<save_path>.part"; a retry resumes from the last byte
+                self.engine.download(
+                    file_id,
+                    save_path,
+                    size=size,
+                    modified_time=modified_time,
+                    # One redraw per frame at most, however fast chunks arrive
+                    # A zero-byte file reports 0/0 once it is finished
+                    progress_callback=lambda done, total: self.ui.post(
+                        lambda p=done / total if total else 1.0: self.update_progress(p), key=("progress", task.id)),
+                    cancel_event=task.cancel_event
+                )
+                self.ui.post(lambda: self.update_progress(1.0))
+                self.ui.post_later(500, lambda: self.hide_progress())
+                self.ui.post_later(500, lambda: messagebox.showinfo("Success", f"✅ Downloaded:\n{save_path}"))
+            except downloads.DownloadCancelled:
+                self.ui.post(lambda: self.hide_progress())
+                raise
+            except Exception as e:
+                self.ui.post(lambda: self.hide_progress())
+                msg = f"{e}\n\nPartial data was kept; it will be retried on the next launch."
+                self.ui.post(lambda: messagebox.showerror("Error", msg))
+                raise
+
+        entry = {"kind": "download", "file_id": file_id, "name": file_name, "save_path": save_path,
+                 "size": size, "modified_time": modified_time}
+        if failures:
+            entry["failures"] = failures
+        return self.scheduler.submit(_download, f"Download {file_name}", TRANSFER, priority, journal_entry=entry)
+
+    def start_folder_download(self, folder_id, folder_name, dest_dir, priority=NORMAL, failures=0):
+        """Mirror a folder tree into dest_dir; files already there with the same md5 are skipped"""
+        self.progress_frame.pack(side="bottom", pady=(0, 20), padx=20, fill="x", before=self.status_frame)
+        self.progress_bar.set(0)
+        self.progress_text.configure(text="Listing...")
+        self.progress_label.configure(text=f"Downloading {folder_name[:20]}/...")
+
+        def _progress(done, total, files_done, files_total):
+            value = done / total if total else files_done / max(files_total, 1)
+            detail = f"{format_size(done)} / {format_size(total)} · {files_done}/{files_total} files"
+            self.ui.post(lambda: self.update_progress(value, detail), key=("progress", dest_dir))
+
+        def _download(task):
+            try:
+                result = self.engine.download_folder(
+                    folder_id,
+                    dest_dir,
+                    progress_callback=_progress,
+                    cancel_event=task.cancel_event
+                )
+            except downloads.DownloadCancelled:
+                self.ui.post(lambda: self.hide_progress())
+                raise
+            except Exception as e:
+                self.ui.post(lambda: self.hide_progress())
+                msg = str(e)
+                self.ui.post(lambda: messagebox.showerror("Error", msg))
+                raise
+
+            text = f"✅ {dest_dir}\n\nDownloaded {result['downloaded']}, already up to date {result['unchanged']}"
+            if result["skipped"]:
+                text += f"\nSkipped {len(result['skipped'])} Google Docs file(s) (no downloadable content)"
+            if result["failed"]:
+                text += f"\n\nFailed:\n" + "\n".join(f"• {os.path.basename(p)}: {str(e)[:80]}"
+                                                    for p, e in result["failed"][:10])
+            self.ui.post(lambda: self.update_progress(1.0))
+            self.ui.post_later(500, lambda: self.hide_progress())
+            if result["failed"]:
+                self.ui.post_later(500, lambda: messagebox.showwarning("Folder download", text))
+                # Re-running skips everything that already arrived
+                raise RuntimeError(f"{len(result['failed'])} file(s) failed")
+            self.ui.post_later(500, lambda: messagebox.showinfo("Folder download", text))
+
+        entry = {"kind": "folder_download", "folder_id": folder_id, "name": folder_name, "save_path": dest_dir}
+        if failures:
+            entry["failures"] = failures
+        return self.scheduler.submit(_download, f"Download {folder_name}/", TRANSFER, priority, journal_entry=entry)
+
+    def download_zip(self):
+        selected = self.selected_files()
+        if len(selected) != 1 or selected[0]["mimeType"] != listing.FOLDER_MIME:
+            return
+        zip_path = filedialog.asksaveasfilename(
+            initialfile=folder_download.safe_name(self.selected_file_name) + ".zip",
+            defaultextension=".zip",
+            filetypes=[("ZIP archive", "*.zip")]
+        )
+        if not zip_path:
+            return
+        self.start_zip_download(self.selected_file_id, self.selected_file_name, zip_path)
+
+    def start_zip_download(self, folder_id, folder_name, zip_path, priority=NORMAL, failures=0):
+        """Stream a folder tree into one ZIP file; nothing is staged on disk besides the archive"""
+        self.progress_frame.pack(side="bottom", pady=(0, 20), padx=20, fill="x", before=self.status_frame)
+        self.progress_bar.set(0)
+        self.progress_text.configure(text="Listing...")
+        self.progress_label.configure(text=f"Zipping {folder_name[:20]}...")
+
+        def _progress(done, total, files_done, files_total):
+            value = done / total if total else files_done / max(files_total, 1)
+            detail = f"{format_size(done)} / {format_size(total)} · {files_done}/{files_total} files"
+            self.ui.post(lambda: self.update_progress(value, detail), key=("progress", zip_path))
+
+        def _zip(task):
             try:
-                file_metadata = self.service.files().get(
-                    fileId=self.selected_file_id, 
-                    fields='size'
-                ).execute()
-                file_size = int(file_metadata.get('size', 0))
-                request = self.service.files().get_media(fileId=self.selected_file_id)
-                fh = BytesIO()
-                downloader = MediaIoBaseDownload(fh, request)
-                done = False
-                while not done:
-                    status, done = downloader.next_chunk()
-                    if status:
-                        progress = status.progress()
-                        self.root.after(0, lambda p=progress: self.update_progress(p))
-                with open(save_path, "wb") as f:
-                    fh.seek(0)
-                    f.write(fh.read())
-                self.root.after(0, lambda: self.update_progress(1.0))
-                self.root.after(500, lambda: self.hide_progress())
-                self.root.after(500, lambda: messagebox.showinfo("Success", f"✅ Downloaded:\n{save_path}"))
+                result = self.engine.download_zip(
+                    folder_id,
+                    zip_path,
+                    progress_callback=_progress,
+                    cancel_event=task.cancel_event
+                )
+            except downloads.DownloadCancelled:
+                self.ui.post(lambda: self.hide_progress())
+                raise
             except Exception as e:
-                self.root.after(0, lambda: self.hide_progress())
-                self.root.after(0, lambda: messagebox.showerror("Error", str(e)))
+                self.ui.post(lambda: self.hide_progress())
+                msg = str(e)
+                self.ui.post(lambda: messagebox.showerror("Error", msg))
+                raise
+
+            text = f"✅ {zip_path}\n\nArchived {result['archived']} file(s)"
+            if result["skipped"]:
+                text += f"\nSkipped {len(result['skipped'])} Google Docs file(s) (no downloadable content)"
+            self.ui.post(lambda: self.update_progress(1.0))
+            self.ui.post_later(500, lambda: self.hide_progress())
+            self.ui.post_later(500, lambda: messagebox.showinfo("ZIP download", text))
+
+        entry = {"kind": "zip_download", "folder_id": folder_id, "name": folder_name, "save_path": zip_path}
+        if failures:
+            entry["failures"] = failures
+        return self.scheduler.submit(_zip, f"Zip {folder_name}", TRANSFER, priority, journal_entry=entry)
+
+    def cancel_transfers(self):
+        """Cancel every queued and running download/upload (partial data is kept)"""
+        self.scheduler.cancel_all(TRANSFER)
+        self.hide_progress()
+
+    def resume_journaled_transfers(self):
+        """Resubmit transfers that were queued or unfinished when the app last closed"""
+        uploads_by_parent = {}
+        for entry in self.scheduler.take_journal():
+            if entry.get("kind") == "download":
+                self.start_download(entry["file_id"], entry["name"], entry["save_path"],
+                                    priority=BACKGROUND, failures=entry.get("failures", 0),
+                                    size=entry.get("size"), modified_time=entry.get("modified_time"))
+            elif entry.get("kind") == "folder_download":
+                self.start_folder_download(entry["folder_id"], entry["name"], entry["save_path"],
+                                           priority=BACKGROUND, failures=entry.get("failures", 0))
+            elif entry.get("kind") == "zip_download":
+                # An archive can't be appended to safely, so it is rebuilt from the start
+                self.start_zip_download(entry["folder_id"], entry["name"], entry["save_path"],
+                                        priority=BACKGROUND, failures=entry.get("failures", 0))
+            elif entry.get("kind") == "upload" and os.path.exists(entry["path"]):
+                uploads_by_parent.setdefault(entry["parent_id"], []).append(entry)
+        for parent_id, entries in uploads_by_parent.items():
+            self.show_upload_progress(f"Resuming {len(entries)} upload(s)...")
+            self.upload_manager.upload(
+                [e["path"] for e in entries],
+                parent_id,
+                self.post_upload_progress,
+                self.post_upload_done,
+                priority=BACKGROUND,
+                failures={e["path"]: e.get("failures", 0) for e in entries}
+            )
 
-        threading.Thread(target=_download, daemon=True).start()
+    # === UPLOADS ===
+    def upload_files(self):
+        paths = filedialog.askopenfilenames(title="Upload files")
+        if not paths or not self.upload_manager:
+            return
+        self.show_upload_progress(f"Uploading {len(paths)} file(s)...")
+        parent_id = self.current_folder_id or "root"
+        self.upload_manager.upload(list(paths), parent_id, self.post_upload_progress, self.post_upload_done)
 
-    def update_progress(self, value):
+    def show_upload_progress(self, text):
+        self.progress_frame.pack(side="bottom", pady=(0, 20), padx=20, fill="x", before=self.status_frame)
+        self.progress_bar.set(0)
+        self.progress_text.configure(text="0%")
+        self.progress_label.configure(text=text)
+
+    def post_upload_progress(self, done, total, files_done, files_total):
+        """Called from upload workers"""
+        value = done / total if total else 1.0
+        self.ui.post(lambda: self.update_progress(value, f"{files_done}/{files_total} files"), key=("progress", "uploads"))
+
+    def post_upload_done(self, results):
+        """Called from an upload worker once a batch of files has finished"""
+        names = {path: os.path.basename(path) for path in results}
+        self.ui.post(lambda: self.update_progress(1.0))
+        self.ui.post_later(500, self.hide_progress)
+        self.ui.post_later(500, lambda: self.report_bulk_result(results, names, "Uploaded"))
+
+    def update_progress(self, value, detail=None):
         self.progress_bar.set(value)
         percentage = int(value * 100)
-        self.progress_text.configure(text=f"{percentage}%")
+        self.progress_text.configure(text=f"{percentage}% · {detail}" if detail else f"{percentage}%")
     
     def hide_progress(self):
         self.progress_frame.pack_forget()
@@ -554,6 +1112,9 @@ class ModernDriveApp:
     def rename_file(self):
         if not self.selected_file_id:
             return
+        if len(self.selected_ids) > 1:
+            self.rename_selected()
+            return
 
         dialog = ctk.CTkInputDialog(
             text=f"Enter new name for:\n{self.selected_file_name}",
@@ -562,19 +1123,49 @@ class ModernDriveApp:
         new_name = dialog.get_input()
         if not new_name or new_name == self.selected_file_name:
             return
+        file_id = self.selected_file_id
 
-        def _rename():
+        def _rename(task):
             try:
-                self.service.files().update(
-                    fileId=self.selected_file_id,
-                    body={'name': new_name}
-                ).execute()
-                self.root.after(0, lambda: messagebox.showinfo("Success", f"✅ Renamed to:\n{new_name}"))
-                self.root.after(0, lambda: self.go_to_folder(self.current_folder_id))
+                self.engine.rename(file_id, new_name)
+                self.ui.post(lambda: messagebox.showinfo("Success", f"✅ Renamed to:\n{new_name}"))
+                self.ui.post(self.refresh_after_mutation)
             except Exception as e:
-                self.root.after(0, lambda: messagebox.showerror("Error", f"Failed to rename:\n{e}"))
+                msg = f"Failed to rename:\n{e}"
+                self.ui.post(lambda: messagebox.showerror("Error", msg))
+
+        self.scheduler.submit(_rename, "Rename", METADATA, INTERACTIVE)
 
-        threading.Thread(target=_rename, daemon=True).start()
+    def rename_selected(self):
+        """Rename every selected item from one pattern, 100 renames per batch request"""
+        files = self.selected_files()
+        dialog = ctk.CTkInputDialog(
+            text=f"New name pattern for {len(files)} items:\n{{name}} = current name, {{n}} = 1, 2, 3...",
+            title="Rename Files"
+        )
+        pattern = dialog.get_input()
+        if not pattern:
+            return
+        new_names = batch_ops.pattern_names(files, pattern)
+        names = {f["id"]: f["name"] for f in files}
+
+        def _rename(task):
+            try:
+                results = self.engine.rename_many(new_names)
+                self.ui.post(lambda: self.report_bulk_result(results, names, "Renamed"))
+            except Exception as e:
+                msg = f"Failed to rename:\n{e}"
+                self.ui.post(lambda: messagebox.showerror("Error", msg))
+
+        self.scheduler.submit(_rename, f"Rename {len(files)} items", METADATA, NORMAL)
+
+    def report_bulk_result(self, results, names, verb):
+        text, had_errors = batch_ops.summarize(results, names, verb)
+        if had_errors:
+            messagebox.showwarning("Partly done", text)
+        else:
+            messagebox.showinfo("Success", text)
+        self.refresh_after_mutation()
 
     def move_file(self):
         if not self.selected_file_id:
@@ -586,10 +1177,11 @@ class ModernDriveApp:
         selector_window.title("Move to Folder")
         selector_window.geometry("600x700")
         selector_window.grab_set()
+        self.refresh_folder_tree()
 
         title_label = ctk.CTkLabel(
             selector_window,
-            text=f"Move: {self.selected_file_name[:40]}...",
+            text=f"Move: {self.selected_file_name[:40]}..." if len(self.selected_ids) <= 1 else f"Move: {len(self.selected_ids)} items",
             font=ctk.CTkFont(family=self.font_family, size=16, weight="bold")
         )
         title_label.pack(pady=20)
@@ -602,12 +1194,27 @@ class ModernDriveApp:
         )
         current_location.pack(pady=(0, 10))
 
+        filter_entry = ctk.CTkEntry(
+            selector_window,
+            placeholder_text="🔍 Type to filter all folders...",
+            height=36,
+            corner_radius=8,
+            font=ctk.CTkFont(family=self.ui_font, size=13)
+        )
+        filter_entry.pack(fill="x", padx=20, pady=(0, 10))
+
         nav_frame = ctk.CTkFrame(selector_window, fg_color=self.colors["bg_card"], height=50)
         nav_frame.pack(fill="x", padx=20, pady=(0, 10))
         tree_frame = ctk.CTkScrollableFrame(selector_window, fg_color="transparent")
         tree_frame.pack(fill="both", expand=True, padx=20, pady=(0, 20))
 
-        nav_state = {"current_folder": None, "breadcrumb": []}
+        tree = self.folder_tree
+        nav_state = {"current_folder": None}
+        moving = set(self.selected_ids)
+
+        def can_receive(folder_id):
+            # A folder can't be moved into itself or anything below it
+            return not any(tree.is_within(folder_id, item_id) for item_id in moving)
 
         def update_nav_breadcrumb():
             for widget in nav_frame.winfo_children():
@@ -623,7 +1230,7 @@ class ModernDriveApp:
             )
             home_btn.pack(side="left", padx=5, pady=10)
 
-            for folder_id, folder_name in nav_state["breadcrumb"]:
+            for folder_id, folder_name in tree.path_of(nav_state["current_folder"]):
                 ctk.CTkLabel(nav_frame, text="›", text_color=self.colors["text_secondary"], font=ctk.CTkFont(size=14)).pack(side="left", padx=3)
                 btn = ctk.CTkButton(
                     nav_frame,
@@ -636,67 +1243,95 @@ class ModernDriveApp:
                 )
                 btn.pack(side="left", padx=3)
 
-        def load_folder_contents(folder_id):
+        def add_folder_rows(folders, with_path=False):
+            for folder in folders[:MOVE_DIALOG_MAX_ROWS]:
+                folder_frame = ctk.CTkFrame(tree_frame, fg_color=self.colors["bg_card"])
+                folder_frame.pack(fill="x", pady=3)
+                text = f"📁 {folder['name']}"
+                if with_path:
+                    text += f"\n     {tree.path_text(folder['parents'][0]) if folder['parents'] else 'Shared with me'}"
+                open_btn = ctk.CTkButton(
+                    folder_frame,
+                    text=text,
+                    command=lambda fid=folder['id']: load_folder_contents(fid),
+                    fg_color="transparent",
+                    hover_color=self.colors["bg_hover"],
+                    anchor="w",
+                    height=52 if with_path else 40,
+                    font=ctk.CTkFont(family=self.ui_font, size=13)
+                )
+                open_btn.pack(side="left", fill="x", expand=True, padx=5, pady=5)
+                ctk.CTkLabel(folder_frame, text="›", text_color=self.colors["text_secondary"], font=ctk.CTkFont(size=18)).pack(side="right", padx=10)
+            if len(folders) > MOVE_DIALOG_MAX_ROWS:
+                more = len(folders) - MOVE_DIALOG_MAX_ROWS
+                ctk.CTkLabel(tree_frame, text=f"…and {more} more — type to filter", font=ctk.CTkFont(family=self.ui_font, size=12), text_color=self.colors["text_secondary"]).pack(pady=10)
+
+        def show_waiting():
+            """The tree is still loading (first use after sign-in): check again shortly"""
             for widget in tree_frame.winfo_children():
                 widget.destroy()
+            task = self.folder_tree_task
+            if task is not None and task.state == "failed":
+                msg = f"Error: {task.error}"
+                ctk.CTkLabel(tree_frame, text=msg, font=ctk.CTkFont(family=self.ui_font, size=13), text_color=self.colors["text_secondary"]).pack(pady=20)
+                return
+            ctk.CTkLabel(tree_frame, text="Loading folders...", font=ctk.CTkFont(family=self.ui_font, size=13), text_color=self.colors["text_secondary"]).pack(pady=20)
+            selector_window.after(200, lambda: selector_window.winfo_exists() and refresh_view())
 
-            loading = ctk.CTkLabel(tree_frame, text="Loading folders...", font=ctk.CTkFont(family=self.ui_font, size=13), text_color=self.colors["text_secondary"])
-            loading.pack(pady=20)
-
-            def _load():
-                try:
-                    query = "mimeType='application/vnd.google-apps.folder' and 'root' in parents and trashed=false" if folder_id is None else f"mimeType='application/vnd.google-apps.folder' and '{folder_id}' in parents and trashed=false"
-                    result = self.service.files().list(q=query, pageSize=100, fields="files(id, name)", orderBy="name").execute()
-                    folders = result.get("files", [])
-                    nav_state["current_folder"] = folder_id
-
-                    def update_ui():
-                        loading.destroy()
-                        update_nav_breadcrumb()
-                        move_here_frame = ctk.CTkFrame(tree_frame, fg_color=self.colors["bg_card"])
-                        move_here_frame.pack(fill="x", pady=(0, 15))
-                        move_here_btn = ctk.CTkButton(
-                            move_here_frame,
-                            text="📍 Move Here",
-                            command=lambda: self.execute_move(folder_id, selector_window),
-                            fg_color=self.colors["primary"],
-                            hover_color=self.colors["primary_hover"],
-                            height=45,
-                            font=ctk.CTkFont(family=self.font_family, size=14, weight="bold")
-                        )
-                        move_here_btn.pack(fill="x", padx=10, pady=10)
-
-                        if folders:
-                            ctk.CTkLabel(tree_frame, text="Folders:", font=ctk.CTkFont(family=self.ui_font, size=12, weight="bold"), text_color=self.colors["text_secondary"]).pack(anchor="w", pady=(10, 5))
-                            for folder in folders:
-                                folder_frame = ctk.CTkFrame(tree_frame, fg_color=self.colors["bg_card"])
-                                folder_frame.pack(fill="x", pady=3)
-                                open_btn = ctk.CTkButton(
-                                    folder_frame,
-                                    text=f"📁 {folder['name']}",
-                                    command=lambda fid=folder['id'], fname=folder['name']: navigate_into_folder(fid, fname),
-                                    fg_color="transparent",
-                                    hover_color=self.colors["bg_hover"],
-                                    anchor="w",
-                                    height=40,
-                                    font=ctk.CTkFont(family=self.ui_font, size=13)
-                                )
-                                open_btn.pack(side="left", fill="x", expand=True, padx=5, pady=5)
-                                ctk.CTkLabel(folder_frame, text="›", text_color=self.colors["text_secondary"], font=ctk.CTkFont(size=18)).pack(side="right", padx=10)
-                        else:
-                            ctk.CTkLabel(tree_frame, text="No subfolders", font=ctk.CTkFont(family=self.ui_font, size=12), text_color=self.colors["text_secondary"]).pack(pady=20)
-
-                    selector_window.after(0, update_ui)
-                except Exception as e:
-                    selector_window.after(0, lambda: loading.configure(text=f"Error: {e}"))
-
-            threading.Thread(target=_load, daemon=True).start()
-
-        def navigate_into_folder(folder_id, folder_name):
-            nav_state["breadcrumb"].append((folder_id, folder_name))
-            load_folder_contents(folder_id)
+        def load_folder_contents(folder_id):
+            nav_state["current_folder"] = folder_id
+            if filter_entry.get():
+                filter_entry.delete(0, "end")
+            if not tree.ready.is_set():
+                show_waiting()
+                return
+            for widget in tree_frame.winfo_children():
+                widget.destroy()
 
+            update_nav_breadcrumb()
+            move_here_frame = ctk.CTkFrame(tree_frame, fg_color=self.colors["bg_card"])
+            move_here_frame.pack(fill="x", pady=(0, 15))
+            move_here_btn = ctk.CTkButton(
+                move_here_frame,
+                text="📍 Move Here",
+                command=lambda: self.execute_move(folder_id, selector_window),
+                fg_color=self.colors["primary"],
+                hover_color=self.colors["primary_hover"],
+                height=45,
+                font=ctk.CTkFont(family=self.font_family, size=14, weight="bold"),
+                state="normal" if folder_id is None or can_receive(folder_id) else "disabled"
+            )
+            move_here_btn.pack(fill="x", padx=10, pady=10)
+
+            folders = [f for f in tree.children_of(folder_id) if f["id"] not in moving]
+            if folders:
+                ctk.CTkLabel(tree_frame, text="Folders:", font=ctk.CTkFont(family=self.ui_font, size=12, weight="bold"), text_color=self.colors["text_secondary"]).pack(anchor="w", pady=(10, 5))
+                add_folder_rows(folders)
+            else:
+                ctk.CTkLabel(tree_frame, text="No subfolders", font=ctk.CTkFont(family=self.ui_font, size=12), text_color=self.colors["text_secondary"]).pack(pady=20)
+
+        def show_matches():
+            """Type-to-filter over every folder in the Drive, not just the current one"""
+            if not tree.ready.is_set():
+                show_waiting()
+                return
+            for widget in tree_frame.winfo_children():
+                widget.destroy()
+            matches = [f for f in tree.filter(filter_entry.get(), limit=MOVE_DIALOG_MAX_ROWS + 1) if can_receive(f["id"])]
+            if matches:
+                add_folder_rows(matches, with_path=True)
+            else:
+                ctk.CTkLabel(tree_frame, text="No matching folders", font=ctk.CTkFont(family=self.ui_font, size=12), text_color=self.colors["text_secondary"]).pack(pady=20)
+
+        def refresh_view(event=None):
+            if filter_entry.get().strip():
+                show_matches()
+            else:
+                load_folder_contents(nav_state["current_folder"])
+
+        filter_entry.bind("<KeyRelease>", refresh_view)
         load_folder_contents(None)
+        filter_entry.focus_set()
 
         cancel_btn = ctk.CTkButton(
             selector_window,
@@ -711,35 +1346,39 @@ class ModernDriveApp:
 
     def execute_move(self, destination_folder_id, dialog_window):
         dialog_window.destroy()
-        def _move():
+        files = self.selected_files()
+        names = {f["id"]: f["name"] for f in files}
+        parents = self.files.parents_of(names)
+        destination = destination_folder_id if destination_folder_id else 'root'
+
+        def _move(task):
             try:
-                file = self.service.files().get(fileId=self.selected_file_id, fields='parents').execute()
-                previous_parents = ",".join(file.get('parents', []))
-                self.service.files().update(
-                    fileId=self.selected_file_id,
-                    addParents=destination_folder_id if destination_folder_id else 'root',
-                    removeParents=previous_parents,
-                    fields='id, parents'
-                ).execute()
-                dest_name = "My Drive (Root)" if not destination_folder_id else "selected folder"
-                self.root.after(0, lambda: messagebox.showinfo("Success", f"✅ Moved to {dest_name}"))
-                self.root.after(0, lambda: self.go_to_folder(self.current_folder_id))
+                # Parents come from the listing; only items missing them are looked up (in batches)
+                results = self.engine.move(names, destination, parents=parents)
+                self.ui.post(lambda: self.report_bulk_result(results, names, "Moved"))
             except Exception as e:
-                self.root.after(0, lambda: messagebox.showerror("Error", f"Failed to move file:\n{e}"))
-        threading.Thread(target=_move, daemon=True).start()
+                msg = f"Failed to move file:\n{e}"
+                self.ui.post(lambda: messagebox.showerror("Error", msg))
+        self.scheduler.submit(_move, f"Move {len(names)} items", METADATA, NORMAL)
 
-    def delete_file(self, file_id, file_name):
-        confirm = messagebox.askyesno("Confirm Delete", f"Move to trash:\n{file_name}\n\nAre you sure?")
+    def delete_file(self):
+        files = self.selected_files()
+        if not files:
+            return
+        label = files[0]["name"] if len(files) == 1 else f"{len(files)} items"
+        confirm = messagebox.askyesno("Confirm Delete", f"Move to trash:\n{label}\n\nAre you sure?")
         if not confirm:
             return
-        def _delete():
+        names = {f["id"]: f["name"] for f in files}
+
+        def _delete(task):
             try:
-                self.service.files().update(fileId=file_id, body={'trashed': True}).execute()
-                self.root.after(0, lambda: messagebox.showinfo("Success", f"✅ Moved to trash:\n{file_name}"))
-                self.root.after(0, lambda: self.go_to_folder(self.current_folder_id))
+                results = self.engine.trash(names)
+                self.ui.post(lambda: self.report_bulk_result(results, names, "Moved to trash"))
             except Exception as e:
-                self.root.after(0, lambda: messagebox.showerror("Error", f"Failed to delete:\n{e}"))
-        threading.Thread(target=_delete, daemon=True).start()
+                msg = f"Failed to delete:\n{e}"
+                self.ui.post(lambda: messagebox.showerror("Error", msg))
+        self.scheduler.submit(_delete, f"Trash {len(names)} items", METADATA, NORMAL)
 
     # === DRAG-TO-MOVE FUNCTIONALITY ===
     def start_drag(self, event, file_id, file_name, card):
@@ -748,25 +1387,30 @@ class ModernDriveApp:
             return
             
         # Only allow dragging files (not folders)
-        is_folder = any(f["id"] == file_id and f["mimeType"] == "application/vnd.google-apps.folder" for f in self.files)
-        if is_folder:
+        f = self.files.get(file_id)
+        if f is None or f.is_folder:
             return
             
         self.dragging = True
         self.drag_file_id = file_id
         self.drag_file_name = file_name
-        self.drag_original_card = card
         self.drop_target_folder_id = None
-        
-        # Store original card position and appearance
-        self.drag_original_fg = card.cget("fg_color")
-        self.drag_original_border = card.cget("border_color")
+        self.drag_status = self.status_label.cget("text")
         
         # Make the original card semi-transparent to indicate dragging
         card.configure(fg_color="#333333", border_color="#555555")
         
         # Create a duplicate card that follows the cursor
         self.create_drag_card(file_id, file_name, card)
+
+        # Geometry that can't change mid-drag is read once here, not on every motion event
+        self.grid_frame.reset_origin()
+        self.drag_window_origin = (self.root.winfo_rootx(), self.root.winfo_rooty())
+        self.drag_window_size = (self.root.winfo_width(), self.root.winfo_height())
+        self.drag_breadcrumb_rects = []
+        for button, folder_id in self.breadcrumb_targets:
+            bx, by = button.winfo_rootx(), button.winfo_rooty()
+            self.drag_breadcrumb_rects.append(((bx, by, bx + button.winfo_width(), by + button.winfo_height()), button, folder_id))
         
         # Bind mouse events
         self.root.bind("<B1-Motion>", self.on_drag_motion)
@@ -774,8 +1418,10 @@ class ModernDriveApp:
         
         # Disable action buttons during drag
         self.download_btn_sidebar.configure(state="disabled")
+        self.zip_btn_sidebar.configure(state="disabled")
         self.rename_btn_sidebar.configure(state="disabled")
         self.move_btn_sidebar.configure(state="disabled")
+        self.trash_btn_sidebar.configure(state="disabled")
 
     def create_drag_card(self, file_id, file_name, original_card):
         """Create a duplicate card that follows the cursor"""
@@ -824,90 +1470,108 @@ class ModernDriveApp:
         self.drag_card.lift()  # Ensure it's on top
 
     def on_drag_motion(self, event):
+        """Remember the latest pointer position; it is processed at most once per frame"""
+        if not self.dragging or not hasattr(self, 'drag_card'):
+            return
+        self.drag_pointer = (event.x_root, event.y_root)
+        if self.drag_motion_job is None:
+            self.drag_motion_job = self.root.after(DRAG_FRAME_MS, self.process_drag_motion)
+
+    def process_drag_motion(self):
         """Move the drag card with cursor and check for drop targets"""
+        self.drag_motion_job = None
         if not self.dragging or not hasattr(self, 'drag_card'):
             return
-            
+        x_root, y_root = self.drag_pointer
+
         # Position drag card near cursor
-        x = event.x_root - self.root.winfo_rootx() - 110  # Center horizontally
-        y = event.y_root - self.root.winfo_rooty() - 90   # Center vertically
+        x = x_root - self.drag_window_origin[0] - 110  # Center horizontally
+        y = y_root - self.drag_window_origin[1] - 90   # Center vertically
         
         # Keep within window bounds
-        x = max(0, min(x, self.root.winfo_width() - 220))
-        y = max(0, min(y, self.root.winfo_height() - 180))
+        x = max(0, min(x, self.drag_window_size[0] - 220))
+        y = max(0, min(y, self.drag_window_size[1] - 180))
         
         self.drag_card.place(x=x, y=y)
         
         # Check if over any folder card
-        self.check_drop_targets(event.x_root, event.y_root)
+        self.check_drop_targets(x_root, y_root)
 
     def check_drop_targets(self, x_root, y_root):
-        """Check if cursor is over any folder card"""
-        current_target = None
-        
-        # Get grid frame coordinates
-        try:
-            grid_x = x_root - self.grid_frame.winfo_rootx()
-            grid_y = y_root - self.grid_frame.winfo_rooty()
-        except:
-            self.clear_drop_targets()
-            return
-            
-        # Check each widget in grid
-        for widget in self.grid_frame.winfo_children():
-            if (hasattr(widget, 'is_folder') and widget.is_folder and 
-                hasattr(widget, 'file_id') and widget.file_id):
-                
-                # Get widget position and size
-                widget_x = widget.winfo_x()
-                widget_y = widget.winfo_y()
-                widget_width = widget.winfo_width() or 220
-                widget_height = widget.winfo_height() or 180
-                
-                # Check if cursor is inside this widget
-                if (widget_x <= grid_x <= widget_x + widget_width and 
-                    widget_y <= grid_y <= widget_y + widget_height):
-                    current_target = widget
+        """Find the folder under the cursor without walking the grid's widgets"""
+        current_target, target_id = None, None
+
+        # Grid cell from the grid's cached layout, then its card (if one is built)
+        index = self.grid_frame.item_at(x_root, y_root)
+        if index is not None:
+            f = self.grid_frame.items[index]
+            if f["mimeType"] == listing.FOLDER_MIME:
+                target_id = f["id"]
+                current_target = self.grid_frame.card_at(index)
+
+        # Breadcrumb segments are drop targets too: drag a file up to any ancestor folder
+        if target_id is None:
+            for (x0, y0, x1, y1), button, folder_id in self.drag_breadcrumb_rects:
+                if x0 <= x_root <= x1 and y0 <= y_root <= y1:
+                    current_target, target_id = button, folder_id
                     break
-        
-        # Update highlighting
-        if current_target and current_target.file_id != self.drop_target_folder_id:
-            self.clear_drop_targets()
-            current_target.configure(border_color="#4CAF50", border_width=3)
-            self.drop_target_folder_id = current_target.file_id
-        elif not current_target and self.drop_target_folder_id:
-            self.clear_drop_targets()
-            self.drop_target_folder_id = None
+        if target_id in ((self.current_folder_id or "root"), self.drag_file_id) or \
+                (target_id and self.folder_tree.is_within(target_id, self.drag_file_id)):
+            current_target, target_id = None, None  # Already there, or into itself
+
+        if target_id == self.drop_target_folder_id:
+            return
+        # Only the previous and the new target are restyled
+        self.clear_drop_targets()
+        if target_id:
+            if isinstance(current_target, ctk.CTkButton):
+                current_target.configure(fg_color=self.colors["bg_hover"], border_color="#4CAF50", border_width=2)
+            elif current_target is not None:
+                current_target.configure(border_color="#4CAF50", border_width=3)
+            self.drop_target_folder_id = target_id
+            self.drop_target_widget = current_target
+            destination = "My Drive" if target_id == "root" else self.folder_tree.path_text(target_id)
+            self.status_label.configure(text=f"● Drop to move into {destination}")
 
     def clear_drop_targets(self):
-        """Remove highlight from all folder cards"""
-        for widget in self.grid_frame.winfo_children():
-            if hasattr(widget, 'is_folder') and widget.is_folder:
-                widget.configure(border_color=self.colors["bg_card"], border_width=2)
+        """Remove the highlight from the current drop target"""
+        widget, self.drop_target_widget = self.drop_target_widget, None
+        self.drop_target_folder_id = None
+        if isinstance(widget, ctk.CTkButton):
+            widget.configure(fg_color="transparent", border_width=0)
+        elif widget is not None:
+            widget.configure(border_width=2)
+            widget.set_selected(widget.selected)
+        self.status_label.configure(text=self.drag_status)
 
     def on_drag_release(self, event):
         """Handle drag release - complete move or cancel"""
         # Clean up bindings first
         self.root.unbind("<B1-Motion>")
         self.root.unbind("<ButtonRelease-1>")
+        self.grid_frame.end_drag()
+        if self.drag_motion_job:
+            self.root.after_cancel(self.drag_motion_job)
+            self.drag_motion_job = None
+        if self.dragging:
+            self.check_drop_targets(event.x_root, event.y_root)  # Motion may still be throttled
+        target_folder_id = self.drop_target_folder_id
         
         # Clean up drag card
         if hasattr(self, 'drag_card'):
             self.drag_card.destroy()
             del self.drag_card
         
-        # Restore original card appearance
-        if hasattr(self, 'drag_original_card'):
-            self.drag_original_card.configure(
-                fg_color=self.drag_original_fg,
-                border_color=self.drag_original_border
-            )
+        # Restore original card appearance. Cards are pooled and scrolling may have
+        # rebound the one we dimmed, so look up whichever card shows the file now
+        card = self.grid_frame.card_by_id.get(self.drag_file_id)
+        if card is not None:
+            card.set_selected(card.selected)
         
         self.clear_drop_targets()
         
         # Store values before resetting state
         file_id = self.drag_file_id
-        target_folder_id = self.drop_target_folder_id
         
         # Reset drag state
         self.dragging = False
@@ -924,22 +1588,16 @@ class ModernDriveApp:
 
     def execute_drag_move(self, file_id, destination_folder_id):
         """Perform the actual file move operation"""
-        def _move():
+        f = self.files.get(file_id)
+        known_parents = list(f.parents) if f is not None and f.parents else None
+
+        def _move(task):
             try:
-                # Get current parents
-                file = self.service.files().get(fileId=file_id, fields='parents').execute()
-                previous_parents = ",".join(file.get('parents', []))
-                
-                # Perform the move
-                self.service.files().update(
-                    fileId=file_id,
-                    addParents=destination_folder_id,
-                    removeParents=previous_parents,
-                    fields='id, parents'
-                ).execute()
+                # Current parents come from the listing; only ask the API if they are missing
+                self.engine.move_one(file_id, destination_folder_id, parents=known_parents)
                 
-                self.root.after(0, lambda: messagebox.showinfo("Success", "✅ File moved successfully"))
-                self.root.after(100, lambda: self.go_to_folder(self.current_folder_id))
+                self.ui.post(lambda: messagebox.showinfo("Success", "✅ File moved successfully"))
+                self.ui.post_later(100, self.refresh_after_mutation)
                 
             except Exception as e:
                 error_msg = str(e)
@@ -950,23 +1608,27 @@ class ModernDriveApp:
                 else:
                     msg = f"Move failed: {error_msg[:100]}"
                     
-                self.root.after(0, lambda: messagebox.showerror("Move Error", msg))
+                self.ui.post(lambda: messagebox.showerror("Move Error", msg))
         
-        threading.Thread(target=_move, daemon=True).start()
+        self.scheduler.submit(_move, "Move", METADATA, INTERACTIVE)
 
     def update_action_buttons(self):
         """Update action button states based on current selection"""
-        if self.selected_file_id and not self.dragging:
-            is_folder = any(f["id"] == self.selected_file_id and 
-                           f["mimeType"] == "application/vnd.google-apps.folder" 
-                           for f in self.files)
-            self.download_btn_sidebar.configure(state="disabled" if is_folder else "normal")
+        if self.selected_ids and not self.dragging and self.signed_in:
+            selected = self.selected_files()
+            # Download works on a single file or folder (folders download recursively)
+            self.download_btn_sidebar.configure(state="normal" if len(selected) == 1 else "disabled")
+            single_folder = len(selected) == 1 and selected[0]["mimeType"] == listing.FOLDER_MIME
+            self.zip_btn_sidebar.configure(state="normal" if single_folder else "disabled")
             self.rename_btn_sidebar.configure(state="normal")
             self.move_btn_sidebar.configure(state="normal")
+            self.trash_btn_sidebar.configure(state="normal")
         else:
             self.download_btn_sidebar.configure(state="disabled")
+            self.zip_btn_sidebar.configure(state="disabled")
             self.rename_btn_sidebar.configure(state="disabled")
             self.move_btn_sidebar.configure(state="disabled")
+            self.trash_btn_sidebar.configure(state="disabled")
 
 if __name__ == "__main__":
     root = ctk.CTk()
@@ -1,4 +1,7 @@
 # -*- mode: python ; coding: utf-8 -*-
+import os
+
+DISCOVERY_DOCUMENTS = os.path.join('googleapiclient', 'discovery_cache', 'documents')
 
 
 a = Analysis(
@@ -14,6 +17,11 @@ a = Analysis(
     noarchive=False,
     optimize=0,
 )
+# The googleapiclient hook collects ~600 discovery documents (~110 MB) that the one-file
+# exe would unpack on every launch; only Drive v3's is used (see discovery.py)
+a.datas = [d for d in a.datas
+           if not os.path.normpath(d[0]).startswith(DISCOVERY_DOCUMENTS)
+           or os.path.basename(d[0]) == 'drive.v3.json']
 pyz = PYZ(a.pure)
 
 exe = EXE(
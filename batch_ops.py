@@ -0,0 +1,108 @@
+# batch_ops.py — Bulk move / rename / trash through batched API requests
+import os
+import time
+import ratelimit
+
+BATCH_SIZE = 100  # Drive accepts at most 100 calls per batch round trip
+MAX_ROUNDS = 5    # Batches sent for calls that keep coming back rate limited
+
+
+def run_batched(service, requests, progress_callback=None):
+    """Execute (request_id, HttpRequest) pairs, BATCH_SIZE calls per HTTP round trip.
+
+    Returns {request_id: (response, error)} with error None on success, so
+    every item's outcome is reported. Calls inside a batch that come back
+    rate limited are sent again in a later batch after a backoff.
+    """
+    results = {}
+
+    def _collect(request_id, response, exception):
+        results[request_id] = (response, exception)
+
+    governor = getattr(service, "governor", None)
+    pending = list(requests)
+    for attempt in range(MAX_ROUNDS):
+        for start in range(0, len(pending), BATCH_SIZE):
+            batch = service.new_batch_http_request(callback=_collect)
+            for request_id, request in pending[start:start + BATCH_SIZE]:
+                batch.add(request, request_id=request_id)
+            batch.execute()
+            if progress_callback:
+                done = len(requests) - len(pending) + min(start + BATCH_SIZE, len(pending))
+                progress_callback(done, len(requests))
+        pending = [(rid, request) for rid, request in pending if ratelimit.is_throttled_error(results[rid][1])]
+        if not pending or attempt == MAX_ROUNDS - 1:
+            break
+        if governor:
+            governor.throttle()
+        time.sleep(ratelimit.backoff_delay(attempt))
+    return results
+
+
+def fetch_parents(service, file_ids):
+    """Current parents of each file, fetched in batches. Returns {file_id: [parent_id, ...]}"""
+    requests = [(fid, service.files().get(fileId=fid, fields="id, parents")) for fid in file_ids]
+    results = run_batched(service, requests)
+    return {fid: (response or {}).get("parents", []) for fid, (response, error) in results.items() if not error}
+
+
+def bulk_move(service, file_ids, destination_id, parents=None, progress_callback=None):
+    """Move files into destination_id ('root' for My Drive).
+
+    parents maps file_id -> current parents where already known; the rest
+    are looked up with batched files().get calls first.
+    """
+    parents = dict(parents or {})
+    missing = [fid for fid in file_ids if fid not in parents]
+    if missing:
+        parents.update(fetch_parents(service, missing))
+
+    requests = []
+    results = {}
+    for fid in file_ids:
+        if fid not in parents:
+            results[fid] = (None, LookupError("Could not read the file's current folder"))
+            continue
+        requests.append((fid, service.files().update(
+            fileId=fid,
+            addParents=destination_id,
+            removeParents=",".join(p for p in parents[fid] if p != destination_id),
+            fields="id, parents"
+        )))
+    results.update(run_batched(service, requests, progress_callback))
+    return results
+
+
+def bulk_trash(service, file_ids, progress_callback=None):
+    requests = [(fid, service.files().update(fileId=fid, body={"trashed": True}, fields="id"))
+                for fid in file_ids]
+    return run_batched(service, requests, progress_callback)
+
+
+def bulk_rename(service, new_names, progress_callback=None):
+    """new_names maps file_id -> new name"""
+    requests = [(fid, service.files().update(fileId=fid, body={"name": name}, fields="id, name"))
+                for fid, name in new_names.items()]
+    return run_batched(service, requests, progress_callback)
+
+
+def pattern_names(files, pattern):
+    """New names for a bulk rename. {name} is the old name without extension, {n} a counter"""
+    names = {}
+    for n, f in enumerate(files, 1):
+        stem, ext = os.path.splitext(f["name"])
+        if f.get("mimeType", "").startswith("application/vnd.google-apps."):
+            stem, ext = f["name"], ""  # Docs/folders have no real extension
+        names[f["id"]] = pattern.replace("{name}", stem).replace("{n}", str(n)) + ext
+    return names
+
+
+def summarize(results, names, verb):
+    """Messagebox text listing how many succeeded and why the others failed"""
+    failed = [(fid, error) for fid, (_, error) in results.items() if error]
+    text = f"✅ {verb} {len(results) - len(failed)} of {len(results)} item(s)"
+    if failed:
+        text += "\n\nFailed:\n" + "\n".join(f"• {names.get(fid, fid)}: {str(error)[:80]}" for fid, error in failed[:10])
+        if len(failed) > 10:
+            text += f"\n…and {len(failed) - 10} more"
+    return text, bool(failed)
@@ -0,0 +1,454 @@
+# fake_drive.py — In-memory stand-in for the Drive v3 endpoints the app uses, for offline benchmarks
+#
+# FakeDrive answers files.list (q subset, paging, orderBy), files.get (metadata and
+# alt=media with Range), files.create (folders), files.update (name, trashed, parents),
+# resumable uploads, batch requests and the changes feed. Latency, bandwidth,
+# throttling and server errors can be injected.
+#
+# Reach it in-process with FakeHttp (an httplib2.Http look-alike, no sockets), or over
+# localhost with serve() and LocalHttp. Either plugs in as the transport of a
+# ServicePool / DriveEngine, under the real auth, governor and googleapiclient layers.
+import re
+import json
+import time
+import uuid
+import random
+import hashlib
+import threading
+import itertools
+import urllib.parse
+from email.parser import BytesParser
+from http.server import ThreadingHTTPServer, BaseHTTPRequestHandler
+import httplib2
+from listing import FOLDER_MIME, sort_key
+GOOGLE_APPS_PREFIX = "application/vnd.google-apps."
+ROOT_ID = "0AFakeRootFolder"
+API_HOST = "https://www.googleapis.com"
+DEFAULT_PAGE_SIZE = 100
+MAX_PAGE_SIZE = 1000
+MODIFIED_TIME = "2024-01-01T00:00:00.000Z"
+
+QUERY_TERMS = [
+    (re.compile(r"'((?:[^'\\]|\\.)*)'\s+in\s+parents"), "parent"),
+    (re.compile(r"trashed\s*=\s*(true|false)"), "trashed"),
+    (re.compile(r"name\s*=\s*'((?:[^'\\]|\\.)*)'"), "name"),
+    (re.compile(r"mimeType\s*=\s*'([^']*)'"), "mime"),
+    (re.compile(r"mimeType\s*!=\s*'([^']*)'"), "not_mime"),
+]
+
+
+class QueryError(ValueError):
+    pass
+
+
+def unescape(value):
+    return re.sub(r"\\(.)", r"\1", value)
+
+
+def parse_query(q):
+    """A files.list q string -> [(kind, value)]; only 'and' of the terms the app sends"""
+    terms, rest = [], q.strip()
+    while rest:
+        for pattern, kind in QUERY_TERMS:
+            m = pattern.match(rest)
+            if m:
+                terms.append((kind, unescape(m.group(1))))
+                rest = rest[m.end():].strip()
+                break
+        else:
+            raise QueryError(f"Unsupported query: {rest!r}")
+        if rest:
+            if not rest.lower().startswith("and "):
+                raise QueryError(f"Unsupported query: {rest!r}")
+            rest = rest[4:].strip()
+    return terms
+
+
+def field_names(fields, collection=None):
+    """Requested keys from a fields parameter ("files(id, name)" when collection="files"), or None for all"""
+    if not fields:
+        return None
+    if collection:
+        m = re.search(collection + r"\(([^)]*)\)", fields)
+        if not m:
+            return None
+        fields = m.group(1)
+    if "*" in fields or "(" in fields:
+        return None
+    return {f.strip() for f in fields.split(",") if f.strip()}
+
+
+def error_body(status, reason, message):
+    return json.dumps({"error": {"code": status, "message": message,
+                                 "errors": [{"reason": reason, "message": message}]}}).encode()
+
+
+class FakeDrive:
+    """One user's Drive held in memory, served through handle(method, uri, headers, body)"""
+
+    def __init__(self, latency=0.0, bandwidth=None, throttle_rate=0.0, failure_rate=0.0, seed=0):
+        self.latency = latency              # Seconds added to every request (and every batch part)
+        self.bandwidth = bandwidth          # Bytes per second for media in either direction, None = unlimited
+        self.throttle_rate = throttle_rate  # Fraction of requests answered 403 rateLimitExceeded
+        self.failure_rate = failure_rate    # Fraction of requests answered 500 backendError
+        self.random = random.Random(seed)
+        self.lock = threading.RLock()
+        self.files = {ROOT_ID: {"id": ROOT_ID, "name": "My Drive", "mimeType": FOLDER_MIME, "parents": [],
+                                "modifiedTime": MODIFIED_TIME, "trashed": False}}
+        self.content = {}
+        self.sessions = {}  # Upload id -> {"meta", "size", "data", "fields"}
+        self.changes = []   # Change records, the page token being an index into this log
+        self.ids = itertools.count(1)
+        self.calls = {}     # Endpoint -> count; "batch" counts round trips, "batch_part" the calls inside
+        self.bytes_sent = 0
+        self.bytes_received = 0
+
+    # === Building a tree ===
+    def new_id(self):
+        return f"fake{next(self.ids):08d}"
+
+    def add_folder(self, name, parent=ROOT_ID):
+        return self._add({"name": name, "mimeType": FOLDER_MIME, "parents": [parent]})
+
+    def add_file(self, name, parent=ROOT_ID, data=b"", mime_type="application/octet-stream"):
+        return self._add({"name": name, "mimeType": mime_type, "parents": [parent]}, data)
+
+    def add_files(self, parent, count, size=0, prefix="file", mime_type="application/octet-stream"):
+        """count files of size bytes each; the content is shared, so big trees stay cheap"""
+        data = bytes(random.Random(size).getrandbits(8) for _ in range(min(size, 4096))) * (size // 4096 + 1)
+        data = data[:size]
+        return [self.add_file(f"{prefix}{i:05d}.bin", parent, data, mime_type) for i in range(count)]
+
+    def _add(self, meta, data=None):
+        with self.lock:
+            file_id = self.new_id()
+            record = {"id": file_id, "modifiedTime": MODIFIED_TIME, "trashed": False, **meta}
+            if data is not None and not meta["mimeType"].startswith(GOOGLE_APPS_PREFIX):
+                record["size"] = str(len(data))
+                record["md5Checksum"] = hashlib.md5(data).hexdigest()
+                self.content[file_id] = data
+            self.files[file_id] = record
+            self._changed(file_id)
+            return file_id
+
+    def _changed(self, file_id):
+        record = self.files[file_id]
+        record["modifiedTime"] = time.strftime("%Y-%m-%dT%H:%M:%S.000Z", time.gmtime())
+        self.changes.append({"kind": "drive#change", "fileId": file_id, "removed": False, "file": dict(record)})
+
+    def resolve(self, file_id):
+        return ROOT_ID if file_id == "root" else file_id
+
+    def stats(self):
+        with self.lock:
+            return {"calls": dict(self.calls), "bytes_sent": self.bytes_sent, "bytes_received": self.bytes_received}
+
+    def _count(self, name):
+        with self.lock:
+            self.calls[name] = self.calls.get(name, 0) + 1
+
+    # === Dispatch ===
+    def handle(self, method, uri, headers=None, body=None):
+        """(status, headers, body) for one HTTP request addressed to the Drive API"""
+        headers = {k.lower(): v for k, v in (headers or {}).items()}
+        if isinstance(body, str):
+            body = body.encode("utf-8")
+        body = bytes(body or b"")
+        parsed = urllib.parse.urlparse(uri)
+        query = {k: v[0] for k, v in urllib.parse.parse_qs(parsed.query, keep_blank_values=True).items()}
+        path = parsed.path
+
+        if path.startswith("/batch/"):
+            self._count("batch")
+            return self._batch(headers, body, f"{parsed.scheme}://{parsed.netloc}")
+
+        if self.latency:
+            time.sleep(self.latency)
+        injected = self._inject()
+        if injected:
+            return injected
+        try:
+            return self._route(method, path, query, headers, body, f"{parsed.scheme}://{parsed.netloc}")
+        except QueryError as e:
+            return 400, {"content-type": "application/json"}, error_body(400, "invalid", str(e))
+        except KeyError as e:
+            return 404, {"content-type": "application/json"}, error_body(404, "notFound", f"File not found: {e}")
+
+    def _inject(self):
+        roll = self.random.random()
+        if roll < self.throttle_rate:
+            self._count("throttled")
+            return 403, {"content-type": "application/json"}, error_body(403, "rateLimitExceeded", "Rate Limit Exceeded")
+        if roll < self.throttle_rate + self.failure_rate:
+            self._count("failed")
+            return 500, {"content-type": "application/json"}, error_body(500, "backendError", "Backend Error")
+        return None
+
+    def _route(self, method, path, query, headers, body, host):
+        parts = [p for p in path.split("/") if p]
+        if parts[:3] == ["upload", "drive", "v3"]:
+            if method == "POST":
+                self._count("upload_start")
+                return self._start_upload(query, headers, body, host)
+            self._count("upload_put")
+            return self._upload_put(query["upload_id"], headers, body)
+        if parts[:2] != ["drive", "v3"]:
+            raise KeyError(path)
+        parts = parts[2:]
+        if parts == ["files"] and method == "GET":
+            self._count("files.list")
+            return self._json(self._list(query))
+        if parts == ["files"] and method == "POST":
+            self._count("files.create")
+            return self._json(self._create(json.loads(body or b"{}"), query))
+        if parts[0] == "files" and len(parts) == 2:
+            file_id = self.resolve(urllib.parse.unquote(parts[1]))
+            if method == "GET" and query.get("alt") == "media":
+                self._count("files.get_media")
+                return self._media(file_id, headers)
+            if method == "GET":
+                self._count("files.get")
+                return self._json(self._filter(self.files[file_id], field_names(query.get("fields"))))
+            if method == "PATCH":
+                self._count("files.update")
+                return self._json(self._update(file_id, query, json.loads(body or b"{}")))
+        if parts == ["changes", "startPageToken"]:
+            self._count("changes.getStartPageToken")
+            with self.lock:
+                return self._json({"startPageToken": str(len(self.changes))})
+        if parts == ["changes"]:
+            self._count("changes.list")
+            return self._json(self._changes(query))
+        raise KeyError(path)
+
+    def _json(self, obj, status=200):
+        return status, {"content-type": "application/json; charset=UTF-8"}, json.dumps(obj).encode()
+
+    @staticmethod
+    def _filter(record, names):
+        public = {k: v for k, v in record.items() if k != "trashed" or names}
+        return public if names is None else {k: v for k, v in public.items() if k in names}
+
+    # === files.list / create / update ===
+    def _list(self, query):
+        terms = parse_query(query.get("q", ""))
+        with self.lock:
+            matches = []
+            for record in self.files.values():
+                if record["id"] == ROOT_ID:
+                    continue
+                if all(self._matches(record, kind, value) for kind, value in terms):
+                    matches.append(record)
+        if query.get("orderBy"):
+            # Only the "folder,name" ordering the app asks for
+            matches.sort(key=sort_key)
+        start = int(query.get("pageToken") or 0)
+        size = min(int(query.get("pageSize") or DEFAULT_PAGE_SIZE), MAX_PAGE_SIZE)
+        names = field_names(query.get("fields"), "files")
+        result = {"files": [self._filter(r, names) for r in matches[start:start + size]]}
+        if start + size < len(matches):
+            result["nextPageToken"] = str(start + size)
+        return result
+
+    def _matches(self, record, kind, value):
+        if kind == "parent":
+            return self.resolve(value) in record["parents"]
+        if kind == "trashed":
+            return record["trashed"] == (value == "true")
+        if kind == "name":
+            return record["name"] == value
+        if kind == "mime":
+            return record["mimeType"] == value
+        return record["mimeType"] != value
+
+    def _create(self, meta, query):
+        parents = [self.resolve(p) for p in meta.get("parents", [ROOT_ID])]
+        file_id = self._add({"name": meta.get("name", "Untitled"),
+                             "mimeType": meta.get("mimeType", "application/octet-stream"), "parents": parents},
+                            None if meta.get("mimeType") == FOLDER_MIME else b"")
+        return self._filter(self.files[file_id], field_names(query.get("fields")))
+
+    def _update(self, file_id, query, body):
+        with self.lock:
+            record = self.files[file_id]
+            if "name" in body:
+                record["name"] = body["name"]
+            if "trashed" in body:
+                record["trashed"] = bool(body["trashed"])
+            removed = {self.resolve(p) for p in query.get("removeParents", "").split(",") if p}
+            added = [self.resolve(p) for p in query.get("addParents", "").split(",") if p]
+            record["parents"] = [p for p in record["parents"] if p not in removed] + \
+                                [p for p in added if p not in record["parents"]]
+            self._changed(file_id)
+            return self._filter(record, field_names(query.get("fields")) or {"id", "name", "mimeType"})
+
+    def _changes(self, query):
+        start = int(query.get("pageToken") or 0)
+        size = min(int(query.get("pageSize") or DEFAULT_PAGE_SIZE), MAX_PAGE_SIZE)
+        with self.lock:
+            page = self.changes[start:start + size]
+            result = {"changes": page}
+            if start + size < len(self.changes):
+                result["nextPageToken"] = str(start + size)
+            else:
+                result["newStartPageToken"] = str(len(self.changes))
+        return result
+
+    # === Media ===
+    def _transfer(self, nbytes, sent):
+        with self.lock:
+            if sent:
+                self.bytes_sent += nbytes
+            else:
+                self.bytes_received += nbytes
+        if self.bandwidth:
+            time.sleep(nbytes / self.bandwidth)
+
+    def _media(self, file_id, headers):
+        record = self.files[file_id]
+        if record["mimeType"].startswith(GOOGLE_APPS_PREFIX):
+            return 403, {"content-type": "application/json"}, error_body(
+                403, "fileNotDownloadable", "Only files with binary content can be downloaded")
+        data = self.content.get(file_id, b"")
+        m = re.match(r"bytes=(\d+)-(\d*)", headers.get("range", ""))
+        if not m:
+            self._transfer(len(data), sent=True)
+            return 200, {"content-type": record["mimeType"], "content-length": str(len(data))}, data
+        start = int(m.group(1))
+        end = min(int(m.group(2)) if m.group(2) else len(data) - 1, len(data) - 1)
+        if start >= len(data):
+            return 416, {"content-range": f"bytes */{len(data)}"}, b""
+        chunk = data[start:end + 1]
+        self._transfer(len(chunk), sent=True)
+        return 206, {"content-type": record["mimeType"], "content-length": str(len(chunk)),
+                     "content-range": f"bytes {start}-{end}/{len(data)}"}, chunk
+
+    # === Resumable uploads ===
+    def _start_upload(self, query, headers, body, host):
+        meta = json.loads(body or b"{}")
+        upload_id = uuid.uuid4().hex
+        with self.lock:
+            self.sessions[upload_id] = {
+                "meta": meta,
+                "mime_type": headers.get("x-upload-content-type", "application/octet-stream"),
+                "size": int(headers.get("x-upload-content-length", 0)),
+                "data": bytearray(),
+                "fields": field_names(query.get("fields")),
+                "file_id": None
+            }
+        location = f"{host}/upload/drive/v3/files?uploadType=resumable&upload_id={upload_id}"
+        return 200, {"location": location}, b""
+
+    def _upload_put(self, upload_id, headers, body):
+        with self.lock:
+            session = self.sessions.get(upload_id)
+        if session is None:
+            return 404, {"content-type": "application/json"}, error_body(404, "notFound", "Upload session not found")
+        m = re.match(r"bytes (\d+)-(\d+)/(\d+)", headers.get("content-range", ""))
+        if m and int(m.group(1)) == len(session["data"]):
+            self._transfer(len(body), sent=False)
+            session["data"] += body
+        if session["file_id"] is None and len(session["data"]) >= session["size"]:
+            meta = session["meta"]
+            parents = [self.resolve(p) for p in meta.get("parents", [ROOT_ID])]
+            session["file_id"] = self._add({"name": meta.get("name", "Untitled"), "mimeType": session["mime_type"],
+                                            "parents": parents}, bytes(session["data"]))
+        if session["file_id"] is not None:
+            return self._json(self._filter(self.files[session["file_id"]], session["fields"]))
+        received = len(session["data"])
+        return 308, ({"range": f"bytes=0-{received - 1}"} if received else {}), b""
+
+    # === Batch ===
+    def _batch(self, headers, body, host):
+        """Run each part of a multipart/mixed batch; latency is paid once per round trip"""
+        if self.latency:
+            time.sleep(self.latency)
+        message = BytesParser().parsebytes(b"Content-Type: " + headers["content-type"].encode() + b"\r\n\r\n" + body)
+        boundary = uuid.uuid4().hex
+        out = []
+        for part in message.get_payload():
+            payload = part.get_payload(decode=True) or part.get_payload().encode()
+            request_line, _, rest = payload.partition(b"\n")
+            method, target, _ = request_line.decode().strip().split(" ", 2)
+            head, _, inner_body = rest.replace(b"\r\n", b"\n").partition(b"\n\n")
+            inner_headers = {}
+            for line in head.decode().splitlines():
+                if ":" in line:
+                    key, value = line.split(":", 1)
+                    inner_headers[key.strip().lower()] = value.strip()
+            self._count("batch_part")
+            status, resp_headers, resp_body = self._inject() or self._run_part(method, target, inner_headers,
+                                                                                  inner_body, host)
+            header_lines = "".join(f"{k}: {v}\r\n" for k, v in resp_headers.items())
+            out.append(f"--{boundary}\r\nContent-Type: application/http\r\n"
+                       f"Content-ID: <response-{part['Content-ID'][1:]}\r\n\r\n"
+                       f"HTTP/1.1 {status} {'OK' if status < 300 else 'Error'}\r\n{header_lines}\r\n".encode()
+                       + resp_body + b"\r\n")
+        out.append(f"--{boundary}--\r\n".encode())
+        return 200, {"content-type": f"multipart/mixed; boundary={boundary}"}, b"".join(out)
+
+    def _run_part(self, method, target, headers, body, host):
+        parsed = urllib.parse.urlparse(target)
+        query = {k: v[0] for k, v in urllib.parse.parse_qs(parsed.query, keep_blank_values=True).items()}
+        try:
+            return self._route(method, parsed.path, query, headers, body.strip(), host)
+        except KeyError as e:
+            return 404, {"content-type": "application/json"}, error_body(404, "notFound", f"File not found: {e}")
+
+
+class FakeHttp:
+    """httplib2.Http look-alike answering from a FakeDrive in-process: the whole client stack, no sockets"""
+
+    def __init__(self, drive, timeout=None):
+        self.drive = drive
+        self.timeout = timeout
+        self.connections = {}
+        self.follow_redirects = True
+        self.redirect_codes = set()
+
+    def request(self, uri, method="GET", body=None, headers=None, redirections=5, connection_type=None):
+        status, headers, content = self.drive.handle(method, uri, headers, body)
+        return httplib2.Response({"status": status, **headers}), content
+
+
+class LocalHttp(httplib2.Http):
+    """httplib2.Http that sends googleapis.com requests to a serve()d FakeDrive on localhost"""
+
+    def __init__(self, port, **kwargs):
+        super().__init__(**kwargs)
+        self.base = f"http://127.0.0.1:{port}"
+
+    def request(self, uri, method="GET", body=None, headers=None, **kwargs):
+        if uri.startswith(API_HOST):
+            uri = self.base + uri[len(API_HOST):]
+        return super().request(uri, method, body=body, headers=headers, **kwargs)
+
+
+def serve(drive, port=0):
+    """Serve drive over HTTP on 127.0.0.1 from a daemon thread. Returns the server (.server_port)"""
+
+    class Handler(BaseHTTPRequestHandler):
+        protocol_version = "HTTP/1.1"  # Keep-alive, as httplib2 expects
+
+        def _handle(self):
+            length = int(self.headers.get("content-length") or 0)
+            body = self.rfile.read(length) if length else b""
+            host = f"http://{self.headers.get('host', '127.0.0.1')}"
+            status, headers, content = drive.handle(self.command, host + self.path, dict(self.headers), body)
+            self.send_response(status)
+            for key, value in headers.items():
+                if key != "content-length":
+                    self.send_header(key, value)
+            self.send_header("content-length", str(len(content)))
+            self.end_headers()
+            self.wfile.write(content)
+
+        do_GET = do_POST = do_PUT = do_PATCH = do_DELETE = _handle
+
+        def log_message(self, format, *args):
+            pass
+
+    server = ThreadingHTTPServer(("127.0.0.1", port), Handler)
+    server.daemon_threads = True
+    threading.Thread(target=server.serve_forever, name="fake-drive", daemon=True).start()
+    return server
@@ -0,0 +1,119 @@
+# startup.py — Cold-start benchmark: each run is a fresh interpreter, timed phase by phase
+#
+#   python benchmarks/startup.py                      # 10 runs, print medians
+#   python benchmarks/startup.py --save base.json     # record a baseline
+#   python benchmarks/startup.py --compare base.json  # exit 1 if a phase got slower
+import os
+import sys
+import json
+import time
+import argparse
+import tempfile
+import statistics
+import subprocess
+
+ROOT = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+RUNS = 10
+TOLERANCE = 0.25   # A phase regresses when its median is this much above the baseline's...
+SLACK_MS = 5       # ...and by more than this, so noise on tiny phases doesn't fail the run
+
+# Runs in the child, with the repo on sys.path and a scratch working directory
+# (no token.json, so the app starts signed out and never touches the network)
+CHILD = r"""
+import sys, json, time
+sys.path.insert(0, sys.argv[1])
+phases = {}
+t = time.perf_counter()
+import app
+phases["import_app"] = time.perf_counter() - t
+
+try:
+    t = time.perf_counter()
+    root = app.ctk.CTk()
+    app.ModernDriveApp(root)
+    root.update()
+    phases["first_paint"] = time.perf_counter() - t
+    root.destroy()
+except Exception as e:  # No display
+    print(f"first_paint skipped: {e}", file=sys.stderr)
+
+t = time.perf_counter()
+app.import_drive_stack()
+phases["drive_stack"] = time.perf_counter() - t
+
+import httplib2
+import discovery
+from googleapiclient.discovery import build
+t = time.perf_counter()
+discovery.build_drive(httplib2.Http())
+phases["build_service"] = time.perf_counter() - t
+t = time.perf_counter()
+build("drive", "v3", http=httplib2.Http(), cache_discovery=False)
+phases["build_service_unshared"] = time.perf_counter() - t
+
+print(json.dumps(phases))
+"""
+
+
+def run_once():
+    with tempfile.TemporaryDirectory() as scratch:
+        start = time.perf_counter()
+        out = subprocess.run([sys.executable, "-c", CHILD, ROOT], cwd=scratch,
+                             capture_output=True, text=True, check=True)
+        total = time.perf_counter() - start
+    phases = json.loads(out.stdout.strip().splitlines()[-1])
+    phases["process_total"] = total
+    return phases
+
+
+def summarize(runs):
+    names = sorted({name for run in runs for name in run})
+    return {name: {"median_ms": statistics.median(r[name] for r in runs if name in r) * 1000,
+                   "min_ms": min(r[name] for r in runs if name in r) * 1000,
+                   "max_ms": max(r[name] for r in runs if name in r) * 1000}
+            for name in names}
+
+
+def compare(summary, baseline, tolerance=TOLERANCE):
+    """Phases slower than the baseline beyond tolerance: [(name, baseline_ms, now_ms)]"""
+    slower = []
+    for name, now in summary.items():
+        before = baseline.get(name)
+        if before is None:
+            continue
+        limit = max(before["median_ms"] * (1 + tolerance), before["median_ms"] + SLACK_MS)
+        if now["median_ms"] > limit:
+            slower.append((name, before["median_ms"], now["median_ms"]))
+    return slower
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Measure Drive Manager cold start")
+    parser.add_argument("--runs", type=int, default=RUNS)
+    parser.add_argument("--save", help="Write the results to this JSON file as a baseline")
+    parser.add_argument("--compare", help="Baseline JSON file to check the results against")
+    parser.add_argument("--tolerance", type=float, default=TOLERANCE)
+    args = parser.parse_args()
+
+    run_once()  # Warm the OS file cache so the first measured run isn't an outlier
+    runs = [run_once() for _ in range(args.runs)]
+    summary = summarize(runs)
+
+    print(f"{'phase':<24}{'median':>10}{'min':>10}{'max':>10}   ({args.runs} runs, ms)")
+    for name, s in summary.items():
+        print(f"{name:<24}{s['median_ms']:>10.1f}{s['min_ms']:>10.1f}{s['max_ms']:>10.1f}")
+
+    if args.save:
+        with open(args.save, "w") as f:
+            json.dump(summary, f, indent=2)
+    if args.compare:
+        with open(args.compare) as f:
+            slower = compare(summary, json.load(f), args.tolerance)
+        for name, before, now in slower:
+            print(f"REGRESSION {name}: {before:.1f} ms -> {now:.1f} ms")
+        if slower:
+            sys.exit(1)
+
+
+if __name__ == "__main__":
+    main()
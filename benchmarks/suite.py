@@ -0,0 +1,237 @@
+# suite.py — Offline benchmarks of the Drive paths, run against the FakeDrive stand-in
+#
+#   python benchmarks/suite.py                          # every benchmark, 3 repeats, medians
+#   python benchmarks/suite.py --only listing,download  # a subset
+#   python benchmarks/suite.py --latency 0.05 --throttle 0.05 --failures 0.01 --bandwidth 50e6
+#   python benchmarks/suite.py --server                 # over a localhost socket instead of in-process
+#   python benchmarks/suite.py --save base.json / --compare base.json   # as startup.py
+#
+# The whole client stack runs for real (ServicePool, Governor, googleapiclient,
+# the transfer modules) down to the HTTP transport, which FakeDrive answers.
+# Times are in ms (lower is better); *_mbps rows are throughput (higher is better).
+import os
+import sys
+import json
+import time
+import shutil
+import argparse
+import tempfile
+import datetime
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+sys.path.insert(0, os.path.dirname(os.path.abspath(__file__)))
+
+from google.oauth2.credentials import Credentials
+from fake_drive import FakeDrive, FakeHttp, LocalHttp, serve
+from startup import summarize, compare, TOLERANCE
+import engine
+from ratelimit import Governor
+from tracing import Tracer, format_summary
+from scheduler import Scheduler, METADATA, TRANSFER
+
+REPEATS = 3
+LISTING_FILES = 5000             # Files in the folder listed (and rendered)
+MIRROR_FILES = 200               # Files in the folder mirrored
+MIRROR_FILE_SIZE = 64 * 1024
+DOWNLOAD_SIZE = 64 * 1024 * 1024
+UPLOAD_SIZE = 32 * 1024 * 1024
+MOVE_FILES = 500
+BENCHMARKS = ("listing", "render", "download", "mirror", "upload", "bulk_move")
+
+
+def fake_credentials():
+    # Valid for a day, so nothing ever tries to refresh against the real token endpoint
+    return Credentials(token="fake-token", expiry=datetime.datetime.utcnow() + datetime.timedelta(days=1))
+
+
+class Bench:
+    """One FakeDrive, populated once, and a DriveEngine pointed at it"""
+
+    def __init__(self, args, workdir):
+        self.workdir = workdir
+        self.drive = FakeDrive(latency=args.latency, bandwidth=args.bandwidth,
+                               throttle_rate=args.throttle, failure_rate=args.failures)
+        self.big = self.drive.add_folder("Big")
+        self.drive.add_files(self.big, LISTING_FILES, prefix="listed")
+        self.mirror = self.drive.add_folder("Mirror")
+        self.drive.add_files(self.mirror, MIRROR_FILES, MIRROR_FILE_SIZE, prefix="mirrored")
+        self.large = self.drive.add_file("large.bin", data=os.urandom(DOWNLOAD_SIZE))
+        self.moving = self.drive.add_folder("Moving")
+        self.moved = self.drive.add_files(self.moving, MOVE_FILES, prefix="moved")
+        self.targets = [self.drive.add_folder("Target A"), self.drive.add_folder("Target B")]
+        self.moved_from = self.moving  # Where the moved files are now
+
+        if args.server:
+            self.server = serve(self.drive)
+            transport = lambda: LocalHttp(self.server.server_port)
+        else:
+            self.server = None
+            transport = lambda: FakeHttp(self.drive)
+        self.scheduler = Scheduler(None, pool_sizes={METADATA: 4, TRANSFER: 3})
+        self.tracer = Tracer()  # In memory only: per-call percentiles for the report
+        self.engine = engine.DriveEngine(fake_credentials(), self.scheduler, os.path.join(workdir, "cache"),
+                                         token_path=os.path.join(workdir, "token.json"),
+                                         governor=Governor(rate=args.rate, burst=args.rate * 2),
+                                         transport=transport, tracer=self.tracer)
+
+    def close(self):
+        self.scheduler.shutdown()
+        if self.server:
+            self.server.shutdown()
+
+    def calls(self, name):
+        return self.drive.stats()["calls"].get(name, 0)
+
+    # === Benchmarks: each returns {metric: value}, seconds unless named otherwise ===
+    def listing(self):
+        start = time.perf_counter()
+        pages = self.engine.iter_folder(self.big)
+        first = next(pages)
+        first_page = time.perf_counter() - start
+        count = len(first) + sum(len(page) for page in pages)
+        assert count == LISTING_FILES, count
+        return {"listing_first_page": first_page, "listing_full": time.perf_counter() - start}
+
+    def render(self):
+        # populate_grid() in a real (signed-out) window; needs a display
+        import app
+        from file_model import FileModel
+        files = self.engine.list_folder(self.big)
+        root = app.ctk.CTk()
+        try:
+            root.geometry("1200x800")
+            window = app.ModernDriveApp(root)
+            root.update()
+            start = time.perf_counter()
+            window.files = FileModel(files)
+            window.populate_grid()
+            root.update()
+            first = time.perf_counter() - start
+            start = time.perf_counter()
+            window.apply_fresh_listing(window.listing_generation, files)  # Revalidated, unchanged listing
+            root.update()
+            return {"render_populate": first, "render_unchanged": time.perf_counter() - start}
+        finally:
+            root.destroy()
+
+    def download(self):
+        path = os.path.join(self.workdir, "large.bin")
+        start = time.perf_counter()
+        self.engine.download(self.large, path, DOWNLOAD_SIZE, self.drive.files[self.large]["modifiedTime"])
+        elapsed = time.perf_counter() - start
+        assert os.path.getsize(path) == DOWNLOAD_SIZE
+        os.remove(path)
+        return {"download": elapsed, "download_mbps": DOWNLOAD_SIZE / elapsed / 1e6}
+
+    def mirror_folder(self):
+        dest = os.path.join(self.workdir, "mirror")
+        start = time.perf_counter()
+        result = self.engine.download_folder(self.mirror, dest)
+        first = time.perf_counter() - start
+        assert result["downloaded"] == MIRROR_FILES and not result["failed"], result
+        start = time.perf_counter()
+        result = self.engine.download_folder(self.mirror, dest)  # Nothing changed: md5 checks only
+        again = time.perf_counter() - start
+        assert result["unchanged"] == MIRROR_FILES, result
+        shutil.rmtree(dest)
+        return {"mirror": first, "mirror_unchanged": again}
+
+    def upload(self):
+        path = os.path.join(self.workdir, "upload.bin")
+        with open(path, "wb") as f:
+            f.write(os.urandom(UPLOAD_SIZE))
+        start = time.perf_counter()
+        tasks = self.engine.upload([path], None)
+        for task in tasks:
+            task.finished.wait()
+        elapsed = time.perf_counter() - start
+        os.remove(path)
+        assert all(task.state == "done" for task in tasks), [task.error for task in tasks]
+        return {"upload": elapsed, "upload_mbps": UPLOAD_SIZE / elapsed / 1e6}
+
+    def bulk_move(self):
+        # Alternate between two folders so every repeat moves all the files. The
+        # parents are passed in, as the app does from its listing, so no lookups are timed
+        destination = self.targets[0]
+        self.targets.reverse()
+        parents = {file_id: [self.moved_from] for file_id in self.moved}
+        round_trips = self.calls("batch")
+        start = time.perf_counter()
+        results = self.engine.move(self.moved, destination, parents=parents)
+        elapsed = time.perf_counter() - start
+        self.moved_from = destination
+        failed = [file_id for file_id, (_, error) in results.items() if error]
+        assert not failed, f"{len(failed)} moves failed"
+        return {"bulk_move": elapsed, "bulk_move_round_trips": self.calls("batch") - round_trips}
+
+
+def print_summary(summary, repeats):
+    print(f"{'benchmark':<26}{'median':>12}{'min':>12}{'max':>12}   ({repeats} runs; ms, or MB/s, or count)")
+    for name, s in summary.items():
+        print(f"{name:<26}{s['median_ms']:>12.1f}{s['min_ms']:>12.1f}{s['max_ms']:>12.1f}")
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Benchmark Drive Manager against a fake Drive")
+    parser.add_argument("--only", help="Comma-separated subset of: " + ", ".join(BENCHMARKS))
+    parser.add_argument("--repeat", type=int, default=REPEATS)
+    parser.add_argument("--latency", type=float, default=0.0, help="Seconds added per request")
+    parser.add_argument("--bandwidth", type=float, default=None, help="Media bytes per second")
+    parser.add_argument("--throttle", type=float, default=0.0, help="Fraction of requests rate limited")
+    parser.add_argument("--failures", type=float, default=0.0, help="Fraction of requests failing with 500")
+    parser.add_argument("--rate", type=float, default=1000.0, help="Client governor requests per second")
+    parser.add_argument("--server", action="store_true", help="Go through a localhost HTTP server")
+    parser.add_argument("--save", help="Write the results to this JSON file as a baseline")
+    parser.add_argument("--compare", help="Baseline JSON file to check the results against")
+    parser.add_argument("--tolerance", type=float, default=TOLERANCE)
+    args = parser.parse_args()
+    selected = args.only.split(",") if args.only else BENCHMARKS
+
+    workdir = tempfile.mkdtemp(prefix="drive-bench-")
+    bench = Bench(args, workdir)
+    steps = {"listing": bench.listing, "render": bench.render, "download": bench.download,
+             "mirror": bench.mirror_folder, "upload": bench.upload, "bulk_move": bench.bulk_move}
+    runs = []
+    try:
+        for _ in range(args.repeat):
+            run = {}
+            for name in selected:
+                try:
+                    run.update(steps[name]())
+                except Exception as e:
+                    if name != "render":
+                        raise
+                    print(f"render skipped: {e}", file=sys.stderr)
+                    selected = [n for n in selected if n != "render"]
+            runs.append(run)
+    finally:
+        bench.close()
+        shutil.rmtree(workdir, ignore_errors=True)
+
+    # summarize() reports seconds as ms; throughput and counts are kept as they are
+    summary = summarize(runs)
+    for name, s in summary.items():
+        if name.endswith(("_mbps", "_round_trips")):
+            summary[name] = {k: v / 1000 for k, v in s.items()}
+    print_summary(summary, args.repeat)
+    print(f"fake drive: {json.dumps(bench.drive.stats()['calls'], sort_keys=True)}")
+    print(f"governor:   {json.dumps(bench.engine.service.governor.stats(), sort_keys=True)}")
+    print(format_summary(bench.tracer.summary()))
+
+    if args.save:
+        with open(args.save, "w") as f:
+            json.dump(summary, f, indent=2)
+    if args.compare:
+        with open(args.compare) as f:
+            # Throughput regresses downwards, so it is compared as ms per GB
+            inverted = lambda s: {n: ({k: 1e6 / v if v else 0 for k, v in x.items()} if n.endswith("_mbps") else x)
+                                  for n, x in s.items()}
+            slower = compare(inverted(summary), inverted(json.load(f)), args.tolerance)
+        for name, before, now in slower:
+            print(f"REGRESSION {name}: {before:.1f} -> {now:.1f} {'ms per GB' if name.endswith('_mbps') else 'ms'}")
+        if slower:
+            sys.exit(1)
+
+
+if __name__ == "__main__":
+    main()
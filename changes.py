@@ -0,0 +1,137 @@
+# changes.py — Incremental sync through the Drive Changes feed
+import os
+import json
+import threading
+from googleapiclient.errors import HttpError
+import listing
+
+POLL_INTERVAL = 30  # Seconds between changes().list polls
+CHANGE_FIELDS = f"nextPageToken, newStartPageToken, changes(fileId, removed, file({listing.LIST_FIELDS}, trashed))"
+
+
+def apply_changes(files, folder_id, changes):
+    """Apply a batch of changes to one folder's listing.
+
+    folder_id must be a real id (not 'root'). Returns a new list, or files
+    itself when no change touched this folder.
+    """
+    present = {f["id"] for f in files}
+    result = None
+    for change in changes:
+        file_id = change.get("fileId")
+        f = change.get("file") or {}
+        inside = (not change.get("removed") and not f.get("trashed")
+                  and folder_id in f.get("parents", []))
+        if file_id not in present and not inside:
+            continue
+        if result is None:
+            result = list(files)
+        index = next((i for i, item in enumerate(result) if item["id"] == file_id), None)
+        if not inside:
+            if index is not None:
+                del result[index]
+                present.discard(file_id)
+            continue
+        entry = {k: f[k] for k in listing.LISTING_KEYS if k in f}
+        if index is not None:
+            result[index] = entry  # Updated in place so the grid keeps its order
+        else:
+            key = listing.sort_key(entry)
+            position = next((i for i, item in enumerate(result) if listing.sort_key(item) > key), len(result))
+            result.insert(position, entry)
+            present.add(file_id)
+    return files if result is None else result
+
+
+class ChangeTracker:
+    """Polls changes().list in the background and hands each batch of deltas to on_changes.
+
+    The page token is saved to token_path once on_changes has handled a
+    batch, so changes made while the app was closed are picked up on the
+    next start.
+    """
+
+    def __init__(self, service, token_path, on_changes, on_reset=None, interval=POLL_INTERVAL):
+        self.service = service
+        self.token_path = token_path
+        self.on_changes = on_changes
+        self.on_reset = on_reset  # Called when the saved token is no longer valid
+        self.interval = interval
+        self.root_id = None
+        self.next_token = None
+        self.wake = threading.Event()
+        self.stopped = threading.Event()
+        self.thread = None
+
+    def start(self):
+        self.thread = threading.Thread(target=self.run, daemon=True)
+        self.thread.start()
+
+    def stop(self):
+        self.stopped.set()
+        self.wake.set()
+
+    def poll_soon(self):
+        """Poll now instead of waiting for the interval (e.g. right after a local mutation)"""
+        self.wake.set()
+
+    def run(self):
+        while not self.stopped.is_set():
+            try:
+                changes = self.poll_once()
+                if changes:
+                    self.on_changes(changes)
+                if self.next_token:
+                    self.save_token(self.next_token)
+                    self.next_token = None
+            except Exception as e:
+                print(f"Change polling failed: {e}")
+            self.wake.wait(self.interval)
+            self.wake.clear()
+
+    def load_token(self):
+        try:
+            with open(self.token_path, "r") as f:
+                return json.load(f).get("page_token")
+        except (OSError, ValueError):
+            return None
+
+    def save_token(self, token):
+        os.makedirs(os.path.dirname(self.token_path) or ".", exist_ok=True)
+        with open(self.token_path, "w") as f:
+            json.dump({"page_token": token}, f)
+
+    def poll_once(self):
+        """Fetch every change since the saved token. The token to save next is left in next_token"""
+        if self.root_id is None:
+            self.root_id = self.service.files().get(fileId="root", fields="id").execute()["id"]
+
+        token = self.load_token()
+        if token is None:
+            token = self.service.changes().getStartPageToken().execute()["startPageToken"]
+            self.save_token(token)
+            return []
+
+        changes = []
+        while True:
+            try:
+                result = self.service.changes().list(
+                    pageToken=token,
+                    pageSize=1000,
+                    spaces="drive",
+                    includeRemoved=True,
+                    fields=CHANGE_FIELDS
+                ).execute()
+            except HttpError as e:
+                if e.resp.status in (400, 404) and not changes:
+                    # Token expired or invalid: start over and let the owner drop derived state
+                    os.remove(self.token_path)
+                    if self.on_reset:
+                        self.on_reset()
+                    return []
+                raise
+            changes.extend(result.get("changes", []))
+            if "newStartPageToken" in result:
+                self.next_token = result["newStartPageToken"]
+                return changes
+            token = result["nextPageToken"]
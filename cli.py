@@ -0,0 +1,276 @@
+# cli.py — Headless command line on the same engine, pools and transfer code as the app
+#
+#   python cli.py login                          # one-time browser consent, writes token.json
+#   python cli.py ls [PATH] [-l | --json]
+#   python cli.py get PATH... [-o DIR] [--zip]   # files in parallel ranges, folders mirrored
+#   python cli.py put FILE... [-d REMOTE_DIR]
+#   python cli.py mv PATH... DEST_DIR
+#   python cli.py sync REMOTE_DIR LOCAL_DIR      # fetch only new or changed files (md5)
+#   python cli.py --trace calls.jsonl get ...    # record every Drive call, print latency percentiles
+#   python cli.py --profile run.folded sync ...  # sampling profile of the run, as flame-graph input
+#
+# PATH is relative to My Drive ("Reports/2024"), or "id:<fileId>".
+# Exit status: 0 done, 1 some items failed, 2 usage or sign-in error, 130 interrupted.
+import os
+import sys
+import json
+import time
+import argparse
+import threading
+import engine
+import listing
+import batch_ops
+import folder_download
+import tracing
+from profiler import SamplingProfiler
+from scheduler import Scheduler, METADATA, TRANSFER, NORMAL
+
+CACHE_DIR = "drive_cache"
+METADATA_WORKERS = 4
+TRANSFER_WORKERS = 3        # Files transferred at once by get/put
+PROGRESS_INTERVAL = 0.5     # Seconds between progress lines
+GOOGLE_APPS_PREFIX = "application/vnd.google-apps."  # Docs, Sheets...: no downloadable content
+
+
+class Progress:
+    """Aggregate progress of concurrent transfers, written to stderr at most every PROGRESS_INTERVAL"""
+
+    def __init__(self, quiet=False):
+        self.quiet = quiet
+        self.lock = threading.Lock()
+        self.transfers = {}  # Key -> (bytes done, bytes total)
+        self.last = 0
+        self.tty = sys.stderr.isatty()
+
+    def callback(self, key):
+        """progress_callback(done, total, ...) for one transfer"""
+        def _update(done, total, *files):
+            with self.lock:
+                self.transfers[key] = (done, total)
+                now = time.monotonic()
+                if self.quiet or now - self.last < PROGRESS_INTERVAL:
+                    return
+                self.last = now
+                done = sum(d for d, _ in self.transfers.values())
+                total = sum(t or 0 for _, t in self.transfers.values())
+            line = f"{engine.format_size(done)} / {engine.format_size(total)}"
+            if files:
+                line += f" · {files[0]}/{files[1]} files"
+            sys.stderr.write(f"\r{line:<60}" if self.tty else line + "\n")
+            sys.stderr.flush()
+        return _update
+
+    def finish(self):
+        if self.tty and not self.quiet and self.last:
+            sys.stderr.write("\n")
+
+
+def wait_all(tasks):
+    """Block until every task has finished; Ctrl-C still gets through"""
+    for task in tasks:
+        while not task.finished.wait(0.2):
+            pass
+
+
+def is_folder(f):
+    return f.get("mimeType") == listing.FOLDER_MIME
+
+
+def report_failures(failures):
+    for name, error in failures:
+        print(f"✗ {name}: {error}", file=sys.stderr)
+    return 1 if failures else 0
+
+
+# === Commands ===
+def cmd_ls(drive, args):
+    f = drive.resolve(args.path)
+    files = drive.list_folder(f["id"]) if is_folder(f) else [f]
+    for item in files:
+        if args.json:
+            print(json.dumps(item))
+        elif args.long:
+            size = "-" if is_folder(item) else engine.format_size(int(item.get("size", 0)))
+            print(f"{item['id']:<34} {size:>10}  {item.get('modifiedTime', '')[:19]:<19}  "
+                  f"{item['name']}{'/' if is_folder(item) else ''}")
+        else:
+            print(item["name"] + ("/" if is_folder(item) else ""))
+    return 0
+
+
+def cmd_get(drive, args, progress):
+    os.makedirs(args.output, exist_ok=True)
+    tasks, failures = [], []
+    for path in args.paths:
+        f = drive.resolve(path)
+        name = folder_download.safe_name(f["name"])
+        if is_folder(f):
+            if args.zip:
+                dest = os.path.join(args.output, name + ".zip")
+                fn = lambda task, f=f, dest=dest: drive.download_zip(
+                    f["id"], dest, progress.callback(dest), task.cancel_event)
+            else:
+                dest = os.path.join(args.output, name)
+                fn = lambda task, f=f, dest=dest: drive.download_folder(
+                    f["id"], dest, progress.callback(dest), task.cancel_event)
+        elif f.get("mimeType", "").startswith(GOOGLE_APPS_PREFIX):
+            failures.append((path, "Google Docs files have no downloadable content"))
+            continue
+        else:
+            dest = os.path.join(args.output, name)
+            fn = lambda task, f=f, dest=dest: drive.download(
+                f["id"], dest, f.get("size"), f.get("modifiedTime"), progress.callback(dest), task.cancel_event)
+        tasks.append((path, drive.scheduler.submit(fn, f"Download {path}", TRANSFER, NORMAL)))
+
+    wait_all([task for _, task in tasks])
+    progress.finish()
+    for path, task in tasks:
+        if task.state != "done":
+            failures.append((path, task.error or task.state))
+            continue
+        result = task.result
+        if isinstance(result, dict):
+            # Folder: a mirror or an archive reports per-file outcomes
+            failures.extend((p, e) for p, e in result["failed"])
+            print(f"✓ {path}: {result.get('downloaded', result.get('archived'))} file(s)"
+                  + (f", {result['unchanged']} up to date" if "unchanged" in result else ""))
+        else:
+            print(f"✓ {path} -> {result}")
+    return report_failures(failures)
+
+
+def cmd_put(drive, args, progress):
+    parent = drive.resolve(args.dest)
+    if not is_folder(parent):
+        print(f"Not a folder: {args.dest}", file=sys.stderr)
+        return 2
+    paths = [p for p in args.files if os.path.isfile(p)]
+    failures = [(p, "not a file") for p in args.files if p not in paths]
+    tasks = drive.upload(paths, parent["id"], progress.callback("put"))
+    wait_all(tasks)
+    progress.finish()
+    for path, task in zip(paths, tasks):
+        if task.state == "done":
+            print(f"✓ {path}")
+        else:
+            failures.append((path, task.error or task.state))
+    return report_failures(failures)
+
+
+def cmd_mv(drive, args):
+    destination = drive.resolve(args.dest)
+    if not is_folder(destination):
+        print(f"Not a folder: {args.dest}", file=sys.stderr)
+        return 2
+    files = [drive.resolve(path) for path in args.paths]
+    names = {f["id"]: f["name"] for f in files}
+    parents = {f["id"]: f["parents"] for f in files if f.get("parents")}
+    results = drive.move(names, destination["id"], parents=parents)
+    text, had_errors = batch_ops.summarize(results, names, "Moved")
+    print(text, file=sys.stderr if had_errors else sys.stdout)
+    return 1 if had_errors else 0
+
+
+def cmd_sync(drive, args, progress):
+    folder = drive.resolve(args.remote)
+    if not is_folder(folder):
+        print(f"Not a folder: {args.remote}", file=sys.stderr)
+        return 2
+    task = drive.scheduler.submit(
+        lambda task: drive.sync(folder["id"], args.local, progress.callback("sync"), task.cancel_event),
+        f"Sync {args.remote}", TRANSFER, NORMAL
+    )
+    wait_all([task])
+    progress.finish()
+    if task.state != "done":
+        return report_failures([(args.remote, task.error or task.state)])
+    result = task.result
+    print(f"✓ {args.remote} -> {args.local}: {result['downloaded']} downloaded, {result['unchanged']} up to date, "
+          f"{len(result['skipped'])} Google Docs skipped")
+    return report_failures(result["failed"])
+
+
+def build_parser():
+    parser = argparse.ArgumentParser(prog="cli.py", description="Drive Manager, without the window")
+    parser.add_argument("--token", default=engine.TOKEN_FILE, help="Saved sign-in (default: token.json)")
+    parser.add_argument("--cache-dir", default=CACHE_DIR)
+    parser.add_argument("--workers", type=int, default=TRANSFER_WORKERS, help="Transfers at once")
+    parser.add_argument("-q", "--quiet", action="store_true", help="No progress output")
+    parser.add_argument("--trace", metavar="FILE", help="Append one JSON line per Drive call to FILE")
+    parser.add_argument("--profile", metavar="FILE", help="Write a sampling profile (folded stacks) to FILE")
+    commands = parser.add_subparsers(dest="command", required=True)
+
+    login = commands.add_parser("login", help="Sign in through the browser and save the token")
+    login.add_argument("--credentials", default="credentials.json", help="OAuth client secrets file")
+
+    ls = commands.add_parser("ls", help="List a folder")
+    ls.add_argument("path", nargs="?", default="")
+    ls.add_argument("-l", "--long", action="store_true", help="Show id, size and modified time")
+    ls.add_argument("--json", action="store_true", help="One JSON object per line")
+
+    get = commands.add_parser("get", help="Download files and folders")
+    get.add_argument("paths", nargs="+")
+    get.add_argument("-o", "--output", default=".", help="Local directory to download into")
+    get.add_argument("--zip", action="store_true", help="Folders as one .zip each")
+
+    put = commands.add_parser("put", help="Upload files")
+    put.add_argument("files", nargs="+")
+    put.add_argument("-d", "--dest", default="", help="Drive folder to upload into (default: My Drive)")
+
+    mv = commands.add_parser("mv", help="Move files and folders into a folder")
+    mv.add_argument("paths", nargs="+")
+    mv.add_argument("dest")
+
+    sync = commands.add_parser("sync", help="Mirror a Drive folder into a local directory")
+    sync.add_argument("remote")
+    sync.add_argument("local")
+    return parser
+
+
+def main(argv=None):
+    args = build_parser().parse_args(argv)
+    if args.command == "login":
+        engine.authorize(args.credentials, args.token)
+        print(f"Signed in; token saved to {args.token}")
+        return 0
+
+    creds = engine.load_credentials(args.token)
+    if creds is None:
+        print(f"Not signed in: run `python cli.py login` first (looked for {args.token})", file=sys.stderr)
+        return 2
+    # No task journal: an interrupted run is resumed by running it again (.part files and upload sessions)
+    scheduler = Scheduler(None, pool_sizes={METADATA: METADATA_WORKERS, TRANSFER: args.workers})
+    tracer = tracing.Tracer(args.trace) if args.trace else None
+    drive = engine.DriveEngine(creds, scheduler, args.cache_dir, token_path=args.token, tracer=tracer)
+    progress = Progress(args.quiet)
+    profile = SamplingProfiler() if args.profile else None
+    if profile:
+        profile.start()
+    try:
+        if args.command == "ls":
+            return cmd_ls(drive, args)
+        if args.command == "get":
+            return cmd_get(drive, args, progress)
+        if args.command == "put":
+            return cmd_put(drive, args, progress)
+        if args.command == "mv":
+            return cmd_mv(drive, args)
+        return cmd_sync(drive, args, progress)
+    except LookupError as e:
+        print(e, file=sys.stderr)
+        return 2
+    except KeyboardInterrupt:
+        scheduler.cancel_all()
+        return 130
+    finally:
+        scheduler.shutdown()
+        if profile:
+            profile.stop(args.profile)
+        if tracer:
+            tracer.close()
+            if not args.quiet:
+                print(tracing.format_summary(tracer.summary()), file=sys.stderr)
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -0,0 +1,115 @@
+# diagnostics.py — Live diagnostics window: Drive call latency and throughput, governor, UI bus, task pools, UI stalls
+import customtkinter as ctk
+from tracing import format_summary
+
+REFRESH_MS = 1000  # Redraw interval while the window is open
+RECENT_STALLS_SHOWN = 5
+
+
+class DiagnosticsWindow:
+    """A small window of live counters, redrawn every REFRESH_MS while open.
+
+    Shows throughput and per-operation latency percentiles from the
+    tracer, the governor's request/retry/concurrency counters, the UI
+    bus's queue depth and coalescing, and queued/running tasks per
+    scheduler pool, plus the main-loop stalls the watchdog caught.
+    governor() returns the current Governor, or None before sign-in.
+    With toggle_profiler (called with no arguments, returning a status
+    line) the window also has a button to record a sampling profile.
+    """
+
+    def __init__(self, root, colors, font_family, tracer, ui, scheduler, governor, watchdog=None,
+                 toggle_profiler=None, profiling=False):
+        self.tracer = tracer
+        self.ui = ui
+        self.scheduler = scheduler
+        self.governor = governor
+        self.watchdog = watchdog
+        self.toggle_profiler = toggle_profiler
+        self.profiling = profiling
+        self.job = None
+
+        self.window = ctk.CTkToplevel(root)
+        self.window.title("Diagnostics")
+        self.window.geometry("760x480")
+        self.text = ctk.CTkTextbox(
+            self.window,
+            font=ctk.CTkFont(family=font_family, size=12),
+            wrap="none",
+            fg_color=colors["bg_card"],
+            text_color=colors["text_primary"]
+        )
+        if toggle_profiler:
+            bar = ctk.CTkFrame(self.window, fg_color="transparent")
+            bar.pack(fill="x", padx=10, pady=(10, 0))
+            self.profile_btn = ctk.CTkButton(
+                bar,
+                text=self.profile_text(),
+                command=self.on_profile,
+                fg_color=colors["bg_hover"],
+                hover_color=colors["secondary"],
+                width=160,
+                height=28
+            )
+            self.profile_btn.pack(side="left")
+            self.profile_label = ctk.CTkLabel(bar, text="", text_color=colors["text_secondary"])
+            self.profile_label.pack(side="left", padx=10)
+        self.text.pack(fill="both", expand=True, padx=10, pady=10)
+        self.window.protocol("WM_DELETE_WINDOW", self.close)
+        self.refresh()
+
+    def is_open(self):
+        return self.window.winfo_exists()
+
+    def focus(self):
+        self.window.deiconify()
+        self.window.lift()
+
+    def profile_text(self):
+        return "⏹ Stop profiling" if self.profiling else "⏺ Record profile"
+
+    def on_profile(self):
+        self.profile_label.configure(text=self.toggle_profiler())
+        self.profiling = not self.profiling
+        self.profile_btn.configure(text=self.profile_text())
+
+    def render(self):
+        lines = [f"Throughput   {self.tracer.throughput() / 1e6:.2f} MB/s (last 10 s)"]
+        governor = self.governor()
+        if governor is not None:
+            g = governor.stats()
+            lines.append(f"Governor     {g['requests']} requests, {g['retries']} retries, {g['throttled']} throttled, "
+                         f"concurrency {g['concurrency']} ({g['in_flight']} in flight)")
+        u = self.ui.stats()
+        lines.append(f"UI bus       depth {u['depth']} (peak {u['max_depth']}), {u['posted']} posted, "
+                     f"{u['coalesced']} coalesced, {u['frames']} frames")
+        tasks = self.scheduler.active()
+        for pool in sorted(self.scheduler.pool_sizes):
+            running = sum(1 for t in tasks if t.pool == pool and t.state == "running")
+            queued = sum(1 for t in tasks if t.pool == pool and t.state == "queued")
+            lines.append(f"Pool {pool:<8}{running} running, {queued} queued")
+        if self.watchdog is not None:
+            w = self.watchdog.stats()
+            lines.append(f"UI stalls    {w['stalls']} over {self.watchdog.threshold * 1000:.0f} ms, "
+                         f"worst {w['worst_ms']} ms")
+            for stall in w["recent"][-RECENT_STALLS_SHOWN:]:
+                lines.append(f"  {stall['ms']:>6} ms  {stall['where']}")
+        lines.append("")
+        summary = self.tracer.summary()
+        lines.append(format_summary(summary) if summary else "No Drive calls yet")
+        return "\n".join(lines)
+
+    def refresh(self):
+        if not self.is_open():
+            return
+        self.text.configure(state="normal")
+        self.text.delete("1.0", "end")
+        self.text.insert("1.0", self.render())
+        self.text.configure(state="disabled")
+        self.job = self.window.after(REFRESH_MS, self.refresh)
+
+    def close(self):
+        if self.job is not None:
+            self.window.after_cancel(self.job)
+            self.job = None
+        self.window.destroy()
@@ -0,0 +1,44 @@
+# discovery.py — The Drive v3 discovery document, read and parsed once per process
+import os
+import json
+import threading
+import httplib2
+from googleapiclient import discovery_cache
+from googleapiclient.discovery import build_from_document
+
+DOCUMENT = "drive.v3.json"  # Shipped with google-api-python-client; app.spec bundles only this one
+
+_lock = threading.Lock()
+_document = None
+
+
+def document_path():
+    return os.path.join(os.path.dirname(discovery_cache.__file__), "documents", DOCUMENT)
+
+
+def document():
+    """The parsed document, shared by every service built in this process.
+
+    Building a service fills in each resource's method descriptions in
+    place the first time it is used; doing that once here, before the
+    document is shared, keeps worker threads from changing dicts another
+    thread is reading.
+    """
+    global _document
+    with _lock:
+        if _document is None:
+            with open(document_path(), "r", encoding="utf-8") as f:
+                doc = json.load(f)
+            _visit(build_from_document(doc, http=httplib2.Http()), doc)
+            _document = doc
+        return _document
+
+
+def _visit(resource, desc):
+    for name, child in desc.get("resources", {}).items():
+        _visit(getattr(resource, name)(), child)
+
+
+def build_drive(http):
+    """A Drive v3 service on http, with no discovery fetch and no JSON parse"""
+    return build_from_document(document(), http=http)
@@ -0,0 +1,78 @@
+# disk_lru.py — One directory of cache files, capped in total size, least recently used evicted first
+import os
+from collections import OrderedDict
+
+
+class DiskLRU:
+    """The bookkeeping shared by the on-disk caches.
+
+    Files named *suffix in directory are the entries. Their order is kept
+    in memory and, through each file's mtime, across restarts. Writes go
+    through a temporary file so a crash never leaves a torn entry. Not
+    thread-safe: each cache calls it with its own lock held.
+    on_remove(name) is called for every entry that is removed or evicted.
+    """
+
+    def __init__(self, directory, suffix, max_bytes, on_remove=None):
+        self.directory = directory
+        self.max_bytes = max_bytes
+        self.on_remove = on_remove
+        self.entries = OrderedDict()  # File name -> size, least recently used first
+        self.total_bytes = 0
+
+        os.makedirs(directory, exist_ok=True)
+        found = []
+        for name in os.listdir(directory):
+            if name.endswith(suffix):
+                stat = os.stat(os.path.join(directory, name))
+                found.append((stat.st_mtime, name, stat.st_size))
+        for _, name, size in sorted(found):
+            self.entries[name] = size
+            self.total_bytes += size
+
+    def __contains__(self, name):
+        return name in self.entries
+
+    def names(self):
+        return list(self.entries)
+
+    def path(self, name):
+        return os.path.join(self.directory, name)
+
+    def read(self, name):
+        """The entry's bytes, or None (and the entry dropped) if it can't be read"""
+        try:
+            with open(self.path(name), "rb") as f:
+                return f.read()
+        except OSError:
+            self.remove(name)
+            return None
+
+    def touch(self, name):
+        """Mark name as just used"""
+        self.entries.move_to_end(name)
+        try:
+            os.utime(self.path(name))  # Keeps LRU order across restarts
+        except OSError:
+            pass
+
+    def write(self, name, data):
+        """Store data (bytes) as the most recently used entry, then evict down to max_bytes"""
+        tmp = self.path(name) + ".tmp"
+        with open(tmp, "wb") as f:
+            f.write(data)
+        os.replace(tmp, self.path(name))
+        self.total_bytes -= self.entries.pop(name, 0)
+        self.entries[name] = len(data)
+        self.total_bytes += len(data)
+        while self.total_bytes > self.max_bytes and len(self.entries) > 1:
+            self.remove(next(iter(self.entries)))
+
+    def remove(self, name):
+        self.total_bytes -= self.entries.pop(name, 0)
+        if self.on_remove:
+            self.on_remove(name)
+        try:
+            os.remove(self.path(name))
+        except OSError:
+            pass
@@ -0,0 +1,240 @@
+# downloads.py — Streaming, resumable file downloads
+import os
+import json
+import threading
+from concurrent.futures import ThreadPoolExecutor
+import httplib2
+import google_auth_httplib2
+from googleapiclient.errors import HttpError
+
+CHUNK_SIZE = 8 * 1024 * 1024  # Bytes held in memory per request
+SEGMENT_SIZE = 32 * 1024 * 1024  # Byte range handled by one segment
+MAX_SEGMENTS = 4  # Segments downloaded at the same time
+PART_SUFFIX = ".part"
+STATE_SUFFIX = ".part.json"
+
+
+class DownloadCancelled(Exception):
+    """Raised when a download is stopped through its cancel event"""
+
+
+def part_path(save_path):
+    return save_path + PART_SUFFIX
+
+
+def state_path(save_path):
+    return save_path + STATE_SUFFIX
+
+
+def load_state(save_path):
+    """Read the sidecar describing a partial download, or None"""
+    try:
+        with open(state_path(save_path), "r") as f:
+            return json.load(f)
+    except (OSError, ValueError):
+        return None
+
+
+def save_state(save_path, state):
+    tmp = state_path(save_path) + ".tmp"
+    with open(tmp, "w") as f:
+        json.dump(state, f)
+    os.replace(tmp, state_path(save_path))
+
+
+def discard_partial(save_path):
+    for path in (part_path(save_path), state_path(save_path)):
+        try:
+            os.remove(path)
+        except OSError:
+            pass
+
+
+def finalize(save_path):
+    """Move the completed .part file into place and drop its sidecar"""
+    os.replace(part_path(save_path), save_path)
+    try:
+        os.remove(state_path(save_path))
+    except OSError:
+        pass
+
+
+def fetch_range(http, uri, start, end, headers=None):
+    """GET bytes start..end (inclusive) of a media URI. Returns (resp, content)"""
+    request_headers = dict(headers or {})
+    request_headers["range"] = f"bytes={start}-{end}"
+    resp, content = http.request(uri, "GET", headers=request_headers)
+    if resp.status not in (200, 206, 416):
+        raise HttpError(resp, content, uri=uri)
+    return resp, content
+
+
+def total_from_response(resp, fallback=None):
+    content_range = resp.get("content-range")
+    if content_range and "/" in content_range:
+        length = content_range.rsplit("/", 1)[1]
+        if length != "*":
+            return int(length)
+    return fallback
+
+
+def stream_download(service, file_id, save_path, file_size=None, modified_time=None,
+                    chunk_size=CHUNK_SIZE, progress_callback=None, cancel_event=None):
+    """Download a file chunk by chunk into save_path.part, resuming where it stopped.
+
+    Only one chunk is held in memory at a time. The .part file plus a small
+    JSON sidecar survive failures and restarts; calling this again with the
+    same save_path continues from the last byte written, as long as the
+    remote file has not changed in the meantime.
+    """
+    request = service.files().get_media(fileId=file_id)
+    http, uri = request.http, request.uri
+
+    identity = {"file_id": file_id, "size": file_size, "modified_time": modified_time}
+    state = load_state(save_path)
+    part = part_path(save_path)
+    offset = 0
+    if state and all(state.get(k) == v for k, v in identity.items()) and "segments" not in state:
+        offset = os.path.getsize(part) if os.path.exists(part) else 0
+    if file_size is not None and offset > file_size:
+        offset = 0
+    if offset == 0:
+        discard_partial(save_path)
+        save_state(save_path, identity)
+
+    total = file_size
+    with open(part, "r+b" if offset else "wb") as fh:
+        fh.seek(offset)
+        fh.truncate()
+        while total is None or offset < total:
+            if cancel_event is not None and cancel_event.is_set():
+                raise DownloadCancelled(save_path)
+
+            resp, content = fetch_range(http, uri, offset, offset + chunk_size - 1)
+            if resp.status == 416:
+                # Range past the end: zero-byte file or already complete
+                total = total_from_response(resp, offset)
+                break
+            if resp.status == 200 and offset:
+                # Server ignored the Range header and sent the whole body
+                fh.seek(0)
+                fh.truncate()
+                offset = 0
+            if "content-location" in resp and resp["content-location"] != uri:
+                uri = resp["content-location"]
+
+            fh.write(content)
+            fh.flush()
+            offset += len(content)
+            total = total_from_response(resp, total)
+            if resp.status == 200:
+                total = offset
+
+            if progress_callback and total:
+                progress_callback(offset, total)
+            if not content:
+                break
+
+    finalize(save_path)
+    if progress_callback:
+        progress_callback(offset, total or offset)
+    return save_path
+
+
+# === SEGMENTED (MULTI-RANGE) DOWNLOADS ===
+def new_authorized_http(service):
+    """A fresh authorized transport sharing the service's credentials.
+
+    httplib2 connections are not thread-safe, so every segment worker
+    needs its own. A ServicePool makes it on its shared credential.
+    """
+    if hasattr(service, "new_http"):
+        return service.new_http()
+    return google_auth_httplib2.AuthorizedHttp(service._http.credentials, http=httplib2.Http())
+
+
+def plan_segments(file_size, segment_size=SEGMENT_SIZE):
+    """Split [0, file_size) into inclusive (start, end) byte ranges"""
+    return [(start, min(start + segment_size, file_size) - 1) for start in range(0, file_size, segment_size)]
+
+
+def segmented_download(service, file_id, save_path, file_size, modified_time=None,
+                       max_segments=MAX_SEGMENTS, segment_size=SEGMENT_SIZE, chunk_size=CHUNK_SIZE,
+                       progress_callback=None, cancel_event=None, http_factory=None):
+    """Download byte ranges of one file concurrently into a preallocated .part file.
+
+    Up to max_segments ranges of segment_size bytes are fetched at once, each
+    on its own HTTP connection. Bytes written per range are checkpointed in
+    the sidecar so an interrupted download resumes every range where it
+    stopped. Small files, or files of unknown size, fall back to
+    stream_download.
+    """
+    if not file_size or max_segments <= 1 or file_size <= segment_size:
+        return stream_download(service, file_id, save_path, file_size=file_size, modified_time=modified_time,
+                               chunk_size=chunk_size, progress_callback=progress_callback, cancel_event=cancel_event)
+
+    http_factory = http_factory or (lambda: new_authorized_http(service))
+    uri = service.files().get_media(fileId=file_id).uri
+    segments = plan_segments(file_size, segment_size)
+    part = part_path(save_path)
+
+    identity = {"file_id": file_id, "size": file_size, "modified_time": modified_time, "segment_size": segment_size}
+    state = load_state(save_path)
+    resumable = (state and all(state.get(k) == v for k, v in identity.items())
+                 and os.path.exists(part) and os.path.getsize(part) == file_size)
+    if not resumable:
+        discard_partial(save_path)
+        state = dict(identity, segments={})
+        with open(part, "wb") as fh:
+            fh.truncate(file_size)  # Preallocate so every worker can seek into place
+        save_state(save_path, state)
+
+    written = {start: state["segments"].get(str(start), 0) for start, _ in segments}
+    lock = threading.Lock()
+    stop = threading.Event()
+    local = threading.local()
+    progress = {"done": sum(written.values())}
+
+    def _segment(start, end):
+        http = getattr(local, "http", None)
+        if http is None:
+            http = local.http = http_factory()
+        with open(part, "r+b") as fh:
+            offset = start + written[start]
+            fh.seek(offset)
+            while offset <= end:
+                if stop.is_set() or (cancel_event is not None and cancel_event.is_set()):
+                    raise DownloadCancelled(save_path)
+                resp, content = fetch_range(http, uri, offset, min(offset + chunk_size, end + 1) - 1)
+                if resp.status != 206 or not content:
+                    raise HttpError(resp, content, uri=uri)
+                fh.write(content)
+                fh.flush()
+                offset += len(content)
+                with lock:
+                    written[start] = offset - start
+                    progress["done"] += len(content)
+                    state["segments"][str(start)] = written[start]
+                    save_state(save_path, state)
+                    done = progress["done"]
+                if progress_callback:
+                    progress_callback(done, file_size)
+
+    pending = [(start, end) for start, end in segments if start + written[start] <= end]
+    with ThreadPoolExecutor(max_workers=min(max_segments, len(pending) or 1)) as pool:
+        futures = [pool.submit(_segment, start, end) for start, end in pending]
+        error = None
+        for future in futures:
+            try:
+                future.result()
+            except Exception as e:
+                if error is None:
+                    error = e
+                    stop.set()
+    if error is not None:
+        raise error
+
+    finalize(save_path)
+    if progress_callback:
+        progress_callback(file_size, file_size)
+    return save_path
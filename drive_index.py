@@ -0,0 +1,181 @@
+# drive_index.py — Local SQLite metadata index of the whole Drive
+import re
+import time
+import sqlite3
+import threading
+import listing
+
+INDEX_FIELDS = "id, name, mimeType, parents, size, md5Checksum, modifiedTime"
+MAX_AGE = 24 * 60 * 60  # Seconds before a full re-crawl; changes keep it current in between
+
+SCHEMA = """
+CREATE TABLE IF NOT EXISTS files (
+    id TEXT PRIMARY KEY,
+    name TEXT NOT NULL,
+    mime_type TEXT,
+    size INTEGER,
+    md5 TEXT,
+    modified_time TEXT,
+    crawl INTEGER NOT NULL DEFAULT 0
+);
+CREATE TABLE IF NOT EXISTS parents (
+    file_id TEXT NOT NULL,
+    parent_id TEXT NOT NULL,
+    PRIMARY KEY (file_id, parent_id)
+);
+CREATE INDEX IF NOT EXISTS parents_by_parent ON parents(parent_id);
+CREATE VIRTUAL TABLE IF NOT EXISTS names USING fts5(
+    name, content='files', content_rowid='rowid', tokenize='unicode61 remove_diacritics 2'
+);
+CREATE TRIGGER IF NOT EXISTS files_ai AFTER INSERT ON files BEGIN
+    INSERT INTO names(rowid, name) VALUES (new.rowid, new.name);
+END;
+CREATE TRIGGER IF NOT EXISTS files_ad AFTER DELETE ON files BEGIN
+    INSERT INTO names(names, rowid, name) VALUES ('delete', old.rowid, old.name);
+    DELETE FROM parents WHERE file_id = old.id;
+END;
+CREATE TRIGGER IF NOT EXISTS files_au AFTER UPDATE OF name ON files BEGIN
+    INSERT INTO names(names, rowid, name) VALUES ('delete', old.rowid, old.name);
+    INSERT INTO names(rowid, name) VALUES (new.rowid, new.name);
+END;
+CREATE TABLE IF NOT EXISTS meta (
+    key TEXT PRIMARY KEY,
+    value TEXT
+);
+"""
+
+
+def fts_query(text):
+    """Turn free text into an FTS5 query: every word must match as a prefix"""
+    words = re.findall(r"\w+", text)
+    return " ".join('"' + w.replace('"', '""') + '"*' for w in words)
+
+
+class DriveIndex:
+    """Metadata for every file in the Drive, searchable without the network.
+
+    Filled by crawl() (paginated bulk listing of the whole Drive) and kept
+    current with apply_changes() from the Changes feed. One connection is
+    shared by all threads behind a lock.
+    """
+
+    def __init__(self, path):
+        self.lock = threading.Lock()
+        self.db = sqlite3.connect(path, check_same_thread=False)
+        self.db.row_factory = sqlite3.Row
+        self.crawling_id = None  # Crawl in progress; changes applied meanwhile are tagged with it
+        with self.lock, self.db:
+            self.db.execute("PRAGMA journal_mode=WAL")
+            self.db.executescript(SCHEMA)
+
+    # === Writing ===
+    def upsert(self, files, crawl=0):
+        rows = [(f["id"], f.get("name", ""), f.get("mimeType"), int(f["size"]) if "size" in f else None,
+                 f.get("md5Checksum"), f.get("modifiedTime"), crawl) for f in files]
+        with self.lock, self.db:
+            self.db.executemany(
+                """INSERT INTO files (id, name, mime_type, size, md5, modified_time, crawl)
+                   VALUES (?, ?, ?, ?, ?, ?, ?)
+                   ON CONFLICT(id) DO UPDATE SET name=excluded.name, mime_type=excluded.mime_type,
+                   size=excluded.size, md5=excluded.md5, modified_time=excluded.modified_time,
+                   crawl=excluded.crawl""",
+                rows
+            )
+            self.db.executemany("DELETE FROM parents WHERE file_id = ?", [(f["id"],) for f in files])
+            self.db.executemany(
+                "INSERT OR IGNORE INTO parents (file_id, parent_id) VALUES (?, ?)",
+                [(f["id"], p) for f in files for p in f.get("parents", [])]
+            )
+
+    def remove(self, file_ids):
+        with self.lock, self.db:
+            self.db.executemany("DELETE FROM files WHERE id = ?", [(i,) for i in file_ids])
+
+    def apply_changes(self, changes):
+        """Apply a batch from changes().list"""
+        gone = [c["fileId"] for c in changes if c.get("removed") or (c.get("file") or {}).get("trashed")]
+        live = [c["file"] for c in changes if c.get("file") and c["fileId"] not in gone]
+        if live:
+            self.upsert(live, crawl=self.crawling_id or self.last_crawl_id())
+        if gone:
+            self.remove(gone)
+
+    def crawl(self, service, progress_callback=None):
+        """Re-index the whole Drive with paginated bulk listing (not one call per folder)"""
+        crawl_id = self.last_crawl_id() + 1
+        self.crawling_id = crawl_id
+        count = 0
+        try:
+            for page in listing.iter_pages(service, "trashed=false", fields=INDEX_FIELDS, order_by=None):
+                self.upsert(page, crawl=crawl_id)
+                count += len(page)
+                if progress_callback:
+                    progress_callback(count)
+        finally:
+            self.crawling_id = None
+        with self.lock, self.db:
+            # Anything not seen in this crawl was deleted while we weren't watching
+            self.db.execute("DELETE FROM files WHERE crawl < ?", (crawl_id,))
+            self.db.executemany("INSERT OR REPLACE INTO meta (key, value) VALUES (?, ?)",
+                                [("crawl_id", str(crawl_id)), ("crawled_at", str(time.time()))])
+        return count
+
+    # === Reading ===
+    def meta(self, key, default=None):
+        with self.lock:
+            row = self.db.execute("SELECT value FROM meta WHERE key = ?", (key,)).fetchone()
+        return row["value"] if row else default
+
+    def last_crawl_id(self):
+        return int(self.meta("crawl_id", 0))
+
+    def needs_crawl(self, max_age=MAX_AGE):
+        return time.time() - float(self.meta("crawled_at", 0)) > max_age
+
+    def search(self, text, limit=500):
+        """Files whose name matches every word of text (prefix match), folders first"""
+        query = fts_query(text)
+        if not query:
+            return []
+        with self.lock:
+            rows = self.db.execute(
+                """SELECT f.* FROM names JOIN files f ON f.rowid = names.rowid
+                   WHERE names MATCH ? ORDER BY f.mime_type != ?, rank LIMIT ?""",
+                (query, listing.FOLDER_MIME, limit)
+            ).fetchall()
+        return [self.to_file(row) for row in rows]
+
+    def get(self, file_id):
+        with self.lock:
+            row = self.db.execute("SELECT * FROM files WHERE id = ?", (file_id,)).fetchone()
+        return self.to_file(row) if row else None
+
+    def parent_ids(self, file_id):
+        with self.lock:
+            rows = self.db.execute("SELECT parent_id FROM parents WHERE file_id = ?", (file_id,)).fetchall()
+        return [row["parent_id"] for row in rows]
+
+    def path_of(self, file_id):
+        """Ancestor folders of a file as [(id, name)], outermost first, below My Drive"""
+        path = []
+        seen = {file_id}
+        parents = self.parent_ids(file_id)
+        while parents and parents[0] not in seen:
+            folder = self.get(parents[0])
+            if folder is None:
+                break  # Reached the root (it is never listed itself)
+            path.append((folder["id"], folder["name"]))
+            seen.add(folder["id"])
+            parents = self.parent_ids(folder["id"])
+        return path[::-1]
+
+    def to_file(self, row):
+        """Row as a files().list-style dict"""
+        f = {"id": row["id"], "name": row["name"], "mimeType": row["mime_type"]}
+        if row["size"] is not None:
+            f["size"] = str(row["size"])
+        if row["md5"]:
+            f["md5Checksum"] = row["md5"]
+        if row["modified_time"]:
+            f["modifiedTime"] = row["modified_time"]
+        return f
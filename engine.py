@@ -0,0 +1,205 @@
+# engine.py — Drive operations with no UI attached, shared by the Tk app and the command line
+import os
+from google.auth.transport.requests import Request
+from google.oauth2.credentials import Credentials
+from google_auth_oauthlib.flow import InstalledAppFlow
+import listing
+import downloads
+import folder_download
+import zip_download
+import batch_ops
+from service_pool import ServicePool
+from uploads import UploadManager, UploadJournal
+
+SCOPES = ['https://www.googleapis.com/auth/drive']
+TOKEN_FILE = "token.json"
+ROOT = "root"  # Drive's alias for My Drive
+
+# Large downloads are split into byte ranges fetched in parallel
+FOLDER_DOWNLOAD_WORKERS = 4                # Files fetched at once by a folder download
+DOWNLOAD_SEGMENTS = 4                      # Ranges in flight at once (1 = single stream)
+DOWNLOAD_SEGMENT_SIZE = 32 * 1024 * 1024   # Bytes per range
+
+# Uploads use resumable sessions; interrupted ones continue on the next launch
+UPLOAD_CHUNK_SIZE = 8 * 1024 * 1024        # Bytes per request (rounded to 256 KiB)
+
+
+# === Credentials ===
+def save_token(creds, token_path=TOKEN_FILE):
+    with open(token_path, "w") as token:
+        token.write(creds.to_json())
+
+
+def load_credentials(token_path=TOKEN_FILE):
+    """Saved credentials, refreshed if expired, or None if there are none usable"""
+    if not os.path.exists(token_path):
+        return None
+    creds = Credentials.from_authorized_user_file(token_path, SCOPES)
+    if creds.valid:
+        return creds
+    if creds.expired and creds.refresh_token:
+        creds.refresh(Request())
+        save_token(creds, token_path)
+        return creds
+    return None
+
+
+def authorize(client_secrets_path, token_path=TOKEN_FILE):
+    """Run the browser consent flow and save the resulting token"""
+    flow = InstalledAppFlow.from_client_secrets_file(client_secrets_path, SCOPES)
+    creds = flow.run_local_server(port=0)
+    save_token(creds, token_path)
+    return creds
+
+
+def format_size(num_bytes):
+    """Human-readable byte count for progress text"""
+    for unit in ("B", "KB", "MB", "GB"):
+        if num_bytes < 1024 or unit == "GB":
+            return f"{num_bytes:.0f} {unit}" if unit == "B" else f"{num_bytes:.1f} {unit}"
+        num_bytes /= 1024
+
+
+def escape_query(value):
+    return value.replace("\\", "\\\\").replace("'", "\\'")
+
+
+class DriveEngine:
+    """Everything the app does to a Drive, without Tk.
+
+    Methods block on the calling thread and report through the same hooks
+    the transfer modules use (progress_callback, cancel_event), so the GUI
+    runs them inside its scheduler tasks and the CLI runs them the same
+    way with no display. The scheduler is the caller's: the GUI's keeps
+    its on-disk journal, a script's need not.
+    """
+
+    def __init__(self, creds, scheduler, cache_dir, token_path=TOKEN_FILE,
+                 download_segments=DOWNLOAD_SEGMENTS, download_segment_size=DOWNLOAD_SEGMENT_SIZE,
+                 folder_workers=FOLDER_DOWNLOAD_WORKERS, upload_chunk_size=UPLOAD_CHUNK_SIZE,
+                 governor=None, transport=None, tracer=None):
+        # One service per worker thread, all sharing (and refreshing) creds
+        self.service = ServicePool(creds, on_refresh=lambda c: save_token(c, token_path),
+                                   governor=governor, transport=transport, tracer=tracer)
+        self.scheduler = scheduler
+        self.download_segments = download_segments
+        self.download_segment_size = download_segment_size
+        self.folder_workers = folder_workers
+        os.makedirs(cache_dir, exist_ok=True)
+        self.uploads = UploadManager(
+            self.service,
+            UploadJournal(os.path.join(cache_dir, "uploads.json")),
+            scheduler,
+            chunk_size=upload_chunk_size
+        )
+
+    # === Reading ===
+    def iter_folder(self, folder_id):
+        """Pages of folder_id's listing (None = My Drive), folders first, by name"""
+        return listing.iter_pages(self.service, listing.folder_query(folder_id))
+
+    def list_folder(self, folder_id):
+        return [f for page in self.iter_folder(folder_id) for f in page]
+
+    def metadata(self, file_id, fields=listing.LIST_FIELDS):
+        return self.service.files().get(fileId=file_id, fields=fields).execute()
+
+    def resolve(self, path):
+        """File metadata for a path like "Reports/2024/q1.pdf" under My Drive.
+
+        "id:<fileId>" names a file directly; "" or "/" is My Drive itself.
+        Where a folder holds several items of the same name, the first in
+        listing order wins.
+        """
+        if path.startswith("id:"):
+            return self.metadata(path[3:])
+        f = {"id": ROOT, "name": "My Drive", "mimeType": listing.FOLDER_MIME}
+        for part in [p for p in path.strip("/").split("/") if p]:
+            query = f"name = '{escape_query(part)}' and '{f['id']}' in parents and trashed = false"
+            matches = next(listing.iter_pages(self.service, query, page_size=10), [])
+            if not matches:
+                raise LookupError(f"Not found: {path}")
+            f = matches[0]
+        return f
+
+    # === Transfers ===
+    def download(self, file_id, save_path, size=None, modified_time=None,
+                 progress_callback=None, cancel_event=None):
+        """Fetch one file into save_path in parallel ranges; a rerun resumes from the .part file.
+
+        size and modifiedTime usually come with the listing; without them
+        they are looked up first.
+        """
+        if modified_time is None:
+            meta = self.metadata(file_id, fields="size, modifiedTime")
+            size, modified_time = meta.get("size"), meta.get("modifiedTime")
+        downloads.segmented_download(
+            self.service,
+            file_id,
+            save_path,
+            int(size) if size is not None else None,
+            modified_time=modified_time,
+            max_segments=self.download_segments,
+            segment_size=self.download_segment_size,
+            progress_callback=progress_callback,
+            cancel_event=cancel_event
+        )
+        return save_path
+
+    def download_folder(self, folder_id, dest_dir, progress_callback=None, cancel_event=None):
+        """Mirror a folder tree into dest_dir, skipping files whose local md5 already matches"""
+        return folder_download.download_tree(
+            self.service,
+            folder_id,
+            dest_dir,
+            max_workers=self.folder_workers,
+            progress_callback=progress_callback,
+            cancel_event=cancel_event
+        )
+
+    # Pulling a folder is idempotent: only new or changed files are fetched
+    sync = download_folder
+
+    def download_zip(self, folder_id, zip_path, progress_callback=None, cancel_event=None):
+        return zip_download.download_zip(
+            self.service,
+            folder_id,
+            zip_path,
+            progress_callback=progress_callback,
+            cancel_event=cancel_event
+        )
+
+    def upload(self, paths, parent_id, progress_callback=None, done_callback=None, **kwargs):
+        """Queue uploads on the scheduler's transfer pool. Returns the tasks"""
+        return self.uploads.upload(list(paths), parent_id or ROOT, progress_callback, done_callback, **kwargs)
+
+    # === Changes ===
+    def rename(self, file_id, new_name):
+        return self.service.files().update(fileId=file_id, body={"name": new_name}).execute()
+
+    def rename_many(self, new_names, progress_callback=None):
+        """{file_id: new name}, 100 renames per batch request. Returns {file_id: (response, error)}"""
+        return batch_ops.bulk_rename(self.service, new_names, progress_callback)
+
+    def move(self, file_ids, destination_id, parents=None, progress_callback=None):
+        """Move files into destination_id (None = My Drive) in batches.
+
+        parents maps file_id -> current parents where the caller already
+        knows them (e.g. from its listing); the rest are looked up.
+        """
+        return batch_ops.bulk_move(self.service, list(file_ids), destination_id or ROOT,
+                                   parents=parents, progress_callback=progress_callback)
+
+    def move_one(self, file_id, destination_id, parents=None):
+        """Move a single file with one update call (no batch round trip)"""
+        if parents is None:
+            parents = self.metadata(file_id, fields="parents").get("parents", [])
+        return self.service.files().update(
+            fileId=file_id,
+            addParents=destination_id,
+            removeParents=",".join(p for p in parents if p != destination_id),
+            fields="id, parents"
+        ).execute()
+
+    def trash(self, file_ids, progress_callback=None):
+        return batch_ops.bulk_trash(self.service, list(file_ids), progress_callback)
@@ -0,0 +1,432 @@
+# file_grid.py — Virtualized, widget-recycling file card grid
+import sys
+from collections import OrderedDict
+from functools import lru_cache
+import customtkinter as ctk
+import listing
+
+CARD_WIDTH = 220
+CARD_HEIGHT = 180
+CARD_PAD = 12
+CELL_WIDTH = CARD_WIDTH + 2 * CARD_PAD
+CELL_HEIGHT = CARD_HEIGHT + 2 * CARD_PAD
+OVERSCAN_ROWS = 1      # Extra rows kept built above and below the viewport
+SCROLL_STEP = 60       # Pixels per mouse-wheel notch
+SCROLLBAR_WIDTH = 16
+SHIFT_MASK = 0x0001
+CONTROL_MASK = 0x0004
+COMMAND_MASK = 0x0008  # macOS Command key; the same bit is Alt on X11 and NumLock on Windows
+TOGGLE_MASK = CONTROL_MASK | (COMMAND_MASK if sys.platform == "darwin" else 0)  # Click modifiers that toggle
+DRAG_THRESHOLD = 8     # Pixels the pointer must travel with the button down before a drag starts
+THUMBNAIL_MEMORY = 256 # Thumbnail images kept on the Tk side, least recently shown dropped first
+
+
+@lru_cache(maxsize=None)
+def cached_font(family=None, size=13, weight="normal"):
+    """One shared CTkFont per (family, size, weight) instead of one per widget"""
+    return ctk.CTkFont(family=family, size=size, weight=weight)
+
+
+def display_name(name, limit=30):
+    return name[:limit] + "..." if len(name) > limit else name
+
+
+class FileCard(ctk.CTkFrame):
+    """A pooled card. show() points it at a different file instead of rebuilding it"""
+
+    def __init__(self, grid):
+        colors = grid.colors
+        super().__init__(
+            grid,
+            width=CARD_WIDTH,
+            height=CARD_HEIGHT,
+            corner_radius=12,
+            fg_color=colors["bg_card"],
+            border_width=2,
+            border_color=colors["bg_card"]
+        )
+        self.grid_view = grid
+        self.pack_propagate(False)
+
+        self.icon_label = ctk.CTkLabel(self, text="", font=cached_font(size=56))
+        self.icon_label.pack(pady=(20, 10))
+
+        self.name_label = ctk.CTkLabel(
+            self,
+            text="",
+            font=cached_font(grid.ui_font, 13, "bold"),
+            text_color=colors["text_primary"],
+            wraplength=200
+        )
+        self.name_label.pack(pady=(0, 5))
+
+        self.type_label = ctk.CTkLabel(
+            self,
+            text="",
+            font=cached_font(grid.ui_font, 11),
+            text_color=colors["text_secondary"]
+        )
+        self.type_label.pack()
+
+        self.file = None
+        self.file_id = None
+        self.file_name = None
+        self.is_folder = False
+        self.selected = False
+        self.position = None
+
+        # Bindings are made once and read the card's current file at event time
+        for widget in (self, self.icon_label, self.name_label, self.type_label):
+            widget.bind("<Button-1>", self.on_click)
+            widget.bind("<Double-Button-1>", self.on_double_click)
+            widget.bind("<B1-Motion>", self.on_motion)
+            widget.bind("<ButtonRelease-1>", lambda e: self.grid_view.end_drag(), add="+")
+        self.bind("<Enter>", self.on_enter)
+        self.bind("<Leave>", self.on_leave)
+
+    def show(self, f, selected):
+        """Point this card at file f, touching only what changed"""
+        rebound = self.file_id != f["id"]  # A pooled card may still carry the last file's drag styling
+        if self.file is not f:
+            if (self.file is None or self.file["id"] != f["id"] or self.file["name"] != f["name"]
+                    or self.file["mimeType"] != f["mimeType"] or self.file.get("location") != f.get("location")
+                    or self.file.get("modifiedTime") != f.get("modifiedTime")):
+                is_folder = f["mimeType"] == listing.FOLDER_MIME
+                self.show_icon(f, is_folder)
+                self.name_label.configure(text=display_name(f["name"]))
+                # Search results carry the folder they live in instead of a type
+                type_text = f.get("location") or ("Folder" if is_folder else "File")
+                self.type_label.configure(text=display_name(type_text, 34))
+                self.is_folder = is_folder
+            self.file = f
+            self.file_id = f["id"]
+            self.file_name = f["name"]
+        if selected != self.selected or self.position is None or rebound:
+            self.set_selected(selected)
+
+    def show_icon(self, f, is_folder):
+        """The file's thumbnail if one is loaded, else the emoji until it arrives"""
+        image = self.grid_view.thumbnail_for(f)
+        if image is not None:
+            self.icon_label.configure(image=image, text="")
+        else:
+            self.icon_label.configure(image="", text="📁" if is_folder else "📄")
+
+    def release(self):
+        """Return to the pool: hidden and ignored by hit-testing"""
+        self.place_forget()
+        self.position = None
+        self.file = None
+        self.file_id = None
+        self.file_name = None
+        self.is_folder = False
+
+    def set_selected(self, selected):
+        colors = self.grid_view.colors
+        self.selected = selected
+        if selected:
+            self.configure(border_color=colors["primary"], fg_color=colors["bg_hover"])
+        else:
+            self.configure(border_color=colors["bg_card"], fg_color=colors["bg_card"])
+
+    def on_click(self, event):
+        self.grid_view.press = (event.x_root, event.y_root)
+        if self.file_id:
+            self.grid_view.on_card_click(self, event)
+
+    def on_motion(self, event):
+        if self.file_id:
+            self.grid_view.on_card_motion(self, event)
+
+    def on_double_click(self, event):
+        if self.file_id and self.is_folder and self.grid_view.on_open:
+            self.grid_view.on_open(self.file_id, self.file_name)
+
+    def on_enter(self, event):
+        if self.file_id:
+            self.configure(border_color=self.grid_view.colors["primary"])
+            self.grid_view.hover(self)
+
+    def on_leave(self, event):
+        # Moving onto one of the card's own labels is not leaving it
+        under = self.winfo_containing(event.x_root, event.y_root)
+        if under is not None and str(under).startswith(str(self)):
+            return
+        if self.file_id and not self.selected:
+            self.configure(border_color=self.grid_view.colors["bg_card"])
+        self.grid_view.hover(None)
+
+
+class FileGrid(ctk.CTkFrame):
+    """Scrollable card grid that only builds the cards in view.
+
+    Cards are placed directly inside this frame, so the usual
+    winfo_children() / winfo_x() walks over the grid keep working; cards
+    sitting idle in the pool have file_id None.
+    """
+
+    def __init__(self, master, colors, ui_font, on_select=None, on_open=None, on_hover=None, on_drag=None,
+                 on_visible=None, **kwargs):
+        super().__init__(master, fg_color="transparent", **kwargs)
+        self.colors = colors
+        self.ui_font = ui_font
+        self.on_select = on_select
+        self.on_open = on_open
+        self.on_hover = on_hover  # on_hover(file or None) as the pointer enters/leaves cards
+        self.on_drag = on_drag    # on_drag(event, file_id, file_name, card) once a press turns into a drag
+        self.on_visible = on_visible  # on_visible(files) after each render, with the files that have cards
+
+        self.items = []
+        self.selected_ids = set()
+        self.anchor_id = None  # Last plain/ctrl-clicked file, start of shift-click ranges
+        self.scroll_y = 0
+        self.columns = 1
+        self.bound = {}   # Item index -> card showing it
+        self.free = []    # Built cards not showing anything
+        self.card_by_id = {}  # File id -> bound card, so restyling touches only the cards involved
+        self.render_pending = False
+        self.press = None     # Root coordinates of the last button press on a card
+        self.dragging = False
+        # Layout from the last render, for hit-testing without querying any widget
+        self.x_offset = 0
+        self.view_height = 0
+        self.origin = None    # Root coordinates of the grid; reset on <Configure> and by reset_origin()
+        self.thumbnails = OrderedDict()  # (file id, modifiedTime) -> CTkImage
+
+        self.scrollbar = ctk.CTkScrollbar(
+            self,
+            width=SCROLLBAR_WIDTH,
+            command=self.on_scrollbar,
+            button_color=colors["bg_hover"],
+            button_hover_color=colors["secondary"]
+        )
+        self.scrollbar.place(relx=1.0, rely=0, relheight=1.0, anchor="ne")
+
+        self.empty_label = ctk.CTkLabel(
+            self,
+            text="📂 This folder is empty",
+            font=cached_font(ui_font, 18),
+            text_color=colors["text_secondary"]
+        )
+
+        self.bind("<Configure>", self.on_configure)
+        self.bind_all("<MouseWheel>", self.on_mouse_wheel, add="+")
+        self.bind_all("<Button-4>", self.on_mouse_wheel, add="+")
+        self.bind_all("<Button-5>", self.on_mouse_wheel, add="+")
+
+    # === Public API ===
+    def set_items(self, items, keep_scroll=False):
+        """Show a listing, from the top unless keep_scroll. items is kept by reference.
+
+        Cards already showing an unchanged file are left untouched, so a
+        revalidated listing only redraws what actually changed.
+        """
+        self.items = items
+        if not keep_scroll:
+            self.scroll_y = 0
+        self.render()
+
+    def refresh(self):
+        """Re-render after self.items grew or changed, keeping the scroll position"""
+        self.render()
+
+    def set_selected(self, file_ids):
+        """Replace the selection (an id, an iterable of ids, or None)"""
+        if file_ids is None:
+            file_ids = ()
+        elif isinstance(file_ids, str):
+            file_ids = (file_ids,)
+        selected = set(file_ids)
+        changed = selected ^ self.selected_ids
+        self.selected_ids = selected
+        # Only cards whose state flipped are restyled, not every card in view
+        for file_id in changed:
+            card = self.card_by_id.get(file_id)
+            if card is not None:
+                card.set_selected(file_id in selected)
+
+    def select_all(self):
+        self.set_selected(f["id"] for f in self.items)
+
+    def on_card_click(self, card, event):
+        """Click selects one item, Ctrl/Cmd-click toggles, Shift-click selects a range"""
+        if event.state & SHIFT_MASK and self.anchor_id:
+            ids = [f["id"] for f in self.items]
+            if self.anchor_id in ids:
+                a, b = sorted((ids.index(self.anchor_id), ids.index(card.file_id)))
+                self.set_selected(ids[a:b + 1])
+        elif event.state & TOGGLE_MASK:
+            self.set_selected(self.selected_ids ^ {card.file_id})
+            self.anchor_id = card.file_id
+        else:
+            self.set_selected(card.file_id)
+            self.anchor_id = card.file_id
+        if self.on_select:
+            self.on_select(card.file_id, card.file_name, card.is_folder, card)
+
+    def on_card_motion(self, card, event):
+        """Turn a press-and-move on a card into a drag, once it travels DRAG_THRESHOLD pixels"""
+        if self.dragging or not self.on_drag or self.press is None:
+            return
+        if abs(event.x_root - self.press[0]) + abs(event.y_root - self.press[1]) < DRAG_THRESHOLD:
+            return
+        self.dragging = True
+        self.on_drag(event, card.file_id, card.file_name, card)
+
+    def end_drag(self):
+        self.dragging = False
+        self.press = None
+
+    def reset_origin(self):
+        self.origin = None
+
+    def item_at(self, x_root, y_root):
+        """Index of the item under a screen point, or None.
+
+        Works out the cell from the last render's layout (columns, offset,
+        scroll) instead of asking each card for its geometry, so it costs
+        the same however many cards exist.
+        """
+        if self.origin is None:
+            self.origin = (self.winfo_rootx(), self.winfo_rooty())
+        x = x_root - self.origin[0] - self.x_offset
+        y = y_root - self.origin[1]
+        if x < 0 or y < 0 or y >= self.view_height:
+            return None
+        col, cell_x = divmod(x, CELL_WIDTH)
+        row, cell_y = divmod(y + self.scroll_y, CELL_HEIGHT)
+        if col >= self.columns:
+            return None
+        if not (CARD_PAD <= cell_x < CARD_PAD + CARD_WIDTH and CARD_PAD <= cell_y < CARD_PAD + CARD_HEIGHT):
+            return None  # In the gap between cards
+        index = int(row) * self.columns + int(col)
+        return index if index < len(self.items) else None
+
+    def card_at(self, index):
+        return self.bound.get(index)
+
+    def hover(self, card):
+        if self.on_hover:
+            self.on_hover(card.file if card is not None else None)
+
+    def thumbnail_for(self, f):
+        key = (f["id"], f.get("modifiedTime", ""))
+        image = self.thumbnails.get(key)
+        if image is not None:
+            self.thumbnails.move_to_end(key)
+        return image
+
+    def set_thumbnail(self, f, pil_image):
+        """Show a loaded thumbnail (a small PIL image) on f's card, and keep it for later renders"""
+        key = (f["id"], f.get("modifiedTime", ""))
+        self.thumbnails[key] = ctk.CTkImage(light_image=pil_image, dark_image=pil_image, size=pil_image.size)
+        self.thumbnails.move_to_end(key)
+        while len(self.thumbnails) > THUMBNAIL_MEMORY:
+            self.thumbnails.popitem(last=False)
+        card = self.card_by_id.get(f["id"])
+        if card is not None and card.file is not None and card.file.get("modifiedTime", "") == key[1]:
+            card.show_icon(card.file, card.is_folder)
+
+    def card_count(self):
+        return len(self.bound) + len(self.free)
+
+    # === Scrolling ===
+    def on_scrollbar(self, action, value, unit=None):
+        if action == "moveto":
+            self.scroll_y = float(value) * self.content_height()
+        elif action == "scroll":
+            step = self.winfo_height() if unit == "pages" else SCROLL_STEP
+            self.scroll_y += int(value) * step
+        self.request_render()
+
+    def on_mouse_wheel(self, event):
+        if not str(event.widget).startswith(str(self)):
+            return
+        if event.num == 4:
+            notches = -1
+        elif event.num == 5:
+            notches = 1
+        elif sys.platform == "darwin":
+            notches = -event.delta
+        else:
+            notches = -event.delta / 120
+        self.scroll_y += notches * SCROLL_STEP
+        self.request_render()
+
+    # === Rendering ===
+    def on_configure(self, event):
+        self.origin = None
+        self.request_render()
+
+    def content_height(self):
+        rows = -(-len(self.items) // self.columns)
+        return rows * CELL_HEIGHT
+
+    def request_render(self):
+        """Coalesce bursts of scroll/resize events into one render per idle pass"""
+        if not self.render_pending:
+            self.render_pending = True
+            self.after_idle(self.render)
+
+    def render(self):
+        self.render_pending = False
+        width = self.winfo_width() - SCROLLBAR_WIDTH
+        height = self.winfo_height()
+        if width <= 1 or height <= 1:
+            return  # Not mapped yet; <Configure> renders again
+
+        if not self.items:
+            for index in list(self.bound):
+                self.free.append(self.bound.pop(index))
+                self.free[-1].release()
+            self.card_by_id.clear()
+            self.scrollbar.set(0, 1)
+            self.empty_label.place(relx=0.5, y=50, anchor="n")
+            if self.on_visible:
+                self.on_visible([])
+            return
+        self.empty_label.place_forget()
+
+        self.columns = max(1, width // CELL_WIDTH)
+        rows = -(-len(self.items) // self.columns)
+        content_height = rows * CELL_HEIGHT
+        self.scroll_y = int(max(0, min(self.scroll_y, content_height - height)))
+
+        first_row = max(0, self.scroll_y // CELL_HEIGHT - OVERSCAN_ROWS)
+        last_row = min(rows - 1, (self.scroll_y + height) // CELL_HEIGHT + OVERSCAN_ROWS)
+        visible = range(first_row * self.columns, min(len(self.items), (last_row + 1) * self.columns))
+
+        for index in list(self.bound):
+            if index not in visible:
+                card = self.bound.pop(index)
+                if self.card_by_id.get(card.file_id) is card:
+                    del self.card_by_id[card.file_id]
+                card.release()
+                self.free.append(card)
+
+        x_offset = (width - self.columns * CELL_WIDTH) // 2
+        self.x_offset = x_offset
+        self.view_height = height
+        for index in visible:
+            card = self.bound.get(index)
+            if card is None:
+                card = self.free.pop() if self.free else FileCard(self)
+                self.bound[index] = card
+            f = self.items[index]
+            if card.file_id is not None and card.file_id != f["id"] and self.card_by_id.get(card.file_id) is card:
+                del self.card_by_id[card.file_id]
+            card.show(f, f["id"] in self.selected_ids)
+            self.card_by_id[f["id"]] = card
+            row, col = divmod(index, self.columns)
+            position = (x_offset + col * CELL_WIDTH + CARD_PAD, row * CELL_HEIGHT + CARD_PAD - self.scroll_y)
+            if card.position != position:
+                card.place(x=position[0], y=position[1])
+                card.position = position
+
+        self.scrollbar.lift()
+        if content_height > height:
+            self.scrollbar.set(self.scroll_y / content_height, (self.scroll_y + height) / content_height)
+        else:
+            self.scrollbar.set(0, 1)
+        if self.on_visible:
+            self.on_visible([self.items[index] for index in visible])
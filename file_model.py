@@ -0,0 +1,153 @@
+# file_model.py — Compact, indexed in-memory model of the files on screen
+import sys
+import listing
+
+
+class DriveFile:
+    """One file's listing metadata, in slots instead of a per-file dict.
+
+    Also reads like the files().list dict it came from (f["name"],
+    f.get("size")), so code written against raw API dicts keeps working.
+    """
+
+    FIELDS = listing.LISTING_KEYS + ("location",)
+    __slots__ = FIELDS
+
+    def __init__(self, id, name="", mimeType="", iconLink=None, thumbnailLink=None, modifiedTime=None, parents=(),
+                 size=None, md5Checksum=None, location=None):
+        self.id = id
+        self.name = name
+        self.mimeType = sys.intern(mimeType)  # A handful of distinct values shared by every file
+        self.iconLink = iconLink
+        self.thumbnailLink = thumbnailLink
+        self.modifiedTime = modifiedTime
+        self.parents = tuple(parents)
+        self.size = size
+        self.md5Checksum = md5Checksum
+        self.location = location  # Search results: the folder path it lives in
+
+    @classmethod
+    def from_dict(cls, f):
+        return cls(**{k: f[k] for k in cls.FIELDS if k in f})
+
+    @property
+    def is_folder(self):
+        return self.mimeType == listing.FOLDER_MIME
+
+    def to_dict(self):
+        d = {}
+        for k in self.FIELDS:
+            value = getattr(self, k)
+            if value is not None and value != ():
+                d[k] = list(value) if k == "parents" else value
+        return d
+
+    # Mapping-style access, as for the raw API dicts
+    def __getitem__(self, key):
+        value = getattr(self, key, None) if key in self.FIELDS else None
+        if value is None:
+            raise KeyError(key)
+        return value
+
+    def get(self, key, default=None):
+        value = getattr(self, key, None) if key in self.FIELDS else None
+        return default if value is None else value
+
+    def __contains__(self, key):
+        return self.get(key) is not None
+
+    def __repr__(self):
+        return f"DriveFile({self.id!r}, {self.name!r})"
+
+
+class FileModel:
+    """The current listing: DriveFile records in display order, indexed by id and by parent.
+
+    items is the list handed to the grid; extend() appends in place so the
+    grid sees later pages without being given a new list.
+    """
+
+    def __init__(self, files=()):
+        self.items = []
+        self.by_id = {}
+        self.positions = {}  # File id -> index in items
+        self.by_parent = {}  # Parent id -> {file id, ...}
+        self.extend(files)
+
+    def extend(self, files):
+        for f in files:
+            record = f if isinstance(f, DriveFile) else DriveFile.from_dict(f)
+            if record.id in self.by_id:
+                continue  # Pages can overlap when the folder changes mid-listing
+            self.positions[record.id] = len(self.items)
+            self.items.append(record)
+            self._index(record)
+
+    def _index(self, record):
+        self.by_id[record.id] = record
+        for parent_id in record.parents:
+            self.by_parent.setdefault(parent_id, set()).add(record.id)
+
+    def _unindex(self, record):
+        self.by_id.pop(record.id, None)
+        for parent_id in record.parents:
+            self.by_parent.get(parent_id, set()).discard(record.id)
+
+    def __iter__(self):
+        return iter(self.items)
+
+    def __len__(self):
+        return len(self.items)
+
+    def __bool__(self):
+        return bool(self.items)
+
+    def __getitem__(self, index):
+        return self.items[index]
+
+    def get(self, file_id):
+        return self.by_id.get(file_id)
+
+    def in_order(self, file_ids):
+        """Records for file_ids, in display order"""
+        ids = [i for i in file_ids if i in self.positions]
+        return [self.items[self.positions[i]] for i in sorted(ids, key=self.positions.__getitem__)]
+
+    def children(self, parent_id):
+        return self.in_order(self.by_parent.get(parent_id, ()))
+
+    def parents_of(self, file_ids):
+        """{file_id: [parent ids]} for the listed ones among file_ids"""
+        return {i: list(self.by_id[i].parents) for i in file_ids if i in self.by_id and self.by_id[i].parents}
+
+    def apply_changes(self, folder_id, changes):
+        """Apply a changes().list batch to this listing of folder_id. Returns True if it changed"""
+        changed = False
+        for change in changes:
+            file_id = change.get("fileId")
+            f = change.get("file") or {}
+            inside = not change.get("removed") and not f.get("trashed") and folder_id in f.get("parents", [])
+            current = self.by_id.get(file_id)
+            if current is None and not inside:
+                continue
+            changed = True
+            if not inside:
+                self._unindex(current)
+                del self.items[self.positions[file_id]]
+                self._reposition()
+                continue
+            record = DriveFile.from_dict(f)
+            if current is not None:
+                self._unindex(current)
+                self.items[self.positions[file_id]] = record  # Same slot, so the grid keeps its order
+            else:
+                key = listing.sort_key(record)
+                position = next((i for i, item in enumerate(self.items) if listing.sort_key(item) > key),
+                                len(self.items))
+                self.items.insert(position, record)
+                self._reposition()
+            self._index(record)
+        return changed
+
+    def _reposition(self):
+        self.positions = {f.id: i for i, f in enumerate(self.items)}
@@ -0,0 +1,143 @@
+# folder_download.py — Recursive, parallel download of a Drive folder tree
+import os
+import re
+import hashlib
+import threading
+from concurrent.futures import ThreadPoolExecutor, FIRST_COMPLETED, wait
+import listing
+import downloads
+
+TREE_FIELDS = "id, name, mimeType, size, md5Checksum, modifiedTime"
+LIST_WORKERS = 4        # Folders listed at the same time while walking the tree
+DOWNLOAD_WORKERS = 4    # Files downloaded at the same time
+HASH_CHUNK = 1024 * 1024
+GOOGLE_APPS_PREFIX = "application/vnd.google-apps."
+
+
+def safe_name(name):
+    """A Drive name usable as a local file name (Drive allows '/' and other reserved characters)"""
+    name = re.sub(r'[\\/:*?"<>|\x00-\x1f]', "_", name).strip().rstrip(".")
+    return name or "_"
+
+
+def unique_name(name, taken):
+    """name, or "name (n).ext" if a sibling already claimed it (Drive allows duplicate names)"""
+    candidate, n = name, 1
+    stem, ext = os.path.splitext(name)
+    while candidate.lower() in taken:
+        candidate = f"{stem} ({n}){ext}"
+        n += 1
+    taken.add(candidate.lower())
+    return candidate
+
+
+def local_md5(path):
+    digest = hashlib.md5()
+    with open(path, "rb") as f:
+        for block in iter(lambda: f.read(HASH_CHUNK), b""):
+            digest.update(block)
+    return digest.hexdigest()
+
+
+def is_current(path, f):
+    """True if path already holds f's content (same size and md5Checksum)"""
+    if "md5Checksum" not in f or not os.path.isfile(path):
+        return False
+    if "size" in f and os.path.getsize(path) != int(f["size"]):
+        return False
+    return local_md5(path) == f["md5Checksum"]
+
+
+def walk_tree(service, folder_id, dest_dir, max_workers=LIST_WORKERS, cancel_event=None):
+    """List a folder tree with concurrent files().list calls.
+
+    Returns (directories, files, skipped): local directories to create,
+    [(local_path, file)] to fetch, and Google Docs/Sheets/... files that
+    have no binary content to download.
+    """
+    directories, files, skipped = [dest_dir], [], []
+    with ThreadPoolExecutor(max_workers=max_workers) as pool:
+        pending = {pool.submit(listing.list_all, service, listing.folder_query(folder_id), fields=TREE_FIELDS): dest_dir}
+        while pending:
+            done, _ = wait(pending, return_when=FIRST_COMPLETED)
+            for future in done:
+                local_dir = pending.pop(future)
+                taken = set()
+                for f in future.result():
+                    path = os.path.join(local_dir, unique_name(safe_name(f["name"]), taken))
+                    if f["mimeType"] == listing.FOLDER_MIME:
+                        directories.append(path)
+                        if not (cancel_event and cancel_event.is_set()):
+                            query = listing.folder_query(f["id"])
+                            pending[pool.submit(listing.list_all, service, query, fields=TREE_FIELDS)] = path
+                    elif f["mimeType"].startswith(GOOGLE_APPS_PREFIX):
+                        skipped.append((path, f))
+                    else:
+                        files.append((path, f))
+    if cancel_event is not None and cancel_event.is_set():
+        raise downloads.DownloadCancelled(dest_dir)
+    return directories, files, skipped
+
+
+def download_tree(service, folder_id, dest_dir, max_workers=DOWNLOAD_WORKERS, progress_callback=None,
+                  cancel_event=None, list_workers=LIST_WORKERS):
+    """Mirror a Drive folder into dest_dir.
+
+    Files are fetched on a bounded pool; each one streams into a .part file,
+    so an interrupted run resumes mid-file. Files whose local copy already
+    has the same md5Checksum are skipped, so re-running only fetches what
+    changed. progress_callback(bytes_done, bytes_total, files_done, files_total)
+    reports aggregate progress. Returns {"downloaded", "unchanged",
+    "skipped": [path], "failed": [(path, error)]}.
+    """
+    directories, files, skipped = walk_tree(service, folder_id, dest_dir, list_workers, cancel_event)
+    for directory in directories:
+        os.makedirs(directory, exist_ok=True)
+
+    sizes = {path: int(f.get("size", 0)) for path, f in files}
+    received = dict.fromkeys(sizes, 0)
+    total = sum(sizes.values())
+    lock = threading.Lock()
+    result = {"downloaded": 0, "unchanged": 0, "skipped": [path for path, _ in skipped], "failed": []}
+
+    def _report():
+        if progress_callback:
+            finished = result["downloaded"] + result["unchanged"] + len(result["failed"])
+            progress_callback(sum(received.values()), total, finished, len(files))
+
+    def _progress(path, done):
+        with lock:
+            received[path] = done
+            _report()
+
+    def _fetch(path, f):
+        if cancel_event is not None and cancel_event.is_set():
+            raise downloads.DownloadCancelled(path)
+        if is_current(path, f):
+            outcome = "unchanged"
+        else:
+            downloads.stream_download(
+                service, f["id"], path, sizes[path] or None, f.get("modifiedTime"),
+                progress_callback=lambda done, _total: _progress(path, done),
+                cancel_event=cancel_event
+            )
+            outcome = "downloaded"
+        with lock:
+            received[path] = sizes[path]
+            result[outcome] += 1
+            _report()
+
+    with ThreadPoolExecutor(max_workers=max_workers) as pool:
+        futures = {pool.submit(_fetch, path, f): path for path, f in files}
+        for future in futures:
+            try:
+                future.result()
+            except downloads.DownloadCancelled:
+                pass
+            except Exception as e:
+                with lock:
+                    result["failed"].append((futures[future], e))
+                    _report()
+    if cancel_event is not None and cancel_event.is_set():
+        raise downloads.DownloadCancelled(dest_dir)
+    return result
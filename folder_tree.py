@@ -0,0 +1,113 @@
+# folder_tree.py — In-memory hierarchy of every folder in the Drive
+import re
+import time
+import threading
+import listing
+
+FOLDER_QUERY = f"mimeType='{listing.FOLDER_MIME}' and trashed=false"
+TREE_FIELDS = "id, name, parents"
+MAX_AGE = 10 * 60  # Seconds before a background reload; the Changes feed patches it in between
+
+
+def sort_key(folder):
+    return folder["name"].casefold()
+
+
+class FolderTree:
+    """All folders, loaded with one paginated query and browsed without the network.
+
+    Used by the Move dialog (browse, type-to-filter) and drag-and-drop
+    (valid targets, destination paths). load() swaps in a whole new tree at
+    once, so readers on the Tk thread never see a half-built one.
+    """
+
+    def __init__(self):
+        self.lock = threading.Lock()
+        self.folders = {}   # Folder id -> {"id", "name", "parents"}
+        self.children = {}  # Parent id -> [folder, ...] sorted by name
+        self.root_id = None
+        self.loaded_at = 0
+        self.ready = threading.Event()
+
+    # === Loading ===
+    def load(self, service):
+        root_id = service.files().get(fileId="root", fields="id").execute()["id"]
+        folders = {}
+        for page in listing.iter_pages(service, FOLDER_QUERY, fields=TREE_FIELDS, order_by=None):
+            for f in page:
+                folders[f["id"]] = {"id": f["id"], "name": f["name"], "parents": f.get("parents", [])}
+        children = self._index(folders)
+        with self.lock:
+            self.folders, self.children, self.root_id = folders, children, root_id
+            self.loaded_at = time.time()
+        self.ready.set()
+        return len(folders)
+
+    def needs_load(self, max_age=MAX_AGE):
+        return time.time() - self.loaded_at > max_age
+
+    @staticmethod
+    def _index(folders):
+        children = {}
+        for folder in folders.values():
+            for parent_id in folder["parents"]:
+                children.setdefault(parent_id, []).append(folder)
+        for siblings in children.values():
+            siblings.sort(key=sort_key)
+        return children
+
+    def apply_changes(self, changes):
+        """Patch the tree from a changes().list batch (only folder entries matter)"""
+        with self.lock:
+            if not self.folders:
+                return
+            touched = False
+            for change in changes:
+                f = change.get("file") or {}
+                file_id = change.get("fileId")
+                if change.get("removed") or f.get("trashed"):
+                    touched |= self.folders.pop(file_id, None) is not None
+                elif f.get("mimeType") == listing.FOLDER_MIME:
+                    self.folders[file_id] = {"id": file_id, "name": f.get("name", ""), "parents": f.get("parents", [])}
+                    touched = True
+            if touched:
+                self.children = self._index(self.folders)
+
+    # === Reading ===
+    def children_of(self, folder_id):
+        """Subfolders of folder_id (None = My Drive), sorted by name"""
+        with self.lock:
+            return list(self.children.get(folder_id or self.root_id, []))
+
+    def name_of(self, folder_id):
+        with self.lock:
+            folder = self.folders.get(folder_id)
+        return folder["name"] if folder else None
+
+    def path_of(self, folder_id):
+        """[(id, name)] from just below My Drive down to folder_id itself"""
+        path, seen = [], set()
+        with self.lock:
+            while folder_id in self.folders and folder_id not in seen:
+                seen.add(folder_id)
+                folder = self.folders[folder_id]
+                path.append((folder["id"], folder["name"]))
+                folder_id = folder["parents"][0] if folder["parents"] else None
+        return path[::-1]
+
+    def path_text(self, folder_id):
+        return " › ".join(["My Drive"] + [name for _, name in self.path_of(folder_id)])
+
+    def is_within(self, folder_id, ancestor_id):
+        """True if folder_id is ancestor_id or lies somewhere below it"""
+        return any(fid == ancestor_id for fid, _ in self.path_of(folder_id))
+
+    def filter(self, text, limit=200):
+        """Folders whose name contains every word of text, shortest paths first"""
+        words = [w.casefold() for w in re.findall(r"\w+", text)]
+        if not words:
+            return []
+        with self.lock:
+            matches = [f for f in self.folders.values() if all(w in f["name"].casefold() for w in words)]
+        matches.sort(key=lambda f: (len(self.path_of(f["id"])), sort_key(f)))
+        return matches[:limit]
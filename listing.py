@@ -0,0 +1,37 @@
+# listing.py — Paginated Drive folder listings
+MAX_PAGE_SIZE = 1000  # Largest pageSize files().list accepts
+LIST_FIELDS = "id, name, mimeType, iconLink, thumbnailLink, modifiedTime, parents, size, md5Checksum"
+LISTING_KEYS = tuple(k.strip() for k in LIST_FIELDS.split(","))  # The same fields, as dict keys
+FOLDER_MIME = "application/vnd.google-apps.folder"
+
+
+def sort_key(f):
+    """Approximates files().list orderBy='folder,name' (a listing dict or a DriveFile)"""
+    return (f.get("mimeType") != FOLDER_MIME, f.get("name", "").lower())
+
+
+def folder_query(folder_id):
+    """Query for the non-trashed children of a folder (None = My Drive root)"""
+    return f"trashed=false and '{folder_id or 'root'}' in parents"
+
+
+def iter_pages(service, query, fields=LIST_FIELDS, order_by="folder,name", page_size=MAX_PAGE_SIZE):
+    """Yield each page of files().list results, following nextPageToken to the end"""
+    page_token = None
+    while True:
+        result = service.files().list(
+            q=query,
+            pageSize=page_size,
+            pageToken=page_token,
+            fields=f"nextPageToken, files({fields})",
+            orderBy=order_by
+        ).execute()
+        yield result.get("files", [])
+        page_token = result.get("nextPageToken")
+        if not page_token:
+            return
+
+
+def list_all(service, query, **kwargs):
+    """Every file matching query, across all pages"""
+    return [f for page in iter_pages(service, query, **kwargs) for f in page]
@@ -0,0 +1,128 @@
+# listing_cache.py — On-disk LRU cache of folder listings
+import json
+import time
+import threading
+from disk_lru import DiskLRU
+
+MAX_BYTES = 64 * 1024 * 1024    # Total size of cached listings on disk
+MAX_AGE = 7 * 24 * 60 * 60      # Seconds before a cached listing is too stale to show
+
+
+class ListingCache:
+    """Last known contents of each folder, one JSON file per folder id.
+
+    Entries are shown immediately and revalidated by the caller
+    (stale-while-revalidate). Least recently used entries are evicted once
+    the directory grows past max_bytes; entries older than max_age are
+    treated as missing. Which entries list each file id is indexed in
+    memory (built on the first update()), so a batch of changes only
+    loads the listings it touches.
+    """
+
+    def __init__(self, directory, max_bytes=MAX_BYTES, max_age=MAX_AGE):
+        self.max_age = max_age
+        self.lock = threading.Lock()
+        self.members = None  # File name -> ids it lists; None until first needed
+        self.holders = {}    # File id -> names of the entries listing it
+        self.store = DiskLRU(directory, ".json", max_bytes, on_remove=self._unindex)
+
+    @staticmethod
+    def key(folder_id):
+        return f"{folder_id or 'root'}.json"
+
+    def get(self, folder_id):
+        """Cached file list for folder_id, or None if missing or too stale"""
+        name = self.key(folder_id)
+        with self.lock:
+            if name not in self.store:
+                return None
+            entry = self._load(name)
+            if entry is None:
+                return None
+            if time.time() - entry.get("saved_at", 0) > self.max_age:
+                self.store.remove(name)
+                return None
+            self.store.touch(name)
+            return entry.get("files", [])
+
+    def put(self, folder_id, files):
+        name = self.key(folder_id)
+        data = json.dumps({"folder_id": folder_id, "saved_at": time.time(), "files": files}).encode("utf-8")
+        with self.lock:
+            self.store.write(name, data)
+            self._index(name, files)
+
+    def update(self, patch, folder_ids, file_ids):
+        """Rewrite the cached listings a batch of changes touches.
+
+        Only entries for folder_ids (the changed files' new parents) or
+        already listing one of file_ids (their old parents) are loaded.
+        patch(folder_id, files) returns files unchanged or a new list.
+        """
+        with self.lock:
+            if self.members is None:
+                self._index_all()
+            names = {self.key(folder_id) for folder_id in folder_ids}
+            for file_id in file_ids:
+                names.update(self.holders.get(file_id, ()))
+            for name in names:
+                if name not in self.store:
+                    continue
+                entry = self._load(name)
+                if entry is None:
+                    continue
+                files = entry.get("files", [])
+                patched = patch(entry.get("folder_id"), files)
+                if patched is files:
+                    continue
+                entry["files"] = patched
+                self.store.write(name, json.dumps(entry).encode("utf-8"))
+                self._index(name, patched)
+
+    def invalidate(self, folder_id):
+        with self.lock:
+            self.store.remove(self.key(folder_id))
+
+    def clear(self):
+        with self.lock:
+            for name in self.store.names():
+                self.store.remove(name)
+
+    # === Internals (called with the lock held) ===
+    def _load(self, name):
+        """The entry stored under name, or None (and removed) if it can't be read"""
+        data = self.store.read(name)
+        if data is None:
+            return None
+        try:
+            return json.loads(data)
+        except ValueError:
+            self.store.remove(name)
+            return None
+
+    def _index_all(self):
+        # One pass over the entries on disk; put(), update() and removals keep it current
+        self.members = {}
+        self.holders = {}
+        for name in self.store.names():
+            entry = self._load(name)
+            if entry is not None:
+                self._index(name, entry.get("files", []))
+
+    def _index(self, name, files):
+        if self.members is None:
+            return
+        self._unindex(name)
+        ids = {f["id"] for f in files}
+        self.members[name] = ids
+        for file_id in ids:
+            self.holders.setdefault(file_id, set()).add(name)
+
+    def _unindex(self, name):
+        if self.members is None:
+            return
+        for file_id in self.members.pop(name, ()):
+            names = self.holders.get(file_id)
+            names.discard(name)
+            if not names:
+                del self.holders[file_id]
@@ -0,0 +1,128 @@
+# prefetch.py — Speculative folder listings, fetched while the user is hovering or selecting
+import time
+import threading
+from collections import OrderedDict
+import listing
+import scheduler as sched
+
+MAX_ACTIVE = 2      # Prefetches in flight at once; further requests are dropped
+CAPACITY = 16       # Listings kept in memory, least recently fetched evicted first
+MAX_AGE = 30        # Seconds a prefetched listing is served without revalidating
+WAIT_TIMEOUT = 15   # Longest an opened folder waits on its in-flight prefetch
+
+
+class Prefetcher:
+    """Loads folder listings before they are opened.
+
+    request() starts a low-cost background listing (capped at max_active,
+    skipped if already cached or running); cancel() stops it when the
+    pointer moves on. When the folder is then opened, take() serves the
+    result from memory, or wait() adopts the prefetch still in flight so
+    the listing isn't requested twice.
+    """
+
+    def __init__(self, service, scheduler, on_fetched=None, max_active=MAX_ACTIVE,
+                 capacity=CAPACITY, max_age=MAX_AGE):
+        self.service = service
+        self.scheduler = scheduler
+        self.on_fetched = on_fetched  # on_fetched(folder_id, files), from a worker thread
+        self.max_active = max_active
+        self.capacity = capacity
+        self.max_age = max_age
+        self.lock = threading.Lock()
+        self.results = OrderedDict()  # Folder id -> (fetched_at, files)
+        self.active = {}              # Folder id -> Task
+        self.adopted = set()          # In flight, but an open is waiting on it: don't cancel
+        self.hits = 0
+        self.misses = 0
+
+    def request(self, folder_id):
+        """Start prefetching folder_id unless it is fresh, running, or the cap is reached"""
+        with self.lock:
+            if self._fresh(folder_id) is not None or folder_id in self.active:
+                return False
+            if len(self.active) >= self.max_active:
+                return False
+            # Normal priority: ahead of crawls, behind anything the user is waiting on
+            self.active[folder_id] = self.scheduler.submit(
+                lambda task: self._run(folder_id, task),
+                name=f"Prefetch {folder_id}",
+                pool=sched.METADATA,
+                priority=sched.NORMAL
+            )
+            return True
+
+    def cancel(self, folder_id):
+        with self.lock:
+            if folder_id in self.adopted:
+                return
+            task = self.active.pop(folder_id, None)
+        if task:
+            task.cancel()
+
+    def take(self, folder_id):
+        """A fresh prefetched listing for folder_id, or None"""
+        with self.lock:
+            files = self._fresh(folder_id)
+            if files is None:
+                self.misses += 1
+                return None
+            self.hits += 1
+            self.results.pop(folder_id, None)  # Opened: the listing cache takes over from here
+            return files
+
+    def wait(self, folder_id, timeout=WAIT_TIMEOUT):
+        """Files from the prefetch running for folder_id, or None if there is none or it fails.
+
+        A prefetch still queued is cancelled instead: the caller's own
+        listing would run just as soon.
+        """
+        with self.lock:
+            task = self.active.get(folder_id)
+            if task is None:
+                return None
+            if task.state == "queued":
+                self.active.pop(folder_id, None)
+                task.cancel()
+                return None
+            self.adopted.add(folder_id)
+        task.finished.wait(timeout)
+        with self.lock:
+            self.adopted.discard(folder_id)
+            files = self._fresh(folder_id)
+            if files is not None:
+                self.hits += 1
+                self.results.pop(folder_id, None)
+            return files
+
+    def clear(self):
+        """Forget prefetched listings (e.g. after remote changes)"""
+        with self.lock:
+            self.results.clear()
+
+    def _fresh(self, folder_id):
+        entry = self.results.get(folder_id)
+        if entry is None:
+            return None
+        if time.time() - entry[0] > self.max_age:
+            del self.results[folder_id]
+            return None
+        return entry[1]
+
+    def _run(self, folder_id, task):
+        try:
+            files = []
+            for page in listing.iter_pages(self.service, listing.folder_query(folder_id)):
+                task.check_cancelled()
+                files.extend(page)
+            with self.lock:
+                self.results[folder_id] = (time.time(), files)
+                self.results.move_to_end(folder_id)
+                while len(self.results) > self.capacity:
+                    self.results.popitem(last=False)
+        finally:
+            with self.lock:
+                if self.active.get(folder_id) is task:
+                    del self.active[folder_id]
+        if self.on_fetched:
+            self.on_fetched(folder_id, files)
@@ -0,0 +1,108 @@
+# profiler.py — Stack capture and an opt-in sampling profiler writing flame-graph input
+#
+# The profile is written in the "folded" (collapsed stack) format: one line per
+# distinct stack, "thread;outer;...;inner count". flamegraph.pl, inferno-flamegraph
+# and speedscope.app all read it directly.
+import os
+import sys
+import threading
+
+SAMPLE_INTERVAL = 0.005  # Seconds between samples (~200 Hz)
+APP_DIR = os.path.dirname(os.path.abspath(__file__))
+
+
+def frame_label(frame):
+    """"function (file.py:line)" for one frame"""
+    code = frame.f_code
+    return f"{code.co_name} ({os.path.basename(code.co_filename)}:{frame.f_lineno})"
+
+
+def stack_of(frame):
+    """Frames from the outermost call down to frame, as labels"""
+    labels = []
+    while frame is not None:
+        labels.append(frame_label(frame))
+        frame = frame.f_back
+    labels.reverse()
+    return labels
+
+
+def thread_frame(thread_id):
+    """Innermost frame another thread is running, or None if it has exited"""
+    return sys._current_frames().get(thread_id)
+
+
+def is_app_file(filename):
+    """True for the app's own modules, not the standard library, Tk wrappers or site-packages"""
+    if not os.path.isabs(filename):
+        # Frozen builds name modules relative to the bundle; the app's are the top-level ones
+        return os.path.dirname(filename) == "" and not filename.startswith("<")
+    path = os.path.abspath(filename)
+    return path.startswith(APP_DIR + os.sep) and "site-packages" not in path
+
+
+def culprit(frame):
+    """Label of the innermost app frame at or above frame: the app code that was running"""
+    innermost = frame
+    while frame is not None:
+        if is_app_file(frame.f_code.co_filename):
+            return frame_label(frame)
+        frame = frame.f_back
+    return frame_label(innermost) if innermost is not None else "?"
+
+
+class SamplingProfiler:
+    """Samples every thread's stack SAMPLE_INTERVAL apart and counts identical stacks.
+
+    Opt in for a session: start(), use the app, then write(path) or
+    stop(path). Sampling runs on its own daemon thread and never touches
+    Tk; its cost is one sys._current_frames() walk per sample. Idle worker
+    threads (waiting on a queue or socket) are sampled too, so filter on
+    the thread name in the flame graph to look at one of them.
+    """
+
+    def __init__(self, interval=SAMPLE_INTERVAL):
+        self.interval = interval
+        self.counts = {}  # Folded stack -> samples
+        self.samples = 0
+        self.lock = threading.Lock()
+        self.stop_event = threading.Event()
+        self.thread = None
+
+    def start(self):
+        self.stop_event.clear()
+        self.thread = threading.Thread(target=self._run, name="profiler", daemon=True)
+        self.thread.start()
+
+    def _run(self):
+        own = threading.get_ident()
+        while not self.stop_event.wait(self.interval):
+            names = {t.ident: t.name for t in threading.enumerate()}
+            frames = sys._current_frames()
+            folded = [";".join([names.get(ident, str(ident))] + stack_of(frame))
+                      for ident, frame in frames.items() if ident != own]
+            del frames
+            with self.lock:
+                self.samples += 1
+                for stack in folded:
+                    self.counts[stack] = self.counts.get(stack, 0) + 1
+
+    def stop(self, path=None):
+        self.stop_event.set()
+        if self.thread is not None:
+            self.thread.join()
+            self.thread = None
+        if path:
+            self.write(path)
+
+    def write(self, path):
+        """Write the folded stacks so far; returns the number of samples"""
+        with self.lock:
+            counts = dict(self.counts)
+            samples = self.samples
+        tmp = path + ".tmp"
+        with open(tmp, "w", encoding="utf-8") as f:
+            for stack, count in sorted(counts.items()):
+                f.write(f"{stack} {count}\n")  # Readers split on the last space
+        os.replace(tmp, path)
+        return samples
@@ -0,0 +1,229 @@
+# ratelimit.py — Client-side rate governor shared by every Drive call
+import json
+import time
+import random
+import threading
+
+RATE = 100.0          # Requests per second on average (Drive allows 12,000 per user per minute)
+BURST = 200           # Requests that may go out back to back after an idle spell
+MIN_CONCURRENCY = 1
+START_CONCURRENCY = 8
+MAX_CONCURRENCY = 32
+MAX_RETRIES = 6       # Retries per request before the error reaches the caller
+BACKOFF_BASE = 1.0    # Seconds; attempt n waits a random time up to BACKOFF_BASE * 2**n
+BACKOFF_CAP = 64.0
+RETRY_STATUSES = (429, 500, 502, 503, 504)
+RATE_LIMIT_REASONS = ("userRateLimitExceeded", "rateLimitExceeded")
+
+
+def backoff_delay(attempt, base=BACKOFF_BASE, cap=BACKOFF_CAP):
+    """Exponential backoff with full jitter, so throttled workers don't retry in lockstep"""
+    return random.uniform(0, min(cap, base * 2 ** attempt))
+
+
+def error_reasons(content):
+    """The "reason" strings of a Drive JSON error body"""
+    try:
+        if isinstance(content, bytes):
+            content = content.decode("utf-8")
+        error = json.loads(content).get("error", {})
+        return [e.get("reason") for e in error.get("errors", [])]
+    except (ValueError, AttributeError, UnicodeDecodeError):
+        return []
+
+
+def is_throttled(status, content=b""):
+    """429s, 5xxs and the 403s Drive uses for rate limits are worth retrying"""
+    if status in RETRY_STATUSES:
+        return True
+    return status == 403 and any(r in RATE_LIMIT_REASONS for r in error_reasons(content))
+
+
+def is_throttled_error(error):
+    """Same test for an HttpError raised by googleapiclient"""
+    resp = getattr(error, "resp", None)
+    return resp is not None and is_throttled(resp.status, getattr(error, "content", b""))
+
+
+class TokenBucket:
+    """Allows rate requests per second on average, with bursts of up to burst"""
+
+    def __init__(self, rate=RATE, burst=BURST):
+        self.rate = rate
+        self.burst = burst
+        self.tokens = float(burst)
+        self.stamp = time.monotonic()
+        self.lock = threading.Lock()
+
+    def acquire(self, cost=1):
+        cost = min(cost, self.burst)  # A batch larger than the bucket still gets through
+        while True:
+            with self.lock:
+                now = time.monotonic()
+                self.tokens = min(self.burst, self.tokens + (now - self.stamp) * self.rate)
+                self.stamp = now
+                if self.tokens >= cost:
+                    self.tokens -= cost
+                    return
+                wait = (cost - self.tokens) / self.rate
+            time.sleep(wait)
+
+
+class AIMDLimiter:
+    """Bounds requests in flight; the bound adapts to how the server responds.
+
+    Each window of successes without throttling raises the limit by one
+    (additive increase); a throttled response halves it (multiplicative
+    decrease), at most once per window so one burst of 429s counts once.
+    """
+
+    def __init__(self, start=START_CONCURRENCY, minimum=MIN_CONCURRENCY, maximum=MAX_CONCURRENCY):
+        self.limit = float(start)
+        self.minimum = minimum
+        self.maximum = maximum
+        self.in_flight = 0
+        self.successes = 0
+        self.last_decrease = 0.0
+        self.cond = threading.Condition()
+
+    def acquire(self):
+        with self.cond:
+            while self.in_flight >= int(self.limit):
+                self.cond.wait()
+            self.in_flight += 1
+
+    def release(self):
+        with self.cond:
+            self.in_flight -= 1
+            self.cond.notify()
+
+    def on_success(self):
+        with self.cond:
+            self.successes += 1
+            if self.successes >= int(self.limit):
+                self.successes = 0
+                if self.limit < self.maximum:
+                    self.limit += 1
+                    self.cond.notify()
+
+    def on_throttle(self, window=1.0):
+        with self.cond:
+            now = time.monotonic()
+            if now - self.last_decrease < window:
+                return
+            self.last_decrease = now
+            self.successes = 0
+            self.limit = max(self.minimum, self.limit / 2)
+
+
+class Governor:
+    """Token bucket + AIMD concurrency + backoff, shared by all Drive transports"""
+
+    def __init__(self, rate=RATE, burst=BURST, start=START_CONCURRENCY, maximum=MAX_CONCURRENCY,
+                 max_retries=MAX_RETRIES):
+        self.bucket = TokenBucket(rate, burst)
+        self.limiter = AIMDLimiter(start, maximum=maximum)
+        self.max_retries = max_retries
+        self.lock = threading.Lock()
+        self.requests = 0
+        self.retries = 0
+        self.throttled = 0
+
+    def stats(self):
+        """Counters for status displays"""
+        with self.lock:
+            return {"requests": self.requests, "retries": self.retries, "throttled": self.throttled,
+                    "concurrency": int(self.limiter.limit), "in_flight": self.limiter.in_flight}
+
+    def throttle(self):
+        """Record a throttled response seen outside request() (e.g. one part of a batch)"""
+        with self.lock:
+            self.throttled += 1
+        self.limiter.on_throttle()
+
+    def request(self, send, cost=1):
+        """Run send() -> (resp, content) under the limits, retrying throttled responses.
+
+        Transport errors are retried with the same backoff but do not shrink
+        the concurrency limit. The last response or error is passed on once
+        retries run out.
+        """
+        attempt = 0
+        while True:
+            self.bucket.acquire(cost)
+            self.limiter.acquire()
+            try:
+                resp, content = send()
+            except (OSError, ConnectionError):
+                if attempt >= self.max_retries:
+                    raise
+                resp = None
+            finally:
+                self.limiter.release()
+            with self.lock:
+                self.requests += 1
+
+            if resp is not None and not is_throttled(resp.status, content):
+                self.limiter.on_success()
+                return resp, content
+            if resp is not None:
+                self.throttle()
+                if attempt >= self.max_retries:
+                    return resp, content
+            with self.lock:
+                self.retries += 1
+            delay = backoff_delay(attempt)
+            if resp is not None and str(resp.get("retry-after", "")).isdigit():
+                delay = max(delay, int(resp["retry-after"]))
+            time.sleep(delay)
+            attempt += 1
+
+
+class GovernedHttp:
+    """httplib2-style transport that sends every request through a Governor.
+
+    Wraps an authorized transport; other attributes (credentials, timeout)
+    are forwarded so googleapiclient treats it like the transport itself.
+    With a tracer, each request is recorded once it finishes, retries included.
+    """
+
+    def __init__(self, http, governor, tracer=None):
+        self.http = http
+        self.governor = governor
+        self.tracer = tracer
+
+    def __getattr__(self, name):
+        return getattr(self.http, name)
+
+    def request(self, uri, method="GET", body=None, headers=None, **kwargs):
+        position = body.tell() if hasattr(body, "seek") else None
+        cost = 1
+        content_type = (headers or {}).get("content-type", "")
+        if content_type.startswith("multipart/mixed") and isinstance(body, (str, bytes)):
+            # A batch counts against the quota once per call inside it
+            marker = "Content-ID:" if isinstance(body, str) else b"Content-ID:"
+            cost = max(1, body.count(marker))
+        sends = []  # Seconds spent in each attempt
+
+        def _send():
+            if position is not None:
+                body.seek(position)
+            start = time.monotonic()
+            try:
+                return self.http.request(uri, method, body=body, headers=headers, **kwargs)
+            finally:
+                sends.append(time.monotonic() - start)
+
+        if self.tracer is None:
+            return self.governor.request(_send, cost)
+        start = time.monotonic()
+        sent = len(body) if isinstance(body, (str, bytes, bytearray)) else 0
+        try:
+            resp, content = self.governor.request(_send, cost)
+        except Exception as e:
+            self.tracer.record(method, uri, type(e).__name__, time.monotonic() - start, sent, 0,
+                               max(1, len(sends)), cost, sum(sends))
+            raise
+        self.tracer.record(method, uri, resp.status, time.monotonic() - start, sent, len(content or b""),
+                           max(1, len(sends)), cost, sum(sends))
+        return resp, content
@@ -0,0 +1,203 @@
+# scheduler.py — Bounded, prioritized, cancellable task pools with an on-disk journal
+import os
+import json
+import heapq
+import uuid
+import itertools
+import threading
+
+# Pools
+METADATA = "metadata"   # Listings, renames, moves, trash, crawls: small and latency-sensitive
+TRANSFER = "transfer"   # Downloads and uploads: long-running and bandwidth-bound
+
+# Priorities (lower runs first)
+INTERACTIVE = 0    # The user is waiting on it (opening a folder)
+NORMAL = 5         # User-started work that can queue (a download)
+BACKGROUND = 10    # Nobody is waiting (index crawl, resumed transfers)
+
+POOL_SIZES = {METADATA: 4, TRANSFER: 3}
+MAX_JOURNAL_FAILURES = 3  # Launches a failing journaled task is retried on
+
+
+class TaskCancelled(Exception):
+    """Raised inside a task that noticed its cancel_event"""
+
+
+class Task:
+    """One unit of Drive work. fn(task) runs on a pool worker and should poll task.cancel_event"""
+
+    def __init__(self, fn, name, pool, priority, journal_entry=None, scheduler=None, on_cancelled=None):
+        self.id = uuid.uuid4().hex
+        self.fn = fn
+        self.name = name
+        self.pool = pool
+        self.priority = priority
+        self.journal_entry = journal_entry
+        self.scheduler = scheduler
+        self.on_cancelled = on_cancelled  # Called with the task if it is cancelled before fn starts
+        self.cancel_event = threading.Event()
+        self.state = "queued"  # queued -> running -> done / failed / cancelled
+        self.result = None
+        self.error = None
+        self.finished = threading.Event()
+
+    @property
+    def cancelled(self):
+        return self.cancel_event.is_set()
+
+    def check_cancelled(self):
+        if self.cancel_event.is_set():
+            raise TaskCancelled(self.name)
+
+    def cancel(self):
+        """Drop the task if queued, or ask it to stop if running. Removes it from the journal"""
+        self.cancel_event.set()
+        if self.scheduler is not None:
+            self.scheduler._forget(self)
+
+
+class Scheduler:
+    """Every Drive operation goes through here.
+
+    Separate bounded pools keep bulk transfers from starving metadata calls,
+    each pool runs its highest priority task first, and tasks submitted with
+    a journal entry are written to disk until they finish, so queued or half
+    done transfers can be picked up again by the next launch.
+    """
+
+    def __init__(self, journal_path=None, pool_sizes=None):
+        self.pool_sizes = dict(POOL_SIZES, **(pool_sizes or {}))
+        self.journal_path = journal_path
+        self.lock = threading.Condition()
+        self.queues = {pool: [] for pool in self.pool_sizes}
+        self.workers = {pool: [] for pool in self.pool_sizes}
+        self.running = {}  # task id -> Task
+        self.counter = itertools.count()
+        self.closing = False
+        self.journal = {}  # Task id -> entry, mirrored to journal_path
+        if journal_path:
+            try:
+                with open(journal_path, "r") as f:
+                    self.journal = json.load(f)
+            except (OSError, ValueError):
+                pass
+        self.previous_ids = list(self.journal)
+
+    # === Submitting ===
+    def submit(self, fn, name="", pool=METADATA, priority=NORMAL, journal_entry=None, on_cancelled=None):
+        """Queue fn(task). journal_entry (JSON-serializable) is persisted until the task ends.
+
+        fn never runs for a task cancelled while queued; on_cancelled(task)
+        is called instead, on the worker that dropped it.
+        """
+        task = Task(fn, name, pool, priority, journal_entry, scheduler=self, on_cancelled=on_cancelled)
+        with self.lock:
+            if journal_entry is not None:
+                self.journal[task.id] = journal_entry
+                self._save_journal()
+            heapq.heappush(self.queues[pool], (priority, next(self.counter), task))
+            if len(self.workers[pool]) < self.pool_sizes[pool]:
+                worker = threading.Thread(target=self._work, args=(pool,), name=f"{pool}-worker", daemon=True)
+                self.workers[pool].append(worker)
+                worker.start()
+            self.lock.notify_all()
+        return task
+
+    def take_journal(self):
+        """Journal entries left by the previous run, handed out once.
+
+        They stay on disk until then; resubmit them to resume (submitting
+        journals them again under the new task).
+        """
+        with self.lock:
+            entries = [self.journal.pop(task_id) for task_id in self.previous_ids if task_id in self.journal]
+            self.previous_ids = []
+            return entries
+
+    # === Control ===
+    def cancel_all(self, pool=None):
+        with self.lock:
+            tasks = [t for _, _, t in itertools.chain(*self.queues.values())] + list(self.running.values())
+        for task in tasks:
+            if pool is None or task.pool == pool:
+                task.cancel()
+
+    def active(self, pool=None):
+        """Queued and running tasks, for status displays"""
+        with self.lock:
+            tasks = [t for _, _, t in itertools.chain(*self.queues.values())] + list(self.running.values())
+        return [t for t in tasks if (pool is None or t.pool == pool) and not t.cancelled]
+
+    def shutdown(self):
+        """Stop workers for app exit. Journaled tasks stay on disk for the next launch"""
+        with self.lock:
+            self.closing = True
+            running = list(self.running.values())
+            self.lock.notify_all()
+        for task in running:
+            task.cancel_event.set()
+
+    # === Workers ===
+    def _work(self, pool):
+        queue = self.queues[pool]
+        while True:
+            with self.lock:
+                while not queue and not self.closing:
+                    self.lock.wait()
+                if self.closing:
+                    return
+                _, _, task = heapq.heappop(queue)
+                skipped = task.cancelled
+                if skipped:
+                    self._finish(task, "cancelled")
+                else:
+                    task.state = "running"
+                    self.running[task.id] = task
+            if skipped:
+                if task.on_cancelled:
+                    try:
+                        task.on_cancelled(task)
+                    except Exception as e:
+                        print(f"Task '{task.name}' cancel handler failed: {e}")
+                continue
+            try:
+                task.result = task.fn(task)
+                state = "cancelled" if task.cancelled else "done"
+            except TaskCancelled:
+                state = "cancelled"
+            except Exception as e:
+                task.error = e
+                state = "cancelled" if task.cancelled else "failed"
+                if state == "failed":
+                    print(f"Task '{task.name}' failed: {e}")
+            with self.lock:
+                self.running.pop(task.id, None)
+                if not self.closing:
+                    self._finish(task, state)
+            task.finished.set()
+
+    def _forget(self, task):
+        # Cancelled by the user: the next launch must not resume it, even if the app closes first
+        with self.lock:
+            if self.journal.pop(task.id, None) is not None:
+                self._save_journal()
+
+    def _finish(self, task, state):
+        task.state = state
+        entry = self.journal.pop(task.id, None)
+        if entry is not None:
+            if state == "failed":
+                # Keep it for the next launch (e.g. the network dropped), but not forever
+                entry["failures"] = entry.get("failures", 0) + 1
+                if entry["failures"] < MAX_JOURNAL_FAILURES:
+                    self.journal[task.id] = entry
+            self._save_journal()
+        task.finished.set()
+
+    def _save_journal(self):
+        if not self.journal_path:
+            return
+        tmp = self.journal_path + ".tmp"
+        with open(tmp, "w") as f:
+            json.dump(self.journal, f)
+        os.replace(tmp, self.journal_path)
@@ -0,0 +1,113 @@
+# service_pool.py — Per-thread Drive service objects over one shared, self-refreshing credential
+import threading
+import httplib2
+import google_auth_httplib2
+import google.auth.credentials
+from google.auth.transport.requests import Request
+import discovery
+from ratelimit import Governor, GovernedHttp
+
+HTTP_TIMEOUT = 60  # Seconds before a stalled socket read fails instead of hanging a worker
+
+
+class SharedCredentials:
+    """Wraps one OAuth credential so any number of threads can use it.
+
+    Only one thread refreshes an expired token; the others wait and then
+    reuse the new one instead of each spending a refresh round trip.
+    on_refresh(creds) is called after every refresh (e.g. to save token.json).
+    """
+
+    def __init__(self, creds, on_refresh=None):
+        self.creds = creds
+        self.on_refresh = on_refresh
+        self.lock = threading.Lock()
+        self.local = threading.local()  # Token each thread last sent
+        self.request = Request()
+
+    def __getattr__(self, name):
+        return getattr(self.creds, name)
+
+    @property
+    def valid(self):
+        return self.creds.valid
+
+    def refresh(self, request=None):
+        """Refresh the token, unless another thread already did since this one last sent it"""
+        sent = getattr(self.local, "token", None)
+        with self.lock:
+            if self.creds.valid and self.creds.token != sent:
+                return
+            self.creds.refresh(self.request)
+            if self.on_refresh:
+                try:
+                    self.on_refresh(self.creds)
+                except Exception as e:
+                    print(f"Saving refreshed token failed: {e}")
+
+    def apply(self, headers, token=None):
+        self.creds.apply(headers, token)
+
+    def before_request(self, request, method, url, headers):
+        if not self.creds.valid:
+            self.refresh()
+        self.local.token = self.creds.token
+        self.creds.apply(headers, self.local.token)
+
+
+# googleapiclient only trusts .valid on google-auth credentials; anything else is
+# probed as an oauth2client credential (access_token) and batch requests crash
+google.auth.credentials.Credentials.register(SharedCredentials)
+
+
+class ServicePool:
+    """Hands every thread its own Drive service and keep-alive HTTP connection.
+
+    httplib2 is not thread-safe, so one shared service object lets
+    concurrent calls corrupt each other. Here each worker thread lazily
+    builds a service on its own httplib2.Http (which keeps its TLS
+    connection open between calls) and all of them share one
+    SharedCredentials and one Governor, which paces, bounds and retries
+    every request they send. Attribute access is forwarded to the calling
+    thread's service, so a pool can stand in wherever a service is used:
+    pool.files().list(...).execute().
+    """
+
+    def __init__(self, creds, on_refresh=None, timeout=HTTP_TIMEOUT, governor=None, transport=None, tracer=None):
+        self.credentials = SharedCredentials(creds, on_refresh)
+        self.timeout = timeout
+        self.governor = governor or Governor()
+        self.tracer = tracer  # Optional tracing.Tracer recording every request
+        # transport() makes the raw connection under the auth/governor layers (e.g. a stand-in server)
+        self.transport = transport or (lambda: httplib2.Http(timeout=self.timeout))
+        self.local = threading.local()
+        self.lock = threading.Lock()
+        self.built = 0  # Services created so far, one per thread that used the pool
+
+    def http(self):
+        """This thread's authorized transport"""
+        http = getattr(self.local, "http", None)
+        if http is None:
+            http = self.local.http = self.new_http()
+        return http
+
+    def new_http(self):
+        """A fresh authorized transport on the shared credential (for short-lived worker pools)"""
+        raw = self.transport()
+        # Resumable uploads answer "308 Resume Incomplete", which httplib2 would follow as a redirect
+        raw.redirect_codes = raw.redirect_codes - {308}
+        http = google_auth_httplib2.AuthorizedHttp(self.credentials, http=raw)
+        return GovernedHttp(http, self.governor, self.tracer)
+
+    def service(self):
+        """This thread's Drive service"""
+        service = getattr(self.local, "service", None)
+        if service is None:
+            # Built from the one parsed discovery document, not re-read and re-parsed per thread
+            service = self.local.service = discovery.build_drive(self.http())
+            with self.lock:
+                self.built += 1
+        return service
+
+    def __getattr__(self, name):
+        return getattr(self.service(), name)
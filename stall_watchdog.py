@@ -0,0 +1,103 @@
+# stall_watchdog.py — Notices when the Tk main loop is blocked and records what it was running
+import json
+import time
+import threading
+from collections import deque
+import profiler
+
+THRESHOLD = 0.25       # Seconds the loop may be blocked before it counts as a stall
+HEARTBEAT_MS = 50      # Interval of the Tk-side heartbeat
+CHECK_INTERVAL = 0.05  # Seconds between checks (and stack samples) on the monitor thread
+RECENT_STALLS = 20     # Stalls kept in memory for the diagnostics window
+
+
+class StallWatchdog:
+    """Reports Tk main-loop stalls with the stack that caused them.
+
+    The Tk thread stamps a heartbeat every heartbeat_ms through after().
+    A monitor thread checks the stamp; once it is more than threshold
+    late, the loop is stalled and the monitor samples the Tk thread's
+    stack at every check until the heartbeat comes back. The stall is
+    then printed and appended to log_path as a JSON line, with its
+    duration and the stack sampled most often, i.e. the code that held
+    the loop. Create it on the Tk thread.
+    """
+
+    def __init__(self, root, log_path=None, threshold=THRESHOLD, heartbeat_ms=HEARTBEAT_MS):
+        self.root = root
+        self.log_path = log_path
+        self.threshold = threshold
+        self.heartbeat_ms = heartbeat_ms
+        self.tk_thread = threading.get_ident()
+        self.last_beat = time.monotonic()
+        self.job = None
+        self.stop_event = threading.Event()
+        self.lock = threading.Lock()
+        self.recent = deque(maxlen=RECENT_STALLS)
+        self.stalls = 0
+        self.worst = 0.0
+
+    def start(self):
+        self.beat()
+        threading.Thread(target=self._monitor, name="stall-watchdog", daemon=True).start()
+
+    def stop(self):
+        """Call before the root is destroyed, or the silence afterwards reads as a stall"""
+        self.stop_event.set()
+        if self.job is not None:
+            try:
+                self.root.after_cancel(self.job)
+            except Exception:
+                pass
+            self.job = None
+
+    def beat(self):
+        self.last_beat = time.monotonic()
+        if not self.stop_event.is_set():
+            self.job = self.root.after(self.heartbeat_ms, self.beat)
+
+    def _monitor(self):
+        interval = self.heartbeat_ms / 1000
+        samples = None  # Stack -> times seen, while a stall lasts
+        culprits = {}   # Stack -> its innermost app frame
+        due = 0
+        while not self.stop_event.wait(CHECK_INTERVAL):
+            beat = self.last_beat
+            if time.monotonic() - beat - interval > self.threshold:
+                if samples is None:
+                    samples, culprits, due = {}, {}, beat + interval
+                frame = profiler.thread_frame(self.tk_thread)
+                stack = tuple(profiler.stack_of(frame))
+                samples[stack] = samples.get(stack, 0) + 1
+                culprits.setdefault(stack, profiler.culprit(frame))
+                del frame
+            elif samples is not None:
+                if not self.stop_event.is_set():
+                    self._report(beat - due, samples, culprits)
+                samples = None
+
+    def _report(self, duration, samples, culprits):
+        stack = max(samples, key=samples.get)
+        stall = {
+            "ts": round(time.time() - duration, 3),
+            "ms": round(duration * 1000),
+            "where": culprits[stack],
+            "samples": sum(samples.values()),
+            "stack": list(stack)
+        }
+        with self.lock:
+            self.stalls += 1
+            self.worst = max(self.worst, duration)
+            self.recent.append(stall)
+        print(f"UI blocked for {stall['ms']} ms in {stall['where']}")
+        if self.log_path:
+            try:
+                with open(self.log_path, "a", encoding="utf-8") as f:
+                    f.write(json.dumps(stall) + "\n")
+            except OSError as e:
+                print(f"Saving stall report failed: {e}")
+
+    def stats(self):
+        """Stall count, worst duration and the most recent stalls (newest last)"""
+        with self.lock:
+            return {"stalls": self.stalls, "worst_ms": round(self.worst * 1000), "recent": list(self.recent)}
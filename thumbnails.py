@@ -0,0 +1,162 @@
+# thumbnails.py — Card thumbnails: fetched for visible cards, resized off the Tk thread, cached on disk
+import io
+import re
+import threading
+from collections import OrderedDict
+from PIL import Image
+import scheduler as sched
+from disk_lru import DiskLRU
+
+THUMB_SIZE = (120, 72)          # Largest thumbnail drawn on a card, in pixels
+FETCH_SIZE = 220                # Longest side requested from thumbnailLink (its =sNNN suffix)
+MAX_ACTIVE = 3                  # Thumbnail fetches in flight at once
+MAX_BYTES = 32 * 1024 * 1024    # Total size of cached thumbnails on disk
+
+
+def cache_key(f):
+    """(file id, modifiedTime): a new revision gets a new thumbnail"""
+    return (f["id"], f.get("modifiedTime", ""))
+
+
+def sized_link(link, size=FETCH_SIZE):
+    """thumbnailLink asking for a size close to what is drawn, not the default"""
+    return re.sub(r"=s\d+$", f"=s{size}", link)
+
+
+def decode(data, size=THUMB_SIZE):
+    """Fetched image bytes -> RGBA image no larger than size"""
+    image = Image.open(io.BytesIO(data))
+    image.draft("RGB", (size[0] * 2, size[1] * 2))  # JPEGs decode at a reduced scale
+    image = image.convert("RGBA")
+    image.thumbnail(size, Image.LANCZOS)
+    return image
+
+
+def encode(image):
+    out = io.BytesIO()
+    image.save(out, format="PNG", optimize=True)
+    return out.getvalue()
+
+
+class ThumbnailCache:
+    """Resized thumbnails on disk, one PNG per (file id, modifiedTime).
+
+    A file that changes gets a new key, so its old thumbnail is never
+    served again and simply ages out. Least recently used entries are
+    evicted once the directory grows past max_bytes.
+    """
+
+    def __init__(self, directory, max_bytes=MAX_BYTES):
+        self.lock = threading.Lock()
+        self.store = DiskLRU(directory, ".png", max_bytes)
+
+    @staticmethod
+    def key(file_id, modified_time):
+        # modifiedTime is RFC 3339; keep only its digits so the name is valid everywhere
+        return f"{file_id}-{re.sub(r'[^0-9]', '', modified_time or '')}.png"
+
+    def get(self, file_id, modified_time):
+        """Cached PNG bytes, or None"""
+        name = self.key(file_id, modified_time)
+        with self.lock:
+            if name not in self.store:
+                return None
+            data = self.store.read(name)
+            if data is not None:
+                self.store.touch(name)
+            return data
+
+    def put(self, file_id, modified_time, data):
+        with self.lock:
+            self.store.write(self.key(file_id, modified_time), data)
+
+
+class ThumbnailLoader:
+    """Loads thumbnails for whatever cards are on screen.
+
+    want(files) replaces the set of wanted thumbnails with the visible
+    files, so anything scrolled past before its turn is never fetched.
+    At most max_active load at once, as background tasks on the metadata
+    pool. Each is read from the disk cache or fetched and resized on the
+    worker; on_ready(file, image) then receives a small PIL image, also
+    on the worker, for the caller to hand to Tk. Files whose thumbnail
+    can't be had are not asked for again this session.
+    """
+
+    def __init__(self, service, scheduler, cache, on_ready, size=THUMB_SIZE, max_active=MAX_ACTIVE):
+        self.service = service
+        self.scheduler = scheduler
+        self.cache = cache
+        self.on_ready = on_ready
+        self.size = size
+        self.max_active = max_active
+        self.lock = threading.Lock()
+        self.wanted = OrderedDict()  # Cache key -> file, in screen order
+        self.active = {}             # Cache key -> Task
+        self.failed = set()
+        self.fetched = 0
+        self.cache_hits = 0
+
+    def want(self, files, have=()):
+        """Load thumbnails for files (the visible ones), skipping keys in have"""
+        with self.lock:
+            self.wanted = OrderedDict()
+            for f in files:
+                if not f.get("thumbnailLink"):
+                    continue
+                key = cache_key(f)
+                if key in have or key in self.failed or key in self.active:
+                    continue
+                self.wanted[key] = f
+            self._pump()
+
+    def _pump(self):
+        # Called with the lock held
+        while self.wanted and len(self.active) < self.max_active:
+            key, f = self.wanted.popitem(last=False)
+            self.active[key] = self.scheduler.submit(
+                lambda task, key=key, f=f: self._run(key, f, task),
+                name=f"Thumbnail {f['id']}",
+                pool=sched.METADATA,
+                priority=sched.BACKGROUND
+            )
+
+    def _http(self):
+        # A ServicePool keeps one connection per worker thread; reuse it
+        if hasattr(self.service, "http"):
+            return self.service.http()
+        import downloads  # Not at the top: this module loads before the Drive stack (see app.py)
+        return downloads.new_authorized_http(self.service)
+
+    def _run(self, key, f, task):
+        image = None
+        try:
+            image = self._load(f)
+        except Exception as e:
+            print(f"Thumbnail for '{f['name']}' failed: {e}")
+        finally:
+            with self.lock:
+                self.active.pop(key, None)
+                if image is None:
+                    self.failed.add(key)
+                self._pump()
+        if image is not None:
+            self.on_ready(f, image)
+
+    def _load(self, f):
+        data = self.cache.get(f["id"], f.get("modifiedTime"))
+        if data is not None:
+            with self.lock:
+                self.cache_hits += 1
+            image = Image.open(io.BytesIO(data))
+            image.load()
+            return image
+        resp, content = self._http().request(sized_link(f["thumbnailLink"]), "GET")
+        with self.lock:
+            self.fetched += 1
+        if resp.status != 200:
+            # Links expire after a few hours; a cached listing can hold a dead one
+            return None
+        image = decode(content, self.size)
+        self.cache.put(f["id"], f.get("modifiedTime"), encode(image))
+        return image
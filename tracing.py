@@ -0,0 +1,183 @@
+# tracing.py — Per-call trace of every Drive request: rotating JSONL on disk, live percentiles in memory
+import os
+import re
+import json
+import math
+import time
+import threading
+import urllib.parse
+from collections import deque
+
+TRACE_MAX_BYTES = 8 * 1024 * 1024   # Trace file size before it is rotated
+TRACE_BACKUPS = 3                   # Rotated files kept (trace.jsonl.1 ... .3)
+WINDOW = 1000                       # Recent calls per operation that percentiles are taken over
+THROUGHPUT_WINDOW = 10.0            # Seconds of traffic averaged into throughput
+FLUSH_INTERVAL = 1.0                # Seconds between flushes of the trace file
+PERCENTILES = (50, 95, 99)
+
+API_PATH = re.compile(r"/(?:upload/)?drive/v3/([A-Za-z]+)(?:/([^/?]+))?(?:/([A-Za-z]+))?")
+VERBS = {"GET": "list", "POST": "create", "PATCH": "update", "PUT": "update", "DELETE": "delete"}
+NAMED_METHODS = {"startPageToken": "getStartPageToken", "generateIds": "generateIds", "emptyTrash": "emptyTrash",
+                 "watch": "watch"}  # Path segments that name a method rather than a file id
+
+
+def operation(method, uri):
+    """API method name for a request URI: "files.list", "files.get_media", "batch"...
+
+    Requests outside the Drive API (thumbnail links) are named after their host.
+    """
+    parsed = urllib.parse.urlparse(uri)
+    if parsed.path.startswith("/batch/"):
+        return "batch"
+    if parsed.path.startswith("/upload/"):
+        return "files.upload"
+    m = API_PATH.match(parsed.path)
+    if not m:
+        return f"{method} {parsed.netloc}"
+    resource, item, child = m.groups()
+    if item in NAMED_METHODS and not child:
+        return f"{resource}.{NAMED_METHODS[item]}"
+    if child:
+        resource = f"{resource}.{child}"
+    if method == "GET" and item and not child:
+        return f"{resource}.get_media" if "alt=media" in parsed.query else f"{resource}.get"
+    return f"{resource}.{VERBS.get(method, method.lower())}"
+
+
+def fields_of(uri):
+    values = urllib.parse.parse_qs(urllib.parse.urlparse(uri).query).get("fields")
+    return values[0] if values else None
+
+
+def percentile(values, p):
+    """Nearest-rank percentile of an already sorted list"""
+    if not values:
+        return None
+    return values[max(0, math.ceil(p / 100 * len(values)) - 1)]
+
+
+class Tracer:
+    """Records one line per Drive request and keeps rolling statistics.
+
+    record() is called by the transport on whichever thread made the call.
+    Each call is appended to path as a JSON line (operation, fields,
+    status, latency, bytes each way, retries); the file rotates at
+    max_bytes, keeping backups older files. Without a path nothing is
+    written and only the in-memory statistics are kept. summary() gives
+    per-operation counts, error rates and latency percentiles over the
+    last WINDOW calls of each operation; throughput() the bytes per
+    second moved over the last few seconds.
+    """
+
+    def __init__(self, path=None, max_bytes=TRACE_MAX_BYTES, backups=TRACE_BACKUPS, window=WINDOW):
+        self.path = path
+        self.max_bytes = max_bytes
+        self.backups = backups
+        self.window = window
+        self.lock = threading.Lock()
+        self.file = None
+        self.last_flush = 0
+        self.started = time.monotonic()
+        self.recent = {}    # Operation -> deque of latencies (seconds)
+        self.totals = {}    # Operation -> {"calls", "errors", "retries", "bytes"}
+        self.traffic = deque()  # (monotonic time, bytes) within THROUGHPUT_WINDOW
+
+    def record(self, method, uri, status, latency, sent=0, received=0, attempts=1, calls=1, send_time=None):
+        """One finished request. status is the HTTP status, or the exception's name if none came back"""
+        op = operation(method, uri)
+        now = time.monotonic()
+        ok = isinstance(status, int) and status < 400
+        entry = {
+            "ts": round(time.time(), 3),
+            "op": op,
+            "fields": fields_of(uri),
+            "status": status,
+            "ms": round(latency * 1000, 1),
+            "sent": sent,
+            "received": received,
+            "retries": attempts - 1
+        }
+        if send_time is not None:
+            entry["send_ms"] = round(send_time * 1000, 1)  # Time on the wire; the rest waited on the governor
+        if calls > 1:
+            entry["calls"] = calls
+        with self.lock:
+            self.recent.setdefault(op, deque(maxlen=self.window)).append(latency)
+            totals = self.totals.setdefault(op, {"calls": 0, "errors": 0, "retries": 0, "bytes": 0})
+            totals["calls"] += 1
+            totals["errors"] += not ok
+            totals["retries"] += attempts - 1
+            totals["bytes"] += sent + received
+            self.traffic.append((now, sent + received))
+            while self.traffic and self.traffic[0][0] < now - THROUGHPUT_WINDOW:
+                self.traffic.popleft()
+            if self.path:
+                self._write(json.dumps(entry) + "\n", now)
+
+    def _write(self, line, now):
+        # Called with the lock held
+        try:
+            if self.file is None:
+                os.makedirs(os.path.dirname(os.path.abspath(self.path)), exist_ok=True)
+                self.file = open(self.path, "a", encoding="utf-8")
+            self.file.write(line)
+            if now - self.last_flush > FLUSH_INTERVAL:
+                self.file.flush()
+                self.last_flush = now
+            if self.file.tell() > self.max_bytes:
+                self._rotate()
+        except OSError as e:
+            print(f"Trace write failed, tracing to disk stopped: {e}")
+            self.path = None
+
+    def _rotate(self):
+        self.file.close()
+        self.file = None
+        for i in range(self.backups - 1, 0, -1):
+            if os.path.exists(f"{self.path}.{i}"):
+                os.replace(f"{self.path}.{i}", f"{self.path}.{i + 1}")
+        if self.backups:
+            os.replace(self.path, f"{self.path}.1")
+        else:
+            os.remove(self.path)
+
+    def summary(self):
+        """{operation: {calls, errors, retries, bytes, p50_ms, p95_ms, p99_ms}}, busiest first"""
+        with self.lock:
+            recent = {op: sorted(latencies) for op, latencies in self.recent.items()}
+            totals = {op: dict(t) for op, t in self.totals.items()}
+        result = {}
+        for op in sorted(totals, key=lambda o: -totals[o]["calls"]):
+            stats = totals[op]
+            for p in PERCENTILES:
+                stats[f"p{p}_ms"] = round(percentile(recent[op], p) * 1000, 1)
+            result[op] = stats
+        return result
+
+    def throughput(self):
+        """Bytes per second over the last THROUGHPUT_WINDOW seconds"""
+        now = time.monotonic()
+        with self.lock:
+            moved = sum(n for t, n in self.traffic if t >= now - THROUGHPUT_WINDOW)
+        return moved / min(THROUGHPUT_WINDOW, max(now - self.started, 1.0))
+
+    def save_summary(self, path):
+        with open(path, "w") as f:
+            json.dump({"uptime_s": round(time.monotonic() - self.started, 1), "operations": self.summary()}, f,
+                      indent=2)
+
+    def close(self):
+        with self.lock:
+            if self.file is not None:
+                self.file.close()
+                self.file = None
+
+
+def format_summary(summary):
+    """summary() as a fixed-width text table"""
+    lines = [f"{'operation':<28}{'calls':>7}{'err':>6}{'retry':>7}{'p50 ms':>9}{'p95 ms':>9}{'p99 ms':>9}"
+             f"{'MB':>9}"]
+    for op, s in summary.items():
+        lines.append(f"{op[:27]:<28}{s['calls']:>7}{s['errors']:>6}{s['retries']:>7}{s['p50_ms']:>9.1f}"
+                     f"{s['p95_ms']:>9.1f}{s['p99_ms']:>9.1f}{s['bytes'] / 1e6:>9.1f}")
+    return "\n".join(lines)
@@ -0,0 +1,97 @@
+# ui_bus.py — Coalescing, frame-paced channel from worker threads to the Tk thread
+import time
+import itertools
+import threading
+from collections import OrderedDict
+
+FRAME_MS = 16        # Updates are drained at most once per frame (~60 fps)
+FRAME_BUDGET = 0.008  # Seconds of UI work per frame before the rest waits for the next one
+
+
+class UIBus:
+    """The one way worker threads hand work to Tk.
+
+    post(fn) queues fn to run on the Tk thread. With a key, a newer post
+    replaces an older one still waiting under the same key (e.g. only the
+    latest progress value of a transfer is drawn), keeping its place in
+    line. Everything queued is drained in batches, one per frame, instead
+    of one Tk event per update.
+    """
+
+    def __init__(self, root, frame_ms=FRAME_MS, budget=FRAME_BUDGET):
+        self.root = root
+        self.frame_ms = frame_ms
+        self.budget = budget
+        self.lock = threading.Lock()
+        self.pending = OrderedDict()  # Key -> fn; unkeyed posts get a unique key
+        self.counter = itertools.count()
+        self.scheduled = False
+        self.job = None  # The next drain, once one has scheduled it (Tk thread only)
+        self.posted = 0
+        self.coalesced = 0
+        self.drained = 0
+        self.frames = 0
+        self.max_depth = 0
+
+    def post(self, fn, key=None):
+        """Run fn() on the Tk thread soon. Safe to call from any thread"""
+        with self.lock:
+            self.posted += 1
+            if key is None:
+                key = ("_", next(self.counter))
+            elif key in self.pending:
+                self.coalesced += 1
+            self.pending[key] = fn
+            self.max_depth = max(self.max_depth, len(self.pending))
+            if self.scheduled:
+                return
+            self.scheduled = True
+        # At most one Tk call per frame from the workers, however many updates they post
+        self.root.after(self.frame_ms, self.drain)
+
+    def post_later(self, delay_ms, fn):
+        """Run fn() on the Tk thread after delay_ms"""
+        self.post(lambda: self.root.after(delay_ms, fn))
+
+    def drain(self):
+        """Run queued updates on the Tk thread until the frame budget is spent.
+
+        An update may block in a nested event loop (a modal messagebox), so
+        before each one runs the next drain is already arranged: scheduled
+        here if more is queued, or left to post() if the queue is empty.
+        """
+        deadline = time.monotonic() + self.budget
+        self.frames += 1
+        self.job = None
+        while True:
+            with self.lock:
+                if not self.pending:
+                    self.scheduled = self.job is not None
+                    return
+                _, fn = self.pending.popitem(last=False)
+                more = bool(self.pending)
+                if not more and self.job is None:
+                    self.scheduled = False
+            if more and self.job is None:
+                self.job = self.root.after(self.frame_ms, self.drain)
+            try:
+                fn()
+            except Exception as e:
+                print(f"UI update failed: {e}")
+            self.drained += 1
+            if time.monotonic() > deadline:
+                break
+        if self.job is None:
+            with self.lock:
+                self.scheduled = True
+            self.job = self.root.after(self.frame_ms, self.drain)
+
+    def depth(self):
+        with self.lock:
+            return len(self.pending)
+
+    def stats(self):
+        """Counters for diagnostics: current and peak queue depth, coalescing rate"""
+        with self.lock:
+            return {"depth": len(self.pending), "max_depth": self.max_depth, "posted": self.posted,
+                    "coalesced": self.coalesced, "drained": self.drained, "frames": self.frames}
@@ -0,0 +1,265 @@
+# uploads.py — Resumable, chunked, parallel uploads
+import os
+import json
+import mmap
+import time
+import mimetypes
+import threading
+from googleapiclient.errors import HttpError
+from downloads import new_authorized_http
+import scheduler as sched
+
+UPLOAD_URI = "https://www.googleapis.com/upload/drive/v3/files?uploadType=resumable&fields=id,name,mimeType,modifiedTime,size"
+CHUNK_ALIGN = 256 * 1024            # Drive requires chunk sizes in multiples of 256 KiB
+CHUNK_SIZE = 8 * 1024 * 1024        # Bytes sent per PUT
+MAX_ATTEMPTS = 5                    # Tries per chunk before giving up on a file
+
+
+class UploadCancelled(Exception):
+    """Raised when an upload is stopped through its cancel event"""
+
+
+def aligned_chunk_size(chunk_size):
+    return max(CHUNK_ALIGN, chunk_size - chunk_size % CHUNK_ALIGN)
+
+
+class UploadJournal:
+    """Open resumable sessions on disk, so uploads continue after a restart"""
+
+    def __init__(self, path):
+        self.path = path
+        self.lock = threading.Lock()
+        try:
+            with open(path, "r") as f:
+                self.sessions = json.load(f)
+        except (OSError, ValueError):
+            self.sessions = {}
+
+    @staticmethod
+    def key(local_path, parent_id):
+        return f"{os.path.abspath(local_path)}|{parent_id}"
+
+    def get(self, key):
+        with self.lock:
+            return self.sessions.get(key)
+
+    def put(self, key, session):
+        with self.lock:
+            self.sessions[key] = session
+            self._save()
+
+    def remove(self, key):
+        with self.lock:
+            if self.sessions.pop(key, None) is not None:
+                self._save()
+
+    def _save(self):
+        tmp = self.path + ".tmp"
+        with open(tmp, "w") as f:
+            json.dump(self.sessions, f)
+        os.replace(tmp, self.path)
+
+
+def start_session(http, name, parent_id, mime_type, size):
+    """Open a resumable upload session and return its URI"""
+    body = json.dumps({"name": name, "parents": [parent_id]})
+    resp, content = http.request(UPLOAD_URI, "POST", body=body, headers={
+        "content-type": "application/json; charset=UTF-8",
+        "x-upload-content-type": mime_type,
+        "x-upload-content-length": str(size)
+    })
+    if resp.status != 200 or "location" not in resp:
+        raise HttpError(resp, content, uri=UPLOAD_URI)
+    return resp["location"]
+
+
+def query_offset(http, session_uri, size):
+    """Ask the server how much of the session it has. Returns (offset, file or None)"""
+    resp, content = http.request(session_uri, "PUT", body=b"", headers={
+        "content-length": "0",
+        "content-range": f"bytes */{size}"
+    })
+    if resp.status in (200, 201):
+        return size, json.loads(content)
+    if resp.status == 308:
+        return next_offset(resp), None
+    raise HttpError(resp, content, uri=session_uri)
+
+
+def next_offset(resp):
+    """First byte the server still needs, from a 308's Range header ("bytes=0-N")"""
+    received = resp.get("range")
+    return int(received.rsplit("-", 1)[1]) + 1 if received else 0
+
+
+def upload_file(http, local_path, parent_id, journal=None, chunk_size=CHUNK_SIZE,
+                progress_callback=None, cancel_event=None, name=None, mime_type=None):
+    """Upload one file through a resumable session, CHUNK_SIZE bytes per request.
+
+    The source is memory-mapped and sliced a chunk at a time, so memory use
+    does not grow with the file. The session URI is kept in journal; if a
+    matching session exists (same path, size and mtime) the upload resumes
+    at the offset the server reports.
+    """
+    chunk_size = aligned_chunk_size(chunk_size)
+    stat = os.stat(local_path)
+    size = stat.st_size
+    name = name or os.path.basename(local_path)
+    mime_type = mime_type or mimetypes.guess_type(local_path)[0] or "application/octet-stream"
+    key = UploadJournal.key(local_path, parent_id)
+
+    session = journal.get(key) if journal else None
+    offset = 0
+    if session and session.get("size") == size and session.get("mtime") == stat.st_mtime:
+        try:
+            offset, done = query_offset(http, session["uri"], size)
+            if done is not None:
+                journal.remove(key)
+                return done
+        except HttpError as e:
+            if e.resp.status not in (404, 410):
+                raise
+            session = None  # Session expired; start over
+    else:
+        session = None
+    if session is None:
+        session = {"uri": start_session(http, name, parent_id, mime_type, size), "path": os.path.abspath(local_path),
+                   "parent_id": parent_id, "name": name, "mime_type": mime_type, "size": size, "mtime": stat.st_mtime}
+        if journal:
+            journal.put(key, session)
+
+    if progress_callback:
+        progress_callback(offset, size)
+
+    with open(local_path, "rb") as fh:
+        source = mmap.mmap(fh.fileno(), 0, access=mmap.ACCESS_READ) if size else b""
+        try:
+            attempts = 0
+            while True:
+                if cancel_event is not None and cancel_event.is_set():
+                    raise UploadCancelled(local_path)
+                end = min(offset + chunk_size, size)
+                headers = {"content-length": str(end - offset)}
+                headers["content-range"] = f"bytes {offset}-{end - 1}/{size}" if size else "bytes */0"
+                try:
+                    resp, content = http.request(session["uri"], "PUT", body=source[offset:end], headers=headers)
+                except (OSError, ConnectionError):
+                    resp, content = None, b""
+
+                if resp is not None and resp.status in (200, 201):
+                    if journal:
+                        journal.remove(key)
+                    if progress_callback:
+                        progress_callback(size, size)
+                    return json.loads(content)
+                if resp is not None and resp.status == 308:
+                    offset = next_offset(resp)
+                    attempts = 0
+                    if progress_callback:
+                        progress_callback(offset, size)
+                    continue
+                if resp is not None and resp.status in (404, 410):
+                    if journal:
+                        journal.remove(key)
+                    raise HttpError(resp, content, uri=session["uri"])
+
+                # Transport error or 5xx: back off, then ask the server where to continue
+                attempts += 1
+                if attempts >= MAX_ATTEMPTS:
+                    if resp is None:
+                        raise ConnectionError(f"Upload of {name} kept failing")
+                    raise HttpError(resp, content, uri=session["uri"])
+                if cancel_event is None:
+                    time.sleep(2 ** attempts)
+                elif cancel_event.wait(2 ** attempts):
+                    raise UploadCancelled(local_path)
+                try:
+                    offset, done = query_offset(http, session["uri"], size)
+                except (OSError, ConnectionError, HttpError):
+                    continue
+                if done is not None:
+                    if journal:
+                        journal.remove(key)
+                    return done
+        finally:
+            if size:
+                source.close()
+
+
+class UploadManager:
+    """Runs uploads as transfer tasks on the scheduler, each worker with its own HTTP connection.
+
+    Every file is journaled by the scheduler until it finishes, so a restart
+    can resubmit it; the session journal then lets it resume mid-file.
+    Progress is aggregated over every file in a call to upload() and
+    reported as progress_callback(bytes_done, bytes_total, files_done, files_total).
+    """
+
+    def __init__(self, service, journal, scheduler, chunk_size=CHUNK_SIZE, http_factory=None):
+        self.service = service
+        self.journal = journal
+        self.scheduler = scheduler
+        self.chunk_size = chunk_size
+        self.http_factory = http_factory
+        self.local = threading.local()
+        self.lock = threading.Lock()
+
+    def http(self):
+        if self.http_factory is None and hasattr(self.service, "new_http"):
+            return self.service.http()  # ServicePool: this worker's keep-alive connection
+        http = getattr(self.local, "http", None)
+        if http is None:
+            http = self.local.http = (self.http_factory or (lambda: new_authorized_http(self.service)))()
+        return http
+
+    def upload(self, paths, parent_id, progress_callback=None, done_callback=None,
+               priority=sched.NORMAL, failures=None):
+        """Upload local files into parent_id. done_callback(results) gets {path: (file, error)}.
+
+        failures carries {path: count} from restored journal entries. Returns the tasks.
+        """
+        sizes = {p: os.path.getsize(p) for p in paths}
+        sent = dict.fromkeys(paths, 0)
+        results = {}
+        total = sum(sizes.values())
+
+        def _report():
+            if progress_callback:
+                progress_callback(sum(sent.values()), total, len(results), len(paths))
+
+        def _record(path, outcome):
+            # Every path gets a result, cancelled ones included, or done_callback never fires
+            with self.lock:
+                results[path] = outcome
+                _report()
+                finished = len(results) == len(paths)
+            if finished and done_callback:
+                done_callback(results)
+
+        def _one(path, task):
+            def _progress(done, size):
+                with self.lock:
+                    sent[path] = done
+                    _report()
+            try:
+                f = upload_file(self.http(), path, parent_id, self.journal, self.chunk_size,
+                                progress_callback=_progress, cancel_event=task.cancel_event)
+            except Exception as e:
+                _record(path, (None, e))
+                raise  # Lets the scheduler keep the journal entry for a retry
+            _record(path, (f, None))
+
+        tasks = []
+        for path in paths:
+            entry = {"kind": "upload", "path": os.path.abspath(path), "parent_id": parent_id}
+            if failures and failures.get(path):
+                entry["failures"] = failures[path]
+            tasks.append(self.scheduler.submit(
+                lambda task, p=path: _one(p, task),
+                name=f"Upload {os.path.basename(path)}",
+                pool=sched.TRANSFER,
+                priority=priority,
+                journal_entry=entry,
+                on_cancelled=lambda task, p=path: _record(p, (None, UploadCancelled(p)))
+            ))
+        return tasks
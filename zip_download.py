@@ -0,0 +1,176 @@
+# zip_download.py — Stream a Drive folder tree into a single ZIP archive
+import os
+import queue
+import zipfile
+import threading
+from concurrent.futures import ThreadPoolExecutor
+import downloads
+import folder_download
+
+CHUNK_SIZE = 4 * 1024 * 1024    # Bytes per ranged GET
+PREFETCH_FILES = 3              # Files fetched ahead of the one being written
+QUEUE_CHUNKS = 4                # Chunks buffered per file; memory is bounded by
+                                # (PREFETCH_FILES + 1) * QUEUE_CHUNKS * CHUNK_SIZE
+ZIP_SUFFIX = ".part"
+STORED_PREFIXES = ("image/", "video/", "audio/")  # Already compressed; deflating only costs CPU
+STORED_TYPES = ("application/zip", "application/gzip", "application/x-7z-compressed", "application/pdf")
+_DONE = object()
+
+
+class ArchiveIncomplete(Exception):
+    """A file could not be fetched in full, so the archive was abandoned"""
+
+
+def compress_type(mime_type):
+    if mime_type.startswith(STORED_PREFIXES) or mime_type in STORED_TYPES:
+        return zipfile.ZIP_STORED
+    return zipfile.ZIP_DEFLATED
+
+
+def zip_info(arcname, f):
+    """ZipInfo carrying the file's Drive modifiedTime"""
+    stamp = f.get("modifiedTime", "")
+    try:
+        date_time = tuple(int(x) for x in (stamp[0:4], stamp[5:7], stamp[8:10],
+                                           stamp[11:13], stamp[14:16], stamp[17:19]))
+    except ValueError:
+        date_time = (1980, 1, 1, 0, 0, 0)
+    info = zipfile.ZipInfo(arcname, date_time=max(date_time, (1980, 1, 1, 0, 0, 0)))
+    info.compress_type = compress_type(f.get("mimeType", ""))
+    return info
+
+
+class ChunkStream:
+    """One file's content, fetched on a worker and handed over through a bounded queue"""
+
+    def __init__(self, f, cancel_event, stop, depth=QUEUE_CHUNKS):
+        self.file = f
+        self.cancel_event = cancel_event
+        self.stop = stop  # Set when the writer gives up (error or cancel)
+        self.chunks = queue.Queue(maxsize=depth)
+
+    def stopped(self):
+        return self.stop.is_set() or self.cancel_event.is_set()
+
+    def put(self, item):
+        # Waits for the writer, but gives up once the writer has stopped
+        while not self.stopped():
+            try:
+                self.chunks.put(item, timeout=0.2)
+                return
+            except queue.Full:
+                continue
+        raise downloads.DownloadCancelled(self.file["name"])
+
+    def produce(self, service, chunk_size):
+        if self.stopped():
+            return
+        try:
+            request = service.files().get_media(fileId=self.file["id"])
+            http, uri = request.http, request.uri
+            offset = 0
+            while True:
+                resp, content = downloads.fetch_range(http, uri, offset, offset + chunk_size - 1)
+                if resp.status == 416:
+                    break  # Zero-byte file
+                if resp.status == 200:
+                    # Range ignored: this is the whole body
+                    self.put(content[offset:])
+                    break
+                if content:
+                    self.put(content)
+                offset += len(content)
+                total = downloads.total_from_response(resp)
+                if not content or (total is not None and offset >= total):
+                    break
+            self.put(_DONE)
+        except downloads.DownloadCancelled:
+            pass
+        except Exception as e:
+            try:
+                self.put(e)
+            except downloads.DownloadCancelled:
+                pass
+
+    def __iter__(self):
+        while True:
+            try:
+                item = self.chunks.get(timeout=0.2)
+            except queue.Empty:
+                if self.cancel_event.is_set():
+                    raise downloads.DownloadCancelled(self.file["name"])
+                continue
+            if item is _DONE:
+                return
+            if isinstance(item, Exception):
+                raise item
+            yield item
+
+
+def download_zip(service, folder_id, zip_path, progress_callback=None, cancel_event=None,
+                 prefetch=PREFETCH_FILES, chunk_size=CHUNK_SIZE, list_workers=folder_download.LIST_WORKERS):
+    """Write a folder tree to zip_path without staging any file on disk.
+
+    Each file's chunks are written into its archive entry as they arrive,
+    while the next `prefetch` files are already being fetched on a worker
+    pool. Queues are bounded, so memory stays flat however large the
+    folder is. The archive is built as zip_path.part and moved into place
+    when complete. A file that fails part-way can't be taken back out of
+    the archive, so the whole archive is abandoned (ArchiveIncomplete) and
+    the .part removed. progress_callback(bytes_done, bytes_total,
+    files_done, files_total). Returns {"archived", "skipped": [path],
+    "failed": []}.
+    """
+    cancel_event = cancel_event or threading.Event()
+    root = os.path.splitext(os.path.basename(zip_path))[0]
+    directories, files, skipped = folder_download.walk_tree(service, folder_id, root, list_workers, cancel_event)
+    total = sum(int(f.get("size", 0)) for _, f in files)
+    written = 0
+    result = {"archived": 0, "skipped": [path for path, _ in skipped], "failed": []}
+    part = zip_path + ZIP_SUFFIX
+
+    stop = threading.Event()
+    streams = [ChunkStream(f, cancel_event, stop) for _, f in files]
+    pool = ThreadPoolExecutor(max_workers=max(1, prefetch))
+    # Workers start files in archive order, so at most `prefetch` are in flight
+    for stream in streams:
+        pool.submit(stream.produce, service, chunk_size)
+    try:
+        with zipfile.ZipFile(part, "w", allowZip64=True) as archive:
+            for directory in directories:
+                archive.writestr(zipfile.ZipInfo(directory.replace(os.sep, "/") + "/"), b"")
+            for (path, f), stream in zip(files, streams):
+                if cancel_event.is_set():
+                    raise downloads.DownloadCancelled(zip_path)
+                arcname = path.replace(os.sep, "/")
+                size = int(f.get("size", 0))
+                start = written
+                try:
+                    with archive.open(zip_info(arcname, f), "w",
+                                      force_zip64=size > zipfile.ZIP64_LIMIT // 2) as entry:
+                        for chunk in stream:
+                            entry.write(chunk)
+                            written += len(chunk)
+                            if progress_callback:
+                                progress_callback(written, total, result["archived"], len(files))
+                    result["archived"] += 1
+                except downloads.DownloadCancelled:
+                    raise
+                except Exception as e:
+                    # The entry would stay truncated with a CRC matching what was written: a valid-looking
+                    # archive missing data. Fail the whole task instead
+                    raise ArchiveIncomplete(f"{arcname}: {e}") from e
+                written = start + size
+                if progress_callback:
+                    progress_callback(written, total, result["archived"], len(files))
+    except BaseException:
+        try:
+            os.remove(part)
+        except OSError:
+            pass
+        raise
+    finally:
+        stop.set()  # Releases workers still waiting to hand over chunks
+        pool.shutdown(wait=True)
+    os.replace(part, zip_path)
+    return result